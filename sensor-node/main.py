@@ -5,6 +5,8 @@ SmartSense Sensor Node - Plug and Play Version
 Automatic WiFi provisioning and server discovery
 """
 
+import argparse
+import logging
 import signal
 import sys
 import time
@@ -12,28 +14,43 @@ import traceback
 import threading
 from pathlib import Path
 
+# Start of the node's own imports (origin of the startup profile)
+IMPORT_START = time.monotonic()
+
 # Add project root to path
 project_root = Path(__file__).parent
 sys.path.insert(0, str(project_root))
 
+# Only always-needed modules are imported here; sensor drivers, MQTT, the
+# SQLite store and the production-only network helpers are imported where
+# they are used
 from utils import (
     setup_logger,
     load_config,
     get_node_info,
-    WiFiProvisioning,
-    ServiceDiscovery,
-    ProvisioningServer,
-    NetworkChecker
+    SensorScheduler,
+    StartupPipeline,
+    DeadbandFilter,
+    AdaptiveSampler,
+    CommandDispatcher,
+    CommandError,
+    REGISTRY
 )
-from sensors import BME680Sensor, SCD40Sensor, PMS5003Sensor, BH1750Sensor
-from mqtt import MQTTClient
-from outputs import LEDController, BuzzerController
+from utils.instrumentation import format_name
+from sensors import SENSOR_DRIVERS, load_driver
+from outputs import LEDController, BuzzerController, PRIORITY_LOW, PRIORITY_HIGH
+from storage import TimeSeriesBuffer
 
 
 class SensorNode:
     """Sensor Node with Plug and Play support"""
 
-    def __init__(self, config_path: str = "config.yaml"):
+    def __init__(self, config_path: str = "config.yaml", profile_startup: bool = False):
+        self.start_time = IMPORT_START
+        self.profile_startup = profile_startup
+        self.first_publish_time = None
+        self._first_publish_lock = threading.Lock()
+
         # Load configuration
         self.config = load_config(config_path)
 
@@ -52,17 +69,63 @@ class SensorNode:
         self.logger.info("=" * 60)
 
         # Initialize components (only in production mode)
-        self.wifi_prov = WiFiProvisioning() if self.mode == 'production' else None
-        self.discovery = ServiceDiscovery() if self.mode == 'production' else None
+        self.wifi_prov = None
+        self.discovery = None
+        self.network = None
+        if self.mode == 'production':
+            from utils import WiFiProvisioning, ServiceDiscovery, NetworkChecker
+            self.wifi_prov = WiFiProvisioning()
+            discovery_config = self.config.get('discovery', {})
+            self.discovery = ServiceDiscovery(
+                cache_path=discovery_config.get('cache_path', 'data/server.json'),
+                track=discovery_config.get('track', True),
+                probe_timeout=discovery_config.get('probe_timeout', 1.0)
+            )
+            self.network = NetworkChecker()
         self.web_server = None
 
         self.sensors = []
+        self.aggregators = {}
+        self.deadbands = {}
+        self.samplers = {}
+        self.disabled_sensors = set()
+        self.commands = None
+        self.bursts = {}
+        self.telemetry = None
+        self.latest = None
+        self.metrics_server = None
+        self.scheduler = None
         self.mqtt_client = None
         self.led = None
         self.buzzer = None
 
         self.running = False
         self.server_info = None
+        self.startup = None
+
+        # Compressed in-memory history of every numeric metric
+        history_config = self.config.get('history', {})
+        self.history = None
+        if history_config.get('enabled', True):
+            self.history = TimeSeriesBuffer(
+                retention_hours=history_config.get('retention_hours', 72),
+                max_bytes_per_metric=history_config.get('max_bytes_per_metric', 512 * 1024),
+                block_points=history_config.get('block_points', 120)
+            )
+
+        # Tiered on-disk history (raw + 1m/1h rollups), written in batches
+        store_config = self.config.get('local_store', {})
+        self.local_store = None
+        if store_config.get('enabled', False):
+            from storage import HistoryStore
+            retention = store_config.get('retention_days', {})
+            self.local_store = HistoryStore(
+                path=store_config.get('path', 'data/history.db'),
+                raw_retention_days=retention.get('raw', 7),
+                minute_retention_days=retention.get('minute', 30),
+                hour_retention_days=retention.get('hour', 365),
+                max_pending=store_config.get('max_pending', 100000)
+            )
 
         # Setup signal handlers
         signal.signal(signal.SIGINT, self._signal_handler)
@@ -72,87 +135,123 @@ class SensorNode:
         """Handle shutdown signals"""
         self.logger.info(f"Received signal {signum}, shutting down...")
         self.running = False
+        if self.scheduler:
+            self.scheduler.stop()
 
     def setup(self) -> bool:
-        """Setup sensor node with automatic configuration"""
+        """
+        Setup sensor node with automatic configuration
+
+        Outputs, sensors and network/discovery are set up concurrently;
+        MQTT starts as soon as the sensors and the server are known.
+        """
+        self.startup = StartupPipeline()
+        self.startup.add_step('outputs', self._init_outputs)
+        self.startup.add_step('sensors', self._initialize_sensors)
+        self.startup.add_step('network', self._setup_network)
+        self.startup.add_step('discovery', self._discover_server, requires=('network',))
+        self.startup.add_step('mqtt', self._connect_mqtt, requires=('sensors', 'discovery'))
+        self.startup.add_step('status', self._indicate_ready, requires=('outputs', 'mqtt'))
+
         try:
-            # Initialize LED and Buzzer
-            self._init_outputs()
-
-            # DEV mode: Skip network setup, use config values
-            if self.mode == 'dev':
-                self.logger.info("DEV mode: Skipping network configuration")
-                mqtt_config = self.config.get('mqtt', {})
-                self.server_info = {
-                    'address': mqtt_config.get('broker_host', 'localhost'),
-                    'mqtt_port': mqtt_config.get('broker_port', 1883),
-                    'api_port': 3000
-                }
-                self.logger.info(f"Using configured server: {self.server_info['address']}")
+            ok = self.startup.run()
+        except Exception as e:
+            self.logger.error(f"Setup failed: {e}")
+            self.logger.error(traceback.format_exc())
+            ok = False
 
-            # PRODUCTION mode: Full Plug and Play
-            else:
-                # Step 1: Check network connection
-                self.logger.info("Checking network connection...")
-                connection = NetworkChecker.get_active_connection()
-
-                if connection['type'] != 'none':
-                    self.logger.info(f"✓ Network connected ({connection['type']}): {connection['ip']}")
-                    self.led.flash(LEDController.COLOR_GREEN, times=2)
-                    self.buzzer.beep(duration=0.1, times=1)
-                else:
-                    # No network - WiFi provisioning
-                    self.logger.warning("No network connection")
-                    if self.wifi_prov.has_wifi_config():
-                        wifi_config = self.wifi_prov.load_config()
-                        if self.wifi_prov.connect_wifi(wifi_config['ssid'], wifi_config['password']):
-                            self.logger.info("✓ WiFi connected")
-                        else:
-                            return self._start_provisioning_mode()
-                    else:
-                        return self._start_provisioning_mode()
+        if self.profile_startup:
+            print(self._startup_report())
+
+        if not ok:
+            self.logger.error("Setup failed")
+            return False
 
-                # Discover server via mDNS
-                self.logger.info("Discovering SmartSense server...")
-                self.server_info = self.discovery.discover(timeout=15)
+        self.logger.info(f"Setup complete in {time.monotonic() - self.start_time:.2f} seconds")
+        return True
 
-                if not self.server_info:
-                    self.logger.error("Server not found")
-                    return False
+    def _startup_report(self) -> str:
+        """Format the startup profile relative to process start"""
+        return "Startup profile\n" + self.startup.report(origin=self.start_time)
+
+    def _setup_network(self) -> bool:
+        """Check the network connection (WiFi provisioning if there is none)"""
+        # DEV mode: Skip network setup, use config values
+        if self.mode == 'dev':
+            self.logger.info("DEV mode: Skipping network configuration")
+            mqtt_config = self.config.get('mqtt', {})
+            self.server_info = {
+                'address': mqtt_config.get('broker_host', 'localhost'),
+                'mqtt_port': mqtt_config.get('broker_port', 1883),
+                'api_port': 3000
+            }
+            self.logger.info(f"Using configured server: {self.server_info['address']}")
+            return True
 
-                self.logger.info(f"Server found: {self.server_info['address']}")
+        # PRODUCTION mode: Full Plug and Play
+        # Link changes arrive from netlink from here on
+        self.network.add_listener(self._on_network_change)
+        self.network.start()
 
-            # Initialize sensors
-            if not self._initialize_sensors():
-                self.logger.error("Failed to initialize sensors")
-                return False
+        self.logger.info("Checking network connection...")
+        connection = self.network.get_active_connection()
 
-            # Connect to MQTT
-            if self.mode == 'production':
-                mqtt_url = self.discovery.get_mqtt_broker_url(self.server_info)
-            else:
-                mqtt_url = None
+        if connection['type'] != 'none':
+            self.logger.info(f"✓ Network connected ({connection['type']}): {connection['ip']}")
+            return True
 
-            if not self._connect_mqtt(mqtt_url):
-                self.logger.error("Failed to connect to MQTT broker")
-                return False
+        # No network - WiFi provisioning (needs the LED for feedback)
+        self.logger.warning("No network connection")
+        self.startup.wait('outputs')
 
-            # Setup complete
-            self.logger.info("Setting up LED/Buzzer status...")
-            if self.led.enabled:
-                self.led.status_ok()
-            if self.buzzer.enabled:
-                self.buzzer.beep(duration=0.1, times=3)
-            self.logger.info("Setup complete!")
+        if self.wifi_prov.has_wifi_config():
+            wifi_config = self.wifi_prov.load_config()
+            if self.wifi_prov.connect_wifi(wifi_config['ssid'], wifi_config['password']):
+                self.logger.info("✓ WiFi connected")
+                return True
 
+        return self._start_provisioning_mode()
+
+    def _on_network_change(self, connection):
+        """Network monitor callback: reconnect MQTT as soon as a link is back"""
+        if connection['type'] != 'none' and self.mqtt_client:
+            self.mqtt_client.retry_now()
+
+    def _discover_server(self) -> bool:
+        """Discover the SmartSense server via mDNS (production mode)"""
+        if self.mode == 'dev':
             return True
 
-        except Exception as e:
-            self.logger.error(f"Setup failed: {e}")
-            import traceback
-            self.logger.error(traceback.format_exc())
+        self.logger.info("Discovering SmartSense server...")
+        self.discovery.add_listener(self._on_server_moved)
+        timeout = self.config.get('discovery', {}).get('timeout', 15)
+        self.server_info = self.discovery.discover(timeout=timeout)
+
+        if not self.server_info:
+            self.logger.error("Server not found")
             return False
 
+        self.logger.info(f"Server found: {self.server_info['address']}")
+        return True
+
+    def _on_server_moved(self, server_info):
+        """Discovery callback: follow the server to its new address"""
+        self.server_info = server_info
+        if self.mqtt_client:
+            self.mqtt_client.set_broker(server_info['address'], int(server_info['mqtt_port']))
+
+    def _indicate_ready(self) -> bool:
+        """Signal a completed setup on the LED and buzzer"""
+        self.logger.info("Setting up LED/Buzzer status...")
+        if self.led.enabled:
+            # MQTT may still be connecting; _on_mqtt_state turns it green
+            self.led.status_warning()
+            if self.mqtt_client.connected:
+                self.led.status_ok()
+        if self.buzzer.enabled:
+            self.buzzer.beep(duration=0.1, times=3)
+        return True
+
     def _init_outputs(self):
         """Initialize LED and Buzzer"""
         led_config = self.config.get('outputs', {}).get('led', {})
@@ -168,6 +267,7 @@ class SensorNode:
             enabled=buzzer_config.get('enabled', True)
         )
         self.buzzer.initialize()
+        return True
 
     def _start_provisioning_mode(self) -> bool:
         """Start WiFi provisioning mode"""
@@ -180,11 +280,12 @@ class SensorNode:
             self.logger.error("Failed to start AP mode")
             return False
 
-        # Indicate provisioning mode with LED
-        self.led.flash(LEDController.COLOR_BLUE, duration=0.5, times=5)
+        # Indicate provisioning mode with LED (blinks until WiFi is configured)
+        self.led.status_blinking(LEDController.COLOR_BLUE)
 
         # Start web server
         self.logger.info(f"Web server: http://{self.wifi_prov.ap_ip}")
+        from utils import ProvisioningServer
         self.web_server = ProvisioningServer(port=80)
 
         # Run server in thread
@@ -203,7 +304,6 @@ class SensorNode:
         # Wait for configuration
         while not self.wifi_prov.has_wifi_config():
             time.sleep(1)
-            self.led.flash(LEDController.COLOR_BLUE, duration=0.2, times=1)
 
         return True
 
@@ -236,22 +336,20 @@ class SensorNode:
         """Initialize all enabled sensors"""
         from utils.config_loader import get_sensor_config
 
-        sensor_classes = {
-            'bme680': BME680Sensor,
-            'scd40': SCD40Sensor,
-            'pms5003': PMS5003Sensor,
-            'bh1750': BH1750Sensor
-        }
-
-        for sensor_name, sensor_class in sensor_classes.items():
+        for sensor_name in SENSOR_DRIVERS:
             sensor_config = get_sensor_config(self.config, sensor_name)
 
             if sensor_config:
                 self.logger.info(f"Initializing {sensor_name}...")
                 try:
-                    sensor = sensor_class(sensor_config)
+                    # Drivers (and their hardware libraries) load only when enabled
+                    sensor = load_driver(sensor_name)(sensor_config)
                     if sensor.initialize():
                         self.sensors.append(sensor)
+                        sensor.start_acquisition()
+                        self._init_aggregation(sensor, sensor_config)
+                        self._init_deadband(sensor, sensor_config)
+                        self._init_adaptive(sensor, sensor_config)
                         self.logger.info(f"✓ {sensor_name} initialized")
                     else:
                         self.logger.warning(f"✗ {sensor_name} initialization failed")
@@ -265,38 +363,132 @@ class SensorNode:
         self.logger.info(f"Total sensors initialized: {len(self.sensors)}")
         return True
 
+    def _init_aggregation(self, sensor, sensor_config):
+        """Set up windowed aggregation if configured for the sensor"""
+        aggregation = sensor_config.get('aggregation', {})
+        if not aggregation.get('window'):
+            return
+
+        from utils import WindowAggregator
+        aggregator = WindowAggregator(
+            window=aggregation['window'],
+            stats=aggregation.get('stats'),
+            use_numpy=aggregation.get('use_numpy')
+        )
+        self.aggregators[sensor.name] = aggregator
+
+        mode = "numpy" if aggregator.use_numpy else "python"
+        self.logger.info(f"{sensor.name}: publishing {aggregation['window']}s window statistics ({mode})")
+
+    def _init_deadband(self, sensor, sensor_config):
+        """Set up report-by-exception publishing if configured for the sensor"""
+        deadband = sensor_config.get('deadband', {})
+        if not deadband.get('metrics'):
+            return
+
+        deadband_filter = DeadbandFilter.from_config(deadband)
+        self.deadbands[sensor.name] = deadband_filter
+        self.logger.info(f"{sensor.name}: report by exception for {len(deadband_filter.deadbands)} metrics "
+                         f"(heartbeat {deadband_filter.max_silence}s)")
+
+    def _init_adaptive(self, sensor, sensor_config):
+        """Set up variability-driven read intervals if configured for the sensor"""
+        adaptive = sensor_config.get('adaptive', {})
+        if not adaptive.get('metrics'):
+            return
+
+        sampler = AdaptiveSampler.from_config(adaptive, initial=sensor.read_interval)
+        self.samplers[sensor.name] = sampler
+        sensor.set_read_interval(sampler.interval)
+        self.logger.info(f"{sensor.name}: adaptive read interval "
+                         f"{sampler.min_interval}-{sampler.max_interval} seconds")
+
     def _connect_mqtt(self, broker_url: str = None) -> bool:
         """Connect to MQTT broker"""
+        from mqtt import MQTTClient
+
         node_info = get_node_info(self.config)
         mqtt_config = {
+            **self.config.get('mqtt', {}),
             'broker_host': self.server_info['address'],
             'broker_port': int(self.server_info['mqtt_port'])
         }
 
         self.mqtt_client = MQTTClient(mqtt_config, node_info)
+        self.mqtt_client.add_state_listener(self._on_mqtt_state)
+        # Readings stored while offline count as published once replayed
+        self.mqtt_client.add_replay_listener(lambda count: self._record_first_publish())
+        self._init_commands()
 
-        if not self.mqtt_client.connect():
-            return False
-
-        # Publish birth certificate
-        self.logger.info("Publishing birth certificate...")
+        # Birth catalog is (re)published by the client on every connect
         birth_metrics = self._get_birth_metrics()
         self.mqtt_client.publish_birth(birth_metrics)
-        self.logger.info("Birth certificate published")
 
+        # Do not wait for the broker: readings go to the outbox until the
+        # supervisor connects, and _on_mqtt_state reports the connection
+        self.mqtt_client.connect(timeout=0)
         return True
 
+    def _init_commands(self):
+        """Route the command topic to a dispatcher (started by run())"""
+        commands_config = self.config.get('commands', {})
+        if not commands_config.get('enabled', True):
+            return
+
+        self.commands = CommandDispatcher(
+            self.mqtt_client.publish_response,
+            max_queue=commands_config.get('queue_size', 16)
+        )
+        self.commands.register('set_interval', self._cmd_set_interval)
+        self.commands.register('enable_sensor', self._cmd_enable_sensor)
+        self.commands.register('disable_sensor', self._cmd_disable_sensor)
+        self.commands.register('set_deadband', self._cmd_set_deadband)
+        self.commands.register('set_log_level', self._cmd_set_log_level)
+        self.commands.register('read', self._cmd_read)
+        self.commands.register('burst', self._cmd_burst)
+
+        burst_config = commands_config.get('burst', {})
+        self.burst_min_interval = burst_config.get('min_interval', 1.0)
+        self.burst_max_duration = burst_config.get('max_duration', 300)
+
+        # Only enqueues, so the MQTT network thread never runs a command
+        self.mqtt_client.set_command_callback(self.commands.submit)
+
+    def _on_mqtt_state(self, state: str):
+        """Reflect MQTT connection state on the status LED"""
+        if state == self.mqtt_client.STATE_CONNECTED:
+            self.logger.info("MQTT connected, birth certificate published")
+            # Publish a full snapshot after (re)connecting so consumers
+            # never hold a step older than what the node last saw
+            for deadband_filter in self.deadbands.values():
+                deadband_filter.reset()
+
+        # MQTT may connect while the outputs are still being initialized
+        if not self.led:
+            return
+
+        if state == self.mqtt_client.STATE_CONNECTED:
+            self.led.status_ok()
+        elif state == self.mqtt_client.STATE_DISCONNECTED:
+            self.logger.warning("MQTT disconnected, reconnecting in background...")
+            self.led.status_warning()
+
     def _get_birth_metrics(self):
-        """Get birth metrics for all sensors"""
+        """Get metric descriptions for all sensors (birth catalog)"""
         metrics = []
-        timestamp = int(time.time() * 1000)
 
         for sensor in self.sensors:
             try:
-                sensor_metrics = sensor.get_metrics(timestamp)
-                metrics.extend(sensor_metrics)
+                described = sensor.describe_metrics()
+                aggregator = self.aggregators.get(sensor.name)
+                if aggregator:
+                    described = aggregator.describe(described)
+                deadband_filter = self.deadbands.get(sensor.name)
+                if deadband_filter:
+                    described = deadband_filter.describe(described)
+                metrics.extend(described)
             except Exception as e:
-                self.logger.error(f"Failed to get metrics from {sensor.name}: {e}")
+                self.logger.error(f"Failed to describe metrics of {sensor.name}: {e}")
 
         return metrics
 
@@ -305,85 +497,507 @@ class SensorNode:
         self.running = True
         self.logger.info("Starting main loop...")
 
-        # Get read interval
-        read_interval = 60
-        for sensor_name in ['bme680', 'scd40', 'pms5003', 'bh1750']:
-            from utils.config_loader import get_sensor_config
-            sensor_config = get_sensor_config(self.config, sensor_name)
-            if sensor_config:
-                read_interval = sensor_config.get('read_interval', 60)
-                break
-
-        self.logger.info(f"Read interval: {read_interval} seconds")
-
-        last_read_time = 0
+        # Each sensor is read on its own cadence on a bounded worker pool
+        scheduler_config = self.config.get('scheduler', {})
+        self.scheduler = SensorScheduler(
+            max_workers=scheduler_config.get('max_workers', len(self.sensors))
+        )
+        for sensor in self.sensors:
+            self.logger.info(f"{sensor.name} read interval: {sensor.read_interval} seconds")
+            self._schedule_sensor(sensor)
+
+        # Coalesce local history writes into one transaction per interval
+        if self.local_store:
+            flush_interval = self.config.get('local_store', {}).get('flush_interval', 60)
+            self.scheduler.add_job(
+                'local-store-flush',
+                flush_interval,
+                self.local_store.flush,
+                delay=flush_interval
+            )
+
+        # Flush batches that aged out between reads
+        if self.mqtt_client.batch:
+            self.scheduler.add_job(
+                'mqtt-batch-flush',
+                max(1, self.mqtt_client.batch.max_age / 10),
+                self._flush_aged_batch
+            )
+
+        # Node health on its own cadence, independent of sensor data
+        telemetry_config = self.config.get('telemetry', {})
+        if telemetry_config.get('enabled', True):
+            self._init_telemetry(telemetry_config)
+
+        # Local scrape endpoint (/metrics, /readings.json)
+        http_config = self.config.get('http', {})
+        if http_config.get('enabled', False):
+            self._start_metrics_server(http_config)
+
+        # Commands received so far were queued; run them now that the
+        # scheduler exists
+        if self.commands:
+            self.commands.start()
 
         while self.running:
             try:
-                current_time = time.time()
-
-                # Read and publish data
-                if current_time - last_read_time >= read_interval:
-                    self._read_and_publish()
-                    last_read_time = current_time
-
-                # Check MQTT connection
-                if not self.mqtt_client.connected:
-                    self.logger.warning("MQTT disconnected, reconnecting...")
-                    self.led.status_warning()
-                    if self.mqtt_client.connect():
-                        self.mqtt_client.publish_birth(self._get_birth_metrics())
-                        self.led.status_ok()
-
-                time.sleep(1)
+                # Sleeps until the next due read or shutdown
+                self.scheduler.run()
 
             except Exception as e:
                 self.logger.error(f"Error in main loop: {e}")
                 self.logger.error(traceback.format_exc())
-                self.led.flash(LEDController.COLOR_RED, times=3)
+                self.led.flash(LEDController.COLOR_RED, times=3, priority=PRIORITY_HIGH)
                 time.sleep(5)
 
+        self.logger.info(f"Scheduler stats: {self.scheduler.get_stats()}")
+        for name, deadband_filter in self.deadbands.items():
+            self.logger.info(f"{name} deadband: {deadband_filter.get_stats()}")
+        for name, sampler in self.samplers.items():
+            self.logger.info(f"{name} adaptive sampling: {sampler.get_stats()}")
+        if self.history:
+            stats = self.history.get_stats()
+            self.logger.info(f"History: {stats['points']} points in {stats['bytes']} bytes "
+                             f"({stats['bits_per_point']} bits/point)")
+        self._log_instrumentation()
         self.logger.info("Main loop stopped")
 
-    def _read_and_publish(self):
-        """Read all sensors and publish data"""
+    def _log_instrumentation(self):
+        """Log a summary of the hot-path histograms and counters"""
+        for instrument in REGISTRY.collect():
+            name = format_name(instrument.name, instrument.labels)
+            if instrument.kind != 'histogram':
+                if instrument.value:
+                    self.logger.info(f"{name}: {instrument.value}")
+                continue
+
+            summary = instrument.summary()
+            if not summary['count']:
+                continue
+            if instrument.unit == 'seconds':
+                scale, unit = 1000, 'ms'
+            else:
+                scale, unit = 1, ' B'
+            self.logger.info(
+                f"{name}: n={summary['count']} "
+                + ' '.join(f"{q}={summary[q] * scale:.3g}{unit}" for q in ('p50', 'p99', 'max'))
+            )
+
+    def _init_telemetry(self, telemetry_config):
+        """Schedule the periodic telemetry message"""
+        from utils import NodeTelemetry
+
+        self.telemetry = NodeTelemetry(
+            wifi_interface=self.network.wifi if self.network else 'wlan0'
+        )
+        self.telemetry.mqtt_client = self.mqtt_client
+        self.telemetry.scheduler = self.scheduler
+        # Baseline for the CPU usage of the first message
+        self.telemetry.collect()
+
+        interval = telemetry_config.get('interval', 60)
+        self.scheduler.add_job('telemetry', interval, self._publish_telemetry, delay=interval)
+
+    def _publish_telemetry(self):
+        """Telemetry job: collect and publish one health snapshot"""
+        telemetry = self.telemetry.collect()
+        if self.mqtt_client.publish_telemetry(telemetry):
+            self.logger.debug(f"Published telemetry: {telemetry}")
+
+    def _start_metrics_server(self, http_config):
+        """Serve the latest readings and instruments over HTTP"""
+        from utils import LatestReadings, MetricsServer
+
+        self.latest = LatestReadings()
+        self.metrics_server = MetricsServer(
+            self.latest,
+            self.mqtt_client.node_id,
+            host=http_config.get('host', '0.0.0.0'),
+            port=http_config.get('port', 9108)
+        )
+        if not self.metrics_server.start():
+            self.latest = None
+            self.metrics_server = None
+
+    def _schedule_sensor(self, sensor):
+        """Add the periodic read job of a sensor"""
+        # Sensors still warming up get their first read once they should be ready
+        self.scheduler.add_job(
+            sensor.name,
+            sensor.read_interval,
+            lambda sensor=sensor: self._read_and_publish(sensor),
+            delay=sensor.warmup_remaining()
+        )
+
+    def _flush_aged_batch(self):
+        """Publish the pending batch once its oldest sample reached max_age"""
+        if self.mqtt_client.batch.is_full():
+            self.mqtt_client.flush_batch()
+
+    def _read_and_publish(self, sensor):
+        """
+        Read one sensor and publish its data
+
+        Args:
+            sensor: Sensor to read (runs on a scheduler worker thread)
+        """
         try:
-            metrics = []
+            if not sensor.is_ready():
+                self.logger.info(f"{sensor.name} still warming up, skipping this read")
+                return
+
             timestamp = int(time.time() * 1000)
 
-            for sensor in self.sensors:
-                try:
-                    sensor_metrics = sensor.get_metrics(timestamp)
-                    metrics.extend(sensor_metrics)
-                    self.logger.debug(f"Read {len(sensor_metrics)} metrics from {sensor.name}")
-                except Exception as e:
-                    self.logger.error(f"Failed to read {sensor.name}: {e}")
+            try:
+                metrics = sensor.get_metrics(timestamp)
+                self.logger.debug(f"Read {len(metrics)} metrics from {sensor.name}")
+            except Exception as e:
+                self.logger.error(f"Failed to read {sensor.name}: {e}")
+                return
+
+            if metrics and self.history:
+                self.history.append_readings(metrics)
+            if metrics and self.local_store:
+                self.local_store.add_readings(metrics)
+            if metrics and self.latest:
+                self.latest.update(metrics)
+
+            # Adaptive sampling: follow the signal's variability
+            sampler = self.samplers.get(sensor.name)
+            if sampler and metrics:
+                interval = sampler.update(metrics)
+                if interval is not None:
+                    sensor.set_read_interval(interval)
+                    self.scheduler.set_interval(sensor.name, interval)
+
+            # Aggregated sensors publish once per closed window
+            aggregator = self.aggregators.get(sensor.name)
+            if aggregator and metrics:
+                metrics = aggregator.add(metrics)
+                if not metrics:
+                    self.logger.debug(f"{sensor.name}: sample added to aggregation window")
+                    return
+
+            # Report by exception: drop metrics that stayed within their deadband
+            deadband_filter = self.deadbands.get(sensor.name)
+            if deadband_filter and metrics:
+                metrics = deadband_filter.filter(metrics)
+                if not metrics:
+                    self.logger.debug(f"{sensor.name}: all metrics within deadband")
+                    return
 
             if metrics:
-                if self.mqtt_client.publish_data(metrics):
-                    self.logger.info(f"Published {len(metrics)} metrics")
-                    self.led.flash(LEDController.COLOR_GREEN, duration=0.1, times=1)
+                outcome = self.mqtt_client.publish_data(metrics, interval=sensor.read_interval)
+                if outcome == self.mqtt_client.PUBLISH_SENT:
+                    self.logger.info(f"Published {len(metrics)} metrics from {sensor.name}")
+                    self._record_first_publish()
+                    self.led.flash(LEDController.COLOR_GREEN, duration=0.1, times=1,
+                                   priority=PRIORITY_LOW)
+                elif outcome == self.mqtt_client.PUBLISH_STORED:
+                    self.logger.info(f"Stored {len(metrics)} metrics from {sensor.name} (offline)")
+                elif outcome == self.mqtt_client.PUBLISH_BATCHED:
+                    self.logger.debug(f"Batched {len(metrics)} metrics from {sensor.name}")
                 else:
-                    self.logger.warning("Failed to publish data")
+                    self.logger.warning(f"Failed to publish {sensor.name} data")
                     self.led.flash(LEDController.COLOR_YELLOW, times=2)
+            elif sensor.continuous:
+                # Read interval shorter than the sample interval; stale
+                # samples are reported by the sensor itself
+                self.logger.debug(f"{sensor.name}: no new sample since the previous read")
             else:
-                self.logger.warning("No metrics to publish")
+                self.logger.warning(f"No metrics to publish from {sensor.name}")
 
         except Exception as e:
             self.logger.error(f"Error reading and publishing: {e}")
             self.logger.error(traceback.format_exc())
 
+    def _record_first_publish(self):
+        """
+        Log the time from process start to the first reading the broker got
+        (a live publish, or the first confirmed outbox replay)
+        """
+        # Workers and the outbox drain thread may race for the first one
+        with self._first_publish_lock:
+            if self.first_publish_time is not None:
+                return
+            self.first_publish_time = time.monotonic() - self.start_time
+
+        self.logger.info(f"First publish {self.first_publish_time:.2f} seconds after start")
+        if self.profile_startup:
+            print(f"{'first publish':<12} {self.first_publish_time:>7.3f}s")
+
+    def _find_sensor(self, name):
+        """Get an initialized sensor by name (case-insensitive)"""
+        for sensor in self.sensors:
+            if sensor.name.lower() == str(name).lower():
+                return sensor
+        raise CommandError(f"Unknown sensor: {name}")
+
+    def _select_sensors(self, parameters):
+        """Get the sensors named in a command (default: all enabled sensors)"""
+        names = parameters.get('sensors')
+        if names is None:
+            return [sensor for sensor in self.sensors if sensor.name not in self.disabled_sensors]
+        if isinstance(names, str):
+            names = [names]
+        return [self._find_sensor(name) for name in names]
+
+    def _cmd_set_interval(self, parameters):
+        """
+        Change the read interval of one sensor (or all sensors)
+
+        An explicit interval overrides adaptive sampling for the sensor.
+
+        Args:
+            parameters: {"read_interval": seconds, "sensor": name (optional)}
+        """
+        interval = parameters.get('read_interval')
+        if isinstance(interval, bool) or not isinstance(interval, (int, float)) or interval <= 0:
+            raise CommandError(f"Invalid read_interval: {interval!r}")
+
+        if parameters.get('sensor'):
+            sensors = [self._find_sensor(parameters['sensor'])]
+        else:
+            sensors = self.sensors
+
+        intervals = {}
+        for sensor in sensors:
+            if self.samplers.pop(sensor.name, None):
+                self.logger.info(f"{sensor.name}: adaptive sampling disabled by set_interval")
+            sensor.set_read_interval(interval)
+            # Disabled sensors keep the interval for when they are enabled
+            self.scheduler.set_interval(sensor.name, interval)
+            intervals[sensor.name] = interval
+
+        return {'intervals': intervals}
+
+    def _cmd_enable_sensor(self, parameters):
+        """Resume reading a sensor disabled by disable_sensor"""
+        sensor = self._find_sensor(parameters.get('sensor'))
+        if sensor.name in self.disabled_sensors:
+            sensor.start_acquisition()
+            self._schedule_sensor(sensor)
+            self.disabled_sensors.discard(sensor.name)
+            self.logger.info(f"{sensor.name} enabled by command")
+        return {'sensor': sensor.name, 'enabled': True}
+
+    def _cmd_disable_sensor(self, parameters):
+        """Stop reading a sensor (it stays initialized)"""
+        sensor = self._find_sensor(parameters.get('sensor'))
+        if sensor.name not in self.disabled_sensors:
+            self.scheduler.remove_job(sensor.name)
+            self._end_burst(sensor.name)
+            sensor.stop_acquisition()
+            self.disabled_sensors.add(sensor.name)
+            self.logger.info(f"{sensor.name} disabled by command")
+        return {'sensor': sensor.name, 'enabled': False}
+
+    def _cmd_set_deadband(self, parameters):
+        """
+        Replace the deadbands of a sensor
+
+        Args:
+            parameters: {"sensor": name, "max_silence": seconds,
+                         "metrics": {key: {"absolute": x, "percent": y}}}
+                        (empty metrics turn report by exception off)
+        """
+        sensor = self._find_sensor(parameters.get('sensor'))
+        # Aggregated statistics ("temperature/max") may have deadbands too
+        unknown = [key for key in (parameters.get('metrics') or {})
+                   if key.split('/')[0] not in sensor.METRICS]
+        if unknown:
+            raise CommandError(f"Unknown metrics for {sensor.name}: {', '.join(unknown)}")
+
+        if parameters.get('metrics'):
+            deadband_filter = DeadbandFilter.from_config(parameters)
+            self.deadbands[sensor.name] = deadband_filter
+            result = {
+                'sensor': sensor.name,
+                'metrics': sorted(deadband_filter.deadbands),
+                'max_silence': deadband_filter.max_silence
+            }
+        else:
+            self.deadbands.pop(sensor.name, None)
+            result = {'sensor': sensor.name, 'metrics': []}
+
+        # The catalog announces deadbands and max_silence
+        self.mqtt_client.publish_birth(self._get_birth_metrics())
+        return result
+
+    def _cmd_set_log_level(self, parameters):
+        """
+        Change a logger's level
+
+        Args:
+            parameters: {"level": "DEBUG"|"INFO"|..., "logger": name (default "smartsense")}
+        """
+        name = parameters.get('logger') or 'smartsense'
+        if name != 'smartsense' and not name.startswith('smartsense.'):
+            raise CommandError(f"Unknown logger: {name}")
+
+        level = getattr(logging, str(parameters.get('level', '')).upper(), None)
+        if not isinstance(level, int):
+            raise CommandError(f"Invalid log level: {parameters.get('level')!r}")
+
+        logging.getLogger(name).setLevel(level)
+        return {'logger': name, 'level': logging.getLevelName(level)}
+
+    def _cmd_read(self, parameters):
+        """
+        Read sensors now and return the readings in the response
+
+        Readings are not published on the sensors topic or stored.
+
+        Args:
+            parameters: {"sensors": [names] (optional, default all enabled)}
+        """
+        timestamp = int(time.time() * 1000)
+        readings = {}
+        errors = {}
+
+        for sensor in self._select_sensors(parameters):
+            if not sensor.is_ready():
+                errors[sensor.name] = f"warming up ({sensor.warmup_remaining():.1f}s left)"
+                continue
+            # Peek: leave buffered data and power state to the scheduled reads
+            metrics = sensor.get_metrics(timestamp, peek=True)
+            if not metrics:
+                errors[sensor.name] = "no data"
+                continue
+            for metric in metrics:
+                readings[metric.name] = {
+                    'value': metric.value,
+                    'unit': metric.unit,
+                    'timestamp': metric.timestamp
+                }
+
+        result = {'sensors': readings}
+        if errors:
+            result['errors'] = errors
+        return result
+
+    def _cmd_burst(self, parameters):
+        """
+        Sample sensors at a high rate for a while on the burst topic
+
+        Runs as extra scheduler jobs next to the regular reads, which keep
+        their cadence; the jobs remove themselves when the burst ends.
+
+        Args:
+            parameters: {"duration": seconds, "interval": seconds (default 1),
+                         "sensors": [names] (optional)}
+        """
+        duration = parameters.get('duration', 60)
+        if isinstance(duration, bool) or not isinstance(duration, (int, float)) or duration <= 0:
+            raise CommandError(f"Invalid duration: {duration!r}")
+        if duration > self.burst_max_duration:
+            raise CommandError(f"Duration exceeds {self.burst_max_duration} seconds")
+
+        interval = parameters.get('interval', self.burst_min_interval)
+        if isinstance(interval, bool) or not isinstance(interval, (int, float)) or interval <= 0:
+            raise CommandError(f"Invalid interval: {interval!r}")
+        interval = max(float(interval), self.burst_min_interval)
+
+        sensors = self._select_sensors(parameters)
+        if not sensors:
+            raise CommandError("No sensors to sample")
+
+        burst_id = f"burst-{int(time.time() * 1000):x}"
+        burst = {
+            'id': burst_id,
+            'until': time.monotonic() + duration,
+            'samples': {},
+            'pending': set()
+        }
+        intervals = {}
+
+        for sensor in sensors:
+            # A new burst on the same sensor replaces the running one
+            if sensor.name in self.bursts:
+                self._end_burst(sensor.name)
+            sensor.begin_burst(duration)
+            # Never sample faster than the sensor produces new data
+            sensor_interval = max(interval, sensor.NATIVE_INTERVAL)
+            intervals[sensor.name] = sensor_interval
+            burst['samples'][sensor.name] = 0
+            burst['pending'].add(sensor.name)
+            self.bursts[sensor.name] = burst
+            self.scheduler.add_job(
+                f"burst:{sensor.name}",
+                sensor_interval,
+                lambda sensor=sensor, sensor_interval=sensor_interval:
+                    self._burst_sample(sensor, sensor_interval)
+            )
+
+        self.logger.info(f"Burst {burst_id}: {', '.join(burst['samples'])} "
+                         f"every {interval}s for {duration}s")
+        return {
+            'burst': burst_id,
+            'topic': self.mqtt_client.topic_burst,
+            'duration': duration,
+            'intervals': intervals
+        }
+
+    def _burst_sample(self, sensor, interval):
+        """Take and publish one burst sample (scheduler job)"""
+        burst = self.bursts.get(sensor.name)
+        if burst is None:
+            return
+        if time.monotonic() >= burst['until']:
+            self._end_burst(sensor.name)
+            return
+
+        metrics = sensor.get_metrics(int(time.time() * 1000), peek=True)
+        if metrics and self.mqtt_client.publish_burst(burst['id'], metrics, interval):
+            burst['samples'][sensor.name] += 1
+
+    def _end_burst(self, sensor_name):
+        """Stop the burst job of a sensor; the last sensor publishes the end marker"""
+        burst = self.bursts.pop(sensor_name, None)
+        if burst is None:
+            return
+
+        self.scheduler.remove_job(f"burst:{sensor_name}")
+        burst['pending'].discard(sensor_name)
+        if not burst['pending']:
+            self.mqtt_client.publish_burst_end(burst['id'], burst['samples'])
+            self.logger.info(f"Burst {burst['id']} finished: {burst['samples']}")
+
     def shutdown(self):
         """Cleanup and shutdown"""
         self.logger.info("Shutting down...")
 
         self.running = False
 
+        if self.commands:
+            self.commands.stop()
+
+        if self.scheduler:
+            self.scheduler.shutdown(wait=False)
+
+        if self.metrics_server:
+            self.metrics_server.stop()
+
         if self.mqtt_client:
+            # Publish the statistics of windows that are still open
+            for aggregator in self.aggregators.values():
+                summary = aggregator.flush()
+                if summary:
+                    self.mqtt_client.publish_data(summary)
             self.mqtt_client.disconnect()
 
+        if self.local_store:
+            self.local_store.close()
+
+        if self.network:
+            self.network.stop()
+
+        if self.discovery:
+            self.discovery.close()
+
         for sensor in self.sensors:
             try:
+                sensor.stop_acquisition()
                 sensor.close()
             except Exception as e:
                 self.logger.error(f"Error closing {sensor.name}: {e}")
@@ -395,15 +1009,22 @@ class SensorNode:
 
         if self.buzzer:
             self.buzzer.beep(duration=0.2, times=1)
-            self.buzzer.close()
+            self.buzzer.close(drain_timeout=1.0)
 
         self.logger.info("Shutdown complete")
 
 
 def main():
     """Main entry point"""
+    parser = argparse.ArgumentParser(description="SmartSense Sensor Node")
+    parser.add_argument('--config', default='config.yaml',
+                        help="Path to the configuration file")
+    parser.add_argument('--profile-startup', action='store_true',
+                        help="Print the time spent in each startup phase")
+    args = parser.parse_args()
+
     try:
-        node = SensorNode()
+        node = SensorNode(args.config, profile_startup=args.profile_startup)
 
         if not node.setup():
             sys.exit(1)
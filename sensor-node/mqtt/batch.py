@@ -0,0 +1,114 @@
+"""
+Multi-sample batching for SmartSense sensor data
+
+Collects several read cycles into one columnar message so the broker and the
+backend handle one message (and one database insert) instead of many.
+"""
+
+import threading
+import time
+from typing import Dict, Any, List, Optional
+
+
+class BatchBuffer:
+    """
+    Columnar accumulator for sensor metrics
+
+    Samples are stored per metric as parallel arrays of timestamps and
+    values::
+
+        {"BME680/temperature": {"unit": "°C", "t": [...], "v": [...]}}
+
+    The buffer reports itself full after ``max_cycles`` read cycles, once the
+    estimated encoded size reaches ``max_bytes``, or when the oldest sample
+    is older than ``max_age`` seconds.
+    """
+
+    # Estimated JSON overhead per sample (timestamp digits, separators)
+    SAMPLE_OVERHEAD = 16
+    # Estimated JSON overhead per metric column (keys, braces)
+    COLUMN_OVERHEAD = 32
+
+    def __init__(self, max_cycles: int = 20, max_bytes: int = 16384,
+                 max_age: float = 300):
+        """
+        Initialize batch buffer
+
+        Args:
+            max_cycles: Read cycles per batch
+            max_bytes: Approximate payload size budget in bytes
+            max_age: Maximum age of the oldest sample in seconds
+        """
+        self.max_cycles = max(1, int(max_cycles))
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+
+        self._lock = threading.Lock()
+        self._columns: Dict[str, Dict[str, Any]] = {}
+        self._cycles = 0
+        self._size = 0
+        self._started: Optional[float] = None
+
+    def add(self, metrics: List[Any]) -> bool:
+        """
+        Add one read cycle
+
+        Args:
+            metrics: List of readings (see sensors.reading.Reading)
+
+        Returns:
+            True if the batch is full and should be flushed
+        """
+        with self._lock:
+            if self._started is None:
+                self._started = time.monotonic()
+
+            for metric in metrics:
+                spec = metric.spec
+                column = self._columns.get(spec.name)
+                if column is None:
+                    column = {'unit': spec.unit, 't': [], 'v': []}
+                    self._columns[spec.name] = column
+                    self._size += len(spec.name) + len(spec.unit) + self.COLUMN_OVERHEAD
+
+                value = metric.value
+                column['t'].append(metric.timestamp)
+                column['v'].append(value)
+                self._size += len(str(value)) + self.SAMPLE_OVERHEAD
+
+            self._cycles += 1
+            return self._is_full()
+
+    def _is_full(self) -> bool:
+        """Check flush conditions (lock held)"""
+        if self._cycles >= self.max_cycles or self._size >= self.max_bytes:
+            return True
+        return self._started is not None and time.monotonic() - self._started >= self.max_age
+
+    def is_full(self) -> bool:
+        """Check whether the batch should be flushed"""
+        with self._lock:
+            return self._is_full()
+
+    def take(self) -> Optional[Dict[str, Dict[str, Any]]]:
+        """
+        Remove and return the collected columns
+
+        Returns:
+            Metric columns, or None if the buffer is empty
+        """
+        with self._lock:
+            if not self._columns:
+                return None
+
+            columns = self._columns
+            self._columns = {}
+            self._cycles = 0
+            self._size = 0
+            self._started = None
+            return columns
+
+    @property
+    def cycles(self) -> int:
+        """Number of read cycles currently buffered"""
+        return self._cycles
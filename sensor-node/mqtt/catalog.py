@@ -0,0 +1,120 @@
+"""
+Metric catalog for the SmartSense birth certificate
+
+Describes every metric a node can publish (name, unit, type, resolution) and
+assigns each a small integer alias that data messages can use instead of the
+full "SENSOR/metric" name.
+"""
+
+import hashlib
+import json
+from typing import Dict, Any, List, Optional
+
+
+class MetricCatalog:
+    """
+    Versioned metric catalog with integer aliases
+
+    Aliases start at 1 in name order when the catalog is built and new
+    metrics are appended with the next free alias, so existing aliases never
+    change while the node runs. The catalog hash covers every entry; data
+    messages carry it so consumers can tell which catalog they refer to.
+    """
+
+    VERSION = 1
+
+    def __init__(self, metrics: Optional[List[Dict[str, Any]]] = None):
+        """
+        Initialize catalog
+
+        Args:
+            metrics: Metric descriptions (name, unit, type, resolution)
+        """
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self.hash = ''
+
+        for metric in sorted(metrics or [], key=lambda m: m['name']):
+            self._add(metric)
+        self._update_hash()
+
+    def _add(self, metric: Dict[str, Any]):
+        name = metric['name']
+        resolution = metric.get('resolution')
+        self._entries[name] = {
+            'name': name,
+            'alias': len(self._entries) + 1,
+            'unit': metric.get('unit', ''),
+            'type': metric.get('type') or self.infer_type(resolution),
+            'resolution': resolution
+        }
+        # Report-by-exception metrics (see utils.deadband)
+        # .get() rather than "in": metrics may be Reading records
+        max_silence = metric.get('max_silence')
+        if max_silence is not None:
+            self._entries[name]['deadband'] = metric.get('deadband') or {}
+            self._entries[name]['max_silence'] = max_silence
+
+    def _update_hash(self):
+        canonical = json.dumps(list(self._entries.values()), sort_keys=True,
+                               ensure_ascii=False, separators=(',', ':'))
+        self.hash = hashlib.sha1(canonical.encode('utf-8')).hexdigest()[:8]
+
+    @staticmethod
+    def infer_type(resolution: Optional[float]) -> str:
+        """
+        Infer the metric type from its resolution
+
+        Args:
+            resolution: Metric resolution (None for non-numeric metrics)
+
+        Returns:
+            'int', 'float' or 'string'
+        """
+        if resolution is None:
+            return 'string'
+        return 'int' if float(resolution).is_integer() else 'float'
+
+    def extend(self, metrics: List[Dict[str, Any]]) -> bool:
+        """
+        Add metrics that are not in the catalog yet
+
+        Args:
+            metrics: Metrics (as published) or metric descriptions
+
+        Returns:
+            True if the catalog changed (a new birth is required)
+        """
+        changed = False
+        for metric in metrics:
+            if metric['name'] not in self._entries:
+                self._add(metric)
+                changed = True
+
+        if changed:
+            self._update_hash()
+        return changed
+
+    def alias(self, name: str) -> Optional[int]:
+        """Get the alias of a metric (None if unknown)"""
+        entry = self._entries.get(name)
+        return entry['alias'] if entry else None
+
+    def entries(self) -> List[Dict[str, Any]]:
+        """Get catalog entries in alias order"""
+        return list(self._entries.values())
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Get the catalog for the birth message
+
+        Returns:
+            Dict with version, hash and metric entries
+        """
+        return {
+            'version': self.VERSION,
+            'hash': self.hash,
+            'metrics': self.entries()
+        }
+
+    def __len__(self) -> int:
+        return len(self._entries)
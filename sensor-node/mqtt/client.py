@@ -4,16 +4,39 @@ MQTT Client for SmartSense Sensor Node
 
 import json
 import logging
+import random
+import threading
 import time
-from typing import Dict, Any, List, Callable, Optional
+from typing import Dict, Any, List, Callable, Optional, Union
 import paho.mqtt.client as mqtt
 
+from .outbox import Outbox
+from .batch import BatchBuffer
+from .encoding import create_encoder, sensors_message, StructEncoder
+from .catalog import MetricCatalog
+from utils.instrumentation import REGISTRY, SIZE
+
 
 class MQTTClient:
     """
     Simple MQTT Client for IoT sensor data
+
+    A background supervisor thread owns the network loop and reconnects with
+    jittered exponential backoff, so callers never block on the broker.
     """
 
+    # Connection states reported to state listeners
+    STATE_CONNECTING = 'connecting'
+    STATE_CONNECTED = 'connected'
+    STATE_DISCONNECTED = 'disconnected'
+    STATE_CLOSED = 'closed'
+
+    # Outcomes of publish_data() and flush_batch()
+    PUBLISH_SENT = 'sent'        # handed to the broker connection
+    PUBLISH_STORED = 'stored'    # in the outbox, replayed after reconnecting
+    PUBLISH_BATCHED = 'batched'  # buffered for the next batch message
+    PUBLISH_FAILED = 'failed'    # neither sent nor stored
+
     def __init__(self, config: Dict[str, Any], node_info: Dict[str, Any]):
         """
         Initialize MQTT client
@@ -41,7 +64,11 @@ class MQTTClient:
         self.topic_base = f"smartsense/{self.node_id}"
         self.topic_status = f"{self.topic_base}/status"
         self.topic_sensors = f"{self.topic_base}/sensors"
+        self.topic_batch = f"{self.topic_sensors}/batch"
+        self.topic_burst = f"{self.topic_sensors}/burst"
         self.topic_command = f"{self.topic_base}/command"
+        self.topic_response = f"{self.topic_command}/response"
+        self.topic_telemetry = f"{self.topic_base}/telemetry"
 
         # MQTT client
         self.client = mqtt.Client(client_id=self.client_id, clean_session=False)
@@ -54,6 +81,82 @@ class MQTTClient:
 
         # Connection state
         self.connected = False
+        self.state = self.STATE_DISCONNECTED
+        self.reconnect_count = 0
+        self._closing = threading.Event()
+        self._retry = threading.Event()
+        self._supervisor: Optional[threading.Thread] = None
+        self._state_listeners: List[Callable[[str], None]] = []
+        self._replay_listeners: List[Callable[[int], None]] = []
+        self._ever_connected = False
+
+        # Reconnect backoff; seeded by node_id so a fleet spreads out its retries
+        reconnect_config = config.get('reconnect', {})
+        self.reconnect_min_delay = reconnect_config.get('min_delay', 1.0)
+        self.reconnect_max_delay = reconnect_config.get('max_delay', 120.0)
+        self._backoff_rng = random.Random(self.node_id)
+
+        # Idempotency keys: unique per node as "{session}-{sequence}"
+        self._session = f"{int(time.time()):x}"
+        self._seq = 0
+        self._seq_lock = threading.Lock()
+
+        # Store-and-forward outbox for messages that could not be sent
+        outbox_config = config.get('outbox', {})
+        self.outbox: Optional[Outbox] = None
+        if outbox_config.get('enabled', True):
+            try:
+                self.outbox = Outbox(
+                    path=outbox_config.get('path', 'data/outbox'),
+                    max_bytes=outbox_config.get('max_bytes', 50 * 1024 * 1024),
+                    segment_bytes=outbox_config.get('segment_bytes', 1024 * 1024),
+                    fsync=outbox_config.get('fsync', False)
+                )
+            except Exception as e:
+                self.logger.error(f"Failed to open outbox, offline data will be lost: {e}")
+        self.drain_rate = outbox_config.get('drain_rate', 20)  # messages per second
+        self.drain_batch = outbox_config.get('drain_batch', 50)
+        self._drain_thread: Optional[threading.Thread] = None
+        self._drain_lock = threading.Lock()
+
+        # Payload encoding for data messages (announced in the birth message)
+        self.encoder = create_encoder(config.get('encoding', 'json'))
+
+        # Hot-path instrumentation (exported by the node's telemetry)
+        self._encode_seconds = REGISTRY.histogram(
+            'mqtt_encode_seconds', 'Data payload encoding time')
+        self._payload_bytes = REGISTRY.histogram(
+            'mqtt_payload_bytes', 'Encoded data payload size', layout=SIZE)
+        self._publish_seconds = REGISTRY.histogram(
+            'mqtt_publish_seconds', 'Time spent in paho publish() (queue and socket write)')
+        self._stored = REGISTRY.counter(
+            'mqtt_messages_stored_total', 'Messages written to the outbox')
+        self._dropped = REGISTRY.counter(
+            'mqtt_messages_dropped_total', 'Messages neither sent nor stored')
+        REGISTRY.gauge('mqtt_outbox_depth', lambda: self.outbox.depth if self.outbox else 0,
+                       'Messages waiting in the outbox')
+
+        # Metric catalog announced in the birth message; data messages can
+        # reference metrics by integer alias instead of "SENSOR/metric"
+        self.catalog = MetricCatalog()
+        # Scheduler workers publish concurrently: catalog and layout changes
+        # and the birth announcing them happen under this lock (re-entrant,
+        # publish_status() takes it too)
+        self._catalog_lock = threading.RLock()
+        self.use_aliases = config.get('use_aliases', False)
+        if isinstance(self.encoder, StructEncoder):
+            # Struct payloads already address metrics by alias
+            self.use_aliases = False
+
+        # Optional multi-sample batching on the sensors/batch topic
+        batch_config = config.get('batch', {})
+        self.batch: Optional[BatchBuffer] = None
+        if batch_config.get('enabled', False):
+            self.batch = BatchBuffer(
+                max_cycles=batch_config.get('max_cycles', 20),
+                max_bytes=batch_config.get('max_bytes', 16384),
+                max_age=batch_config.get('max_age', 300)
+            )
 
         # Set Last Will and Testament (offline status)
         offline_status = json.dumps({
@@ -63,13 +166,23 @@ class MQTTClient:
         })
         self.client.will_set(self.topic_status, offline_status, qos=1, retain=True)
 
-    def connect(self) -> bool:
+    def connect(self, timeout: float = 10) -> bool:
         """
-        Connect to MQTT broker
+        Start the connection supervisor and wait for the first connection
+
+        The supervisor keeps (re)connecting in the background even if this
+        call times out.
+
+        Args:
+            timeout: Seconds to wait for the broker to accept the connection
+                     (0 to return at once; follow the state listeners)
 
         Returns:
-            True if connection successful
+            True if connected within the timeout
         """
+        if self._supervisor and self._supervisor.is_alive():
+            return self.connected
+
         try:
             # Set credentials if provided
             if self.username and self.password:
@@ -79,42 +192,166 @@ class MQTTClient:
             if self.use_tls:
                 self.client.tls_set()
 
-            # Connect to broker
-            self.logger.info(f"Connecting to MQTT broker at {self.broker_host}:{self.broker_port}")
-            self.client.connect(self.broker_host, self.broker_port, keepalive=60)
+        except Exception as e:
+            self.logger.error(f"Failed to configure MQTT client: {e}")
+            return False
+
+        self._supervisor = threading.Thread(
+            target=self._supervise,
+            name="mqtt-supervisor",
+            daemon=True
+        )
+        self._supervisor.start()
+        if timeout <= 0:
+            return self.connected
+
+        # Wait for connection
+        start_time = time.monotonic()
+        while not self.connected and (time.monotonic() - start_time) < timeout:
+            time.sleep(0.1)
+
+        if self.connected:
+            self.logger.info("MQTT connected successfully")
+            return True
+        else:
+            self.logger.warning("MQTT connection timeout, retrying in background")
+            return False
+
+    def add_state_listener(self, listener: Callable[[str], None]):
+        """
+        Register a callback for connection state changes
+
+        Args:
+            listener: Called with the new state (connecting, connected,
+                      disconnected, closed) from the supervisor thread
+        """
+        self._state_listeners.append(listener)
+
+    def add_replay_listener(self, listener: Callable[[int], None]):
+        """
+        Register a callback for outbox messages confirmed by the broker
+
+        Args:
+            listener: Called with the number of replayed messages after each
+                      acknowledged batch, from the outbox drain thread
+        """
+        self._replay_listeners.append(listener)
+
+    def _set_state(self, state: str):
+        """Update connection state and notify listeners"""
+        if state == self.state:
+            return
 
-            # Start network loop
-            self.client.loop_start()
+        self.state = state
+        for listener in self._state_listeners:
+            try:
+                listener(state)
+            except Exception as e:
+                self.logger.error(f"State listener failed: {e}")
 
-            # Wait for connection
-            timeout = 10
-            start_time = time.time()
-            while not self.connected and (time.time() - start_time) < timeout:
-                time.sleep(0.1)
+    def _backoff_delay(self, attempt: int) -> float:
+        """
+        Get the delay before a reconnect attempt ("equal jitter")
+
+        Args:
+            attempt: Number of consecutive failed attempts (>= 1)
+
+        Returns:
+            Delay in seconds between half and all of the exponential backoff
+        """
+        ceiling = min(self.reconnect_max_delay,
+                      self.reconnect_min_delay * (2 ** min(attempt - 1, 16)))
+        return ceiling / 2 + self._backoff_rng.uniform(0, ceiling / 2)
+
+    def _supervise(self):
+        """Own the network loop: connect, run, and reconnect with backoff"""
+        attempt = 0
+        socket_open = False
+
+        while True:
+            if not socket_open:
+                if self._closing.is_set():
+                    break
+
+                if attempt:
+                    delay = self._backoff_delay(attempt)
+                    self.logger.info(f"Reconnecting to MQTT broker in {delay:.1f}s (attempt {attempt})")
+                    self._retry.wait(delay)
+                    self._retry.clear()
+                    if self._closing.is_set():
+                        break
+
+                self._set_state(self.STATE_CONNECTING)
+                try:
+                    self.logger.info(f"Connecting to MQTT broker at {self.broker_host}:{self.broker_port}")
+                    self.client.connect(self.broker_host, self.broker_port, keepalive=60)
+                    socket_open = True
+                except Exception as e:
+                    self.logger.warning(f"Failed to connect to MQTT broker: {e}")
+                    self._set_state(self.STATE_DISCONNECTED)
+                    attempt += 1
+                    continue
+
+            rc = self.client.loop(timeout=1.0)
 
             if self.connected:
-                self.logger.info("MQTT connected successfully")
-                return True
-            else:
-                self.logger.error("MQTT connection timeout")
-                return False
+                attempt = 0
+            elif rc != mqtt.MQTT_ERR_SUCCESS:
+                # Connection lost or refused; the socket is closed by paho
+                socket_open = False
+                attempt += 1
+                self._set_state(self.STATE_DISCONNECTED)
 
-        except Exception as e:
-            self.logger.error(f"Failed to connect to MQTT broker: {e}")
-            return False
+        self._set_state(self.STATE_CLOSED)
+
+    def set_broker(self, host: str, port: int):
+        """
+        Re-target the client at another broker address
+
+        The current connection (if any) is closed and the supervisor
+        reconnects to the new address right away; queued data goes to the
+        outbox meanwhile.
+
+        Args:
+            host: Broker host
+            port: Broker port
+        """
+        if (host, port) == (self.broker_host, self.broker_port):
+            return
+
+        self.logger.info(f"MQTT broker moved: {self.broker_host}:{self.broker_port} -> {host}:{port}")
+        self.broker_host = host
+        self.broker_port = port
+        if self.connected:
+            self.client.disconnect()
+        self._retry.set()
+
+    def retry_now(self):
+        """Skip the current reconnect backoff (e.g. the network came back)"""
+        if not self.connected:
+            self._retry.set()
 
     def disconnect(self):
         """Disconnect from MQTT broker"""
         try:
+            # Send whatever is still batched
+            self.flush_batch()
+
             # Publish offline status
             self.publish_status('offline')
 
-            # Disconnect
-            self.client.loop_stop()
+            # Disconnect; the supervisor flushes the DISCONNECT and exits
+            self._closing.set()
+            self._retry.set()
             self.client.disconnect()
+            if self._supervisor:
+                self._supervisor.join(timeout=5)
             self.connected = False
             self.logger.info("MQTT disconnected")
 
+            if self.outbox:
+                self.outbox.close()
+
         except Exception as e:
             self.logger.error(f"Error during disconnect: {e}")
 
@@ -129,15 +366,26 @@ class MQTTClient:
             True if publish successful
         """
         try:
-            payload = json.dumps({
+            status_data = {
                 'node_id': self.node_id,
                 'status': status,
                 'location': self.node_info.get('location', ''),
                 'description': self.node_info.get('description', ''),
                 'timestamp': int(time.time() * 1000)
-            })
+            }
+
+            with self._catalog_lock:
+                # Birth: tell consumers how to decode data messages
+                if status == 'online':
+                    status_data['encoding'] = self.encoder.describe()
+                    if len(self.catalog):
+                        status_data['catalog'] = self.catalog.to_dict()
+
+                payload = json.dumps(status_data)
 
-            result = self.client.publish(self.topic_status, payload, qos=1, retain=True)
+                # Published under the lock so no data message using a new
+                # alias or position can overtake the birth announcing it
+                result = self.client.publish(self.topic_status, payload, qos=1, retain=True)
             # Wait for publish with timeout
             if result.rc == 0:
                 self.logger.info(f"Published status: {status}")
@@ -152,53 +400,332 @@ class MQTTClient:
 
     def publish_birth(self, metrics: List[Dict[str, Any]] = None) -> bool:
         """
-        Publish birth message (node online with sensor list)
+        Publish birth message (node online with metric catalog)
 
         Args:
-            metrics: List of available sensors/metrics (optional)
+            metrics: Metric descriptions (name, unit, resolution, optional type)
+                     for every metric the node can publish
 
         Returns:
             True if publish successful
         """
-        # For compatibility, just publish online status
+        if metrics is not None:
+            catalog = MetricCatalog(metrics)
+            with self._catalog_lock:
+                if catalog.hash != self.catalog.hash:
+                    self.logger.info(f"Metric catalog {catalog.hash} ({len(catalog)} metrics)")
+                    self.catalog = catalog
+                self.encoder.update_layout(self.catalog.entries())
+
+        # The supervisor publishes the birth on every (re)connect
+        if not self.connected:
+            self.logger.info("MQTT not connected, birth will be published on connect")
+            return False
+
         return self.publish_status('online')
 
-    def publish_data(self, metrics: List[Dict[str, Any]]) -> bool:
+    def _update_catalog(self, metrics: List[Any]):
+        """Re-publish the birth message if metrics appear that were never announced"""
+        with self._catalog_lock:
+            # Fast path: every metric is already in the catalog
+            if all(self.catalog.alias(metric.name) is not None for metric in metrics):
+                return
+
+            catalog_changed = self.catalog.extend(metrics)
+            layout_changed = self.encoder.update_layout(self.catalog.entries())
+
+            if catalog_changed or layout_changed:
+                self.logger.info(f"Metric catalog changed ({self.catalog.hash}), re-publishing birth")
+                self.publish_status('online')
+
+    def _metric_key(self, name: str) -> Any:
+        """Get the key for a metric in data messages (alias or full name)"""
+        if self.use_aliases:
+            alias = self.catalog.alias(name)
+            if alias is not None:
+                return alias
+        return name
+
+    def publish_data(self, metrics: List[Any], interval: Optional[float] = None) -> str:
         """
         Publish sensor data
 
         Args:
-            metrics: List of sensor readings
-                    Each metric should have: name, value, unit, timestamp
+            metrics: List of sensor readings (see sensors.reading.Reading)
+            interval: Effective read interval of the sensor in seconds
+                      (sent as ``interval``, not carried by batches)
+
+        Returns:
+            PUBLISH_SENT, PUBLISH_STORED, PUBLISH_BATCHED or PUBLISH_FAILED
+        """
+        # New metrics must be announced before data refers to them
+        self._update_catalog(metrics)
+
+        if self.batch:
+            if self.batch.add(metrics):
+                return self.flush_batch()
+            return self.PUBLISH_BATCHED
+
+        try:
+            header = {
+                'node_id': self.node_id,
+                'msg_id': self._next_msg_id(),
+                'timestamp': int(time.time() * 1000)
+            }
+
+            if interval is not None:
+                header['interval'] = interval
+
+            # Aliases only in live messages; stored ones must stay readable
+            # after the catalog changed (see _publish_or_store)
+            key_func = None
+            portable = None
+            if self.use_aliases and self.connected:
+                plain_header = header
+                portable = lambda: self.encoder.encode_readings(plain_header, metrics)
+                header = {**header, 'catalog': self.catalog.hash}
+                key_func = self._metric_key
+
+            # Readings go straight into the encoder (no intermediate dicts)
+            started = time.perf_counter()
+            payload = self.encoder.encode_readings(header, metrics, key_func)
+            self._encode_seconds.observe(time.perf_counter() - started)
+            self._payload_bytes.observe(len(payload))
+            outcome = self._publish_or_store(self.topic_sensors, payload, portable=portable)
+            if outcome == self.PUBLISH_SENT:
+                self.logger.debug(f"Published sensor data with {len(metrics)} metrics")
+            return outcome
+
+        except Exception as e:
+            self.logger.error(f"Failed to publish sensor data: {e}")
+            return self.PUBLISH_FAILED
+
+    def publish_burst(self, burst_id: str, metrics: List[Any], interval: float) -> bool:
+        """
+        Publish one sample of a burst (live diagnostics, never stored)
+
+        Always JSON regardless of mqtt.encoding, with full metric names.
+
+        Args:
+            burst_id: Burst identifier from the burst command's response
+            metrics: Readings of one burst sample
+            interval: Burst sampling interval in seconds
 
         Returns:
             True if publish successful
         """
+        if not self.connected:
+            return False
+
         try:
-            # Convert metrics list to dictionary format
-            sensor_data = {
+            message = sensors_message({
                 'node_id': self.node_id,
+                'burst': burst_id,
                 'timestamp': int(time.time() * 1000),
-                'sensors': {}
+                'interval': interval
+            }, metrics)
+            payload = json.dumps(message, ensure_ascii=False, separators=(',', ':'))
+            result = self.client.publish(self.topic_burst, payload, qos=0, retain=False)
+            return result.rc == mqtt.MQTT_ERR_SUCCESS
+        except Exception as e:
+            self.logger.error(f"Failed to publish burst sample: {e}")
+            return False
+
+    def publish_burst_end(self, burst_id: str, samples: Dict[str, int]) -> bool:
+        """
+        Publish the end marker of a burst
+
+        Args:
+            burst_id: Burst identifier
+            samples: Number of samples published per sensor
+
+        Returns:
+            True if publish successful
+        """
+        if not self.connected:
+            return False
+
+        payload = json.dumps({
+            'node_id': self.node_id,
+            'burst': burst_id,
+            'timestamp': int(time.time() * 1000),
+            'done': True,
+            'samples': samples
+        })
+        result = self.client.publish(self.topic_burst, payload, qos=1, retain=False)
+        return result.rc == mqtt.MQTT_ERR_SUCCESS
+
+    def flush_batch(self) -> Optional[str]:
+        """
+        Publish buffered read cycles as one columnar batch message
+
+        Returns:
+            PUBLISH_SENT, PUBLISH_STORED or PUBLISH_FAILED
+            (None if there was nothing to send)
+        """
+        if not self.batch:
+            return None
+
+        columns = self.batch.take()
+        if not columns:
+            return None
+
+        try:
+            batch_data = {
+                'node_id': self.node_id,
+                'msg_id': self._next_msg_id(),
+                'timestamp': int(time.time() * 1000),
+                'metrics': columns
             }
 
-            for metric in metrics:
-                sensor_name = metric.get('name', 'unknown')
-                sensor_data['sensors'][sensor_name] = {
-                    'value': metric.get('value'),
-                    'unit': metric.get('unit', ''),
-                    'timestamp': metric.get('timestamp', sensor_data['timestamp'])
-                }
+            portable = None
+            if self.use_aliases and self.connected:
+                plain_data = batch_data
+                portable = lambda: self.encoder.encode(plain_data)
+                batch_data = {**batch_data, 'catalog': self.catalog.hash, 'metrics': {}}
+                for name, column in columns.items():
+                    key = self._metric_key(name)
+                    if key != name:
+                        column = {'t': column['t'], 'v': column['v']}
+                    batch_data['metrics'][key] = column
+
+            started = time.perf_counter()
+            payload = self.encoder.encode(batch_data)
+            self._encode_seconds.observe(time.perf_counter() - started)
+            self._payload_bytes.observe(len(payload))
+            outcome = self._publish_or_store(self.topic_batch, payload, portable=portable)
+            if outcome == self.PUBLISH_SENT:
+                samples = sum(len(column['v']) for column in columns.values())
+                self.logger.debug(f"Published batch with {samples} samples ({len(payload)} bytes)")
+            return outcome
 
-            payload = json.dumps(sensor_data)
-            self.client.publish(self.topic_sensors, payload, qos=0, retain=False)
+        except Exception as e:
+            self.logger.error(f"Failed to publish sensor batch: {e}")
+            return self.PUBLISH_FAILED
 
-            self.logger.debug(f"Published sensor data with {len(metrics)} metrics")
-            return True
+    def _next_msg_id(self) -> str:
+        """Get the next idempotency key for a data message"""
+        with self._seq_lock:
+            self._seq += 1
+            return f"{self._session}-{self._seq}"
+
+    def _publish_or_store(self, topic: str, payload: Union[str, bytes], qos: int = 0,
+                          portable: Optional[Callable[[], bytes]] = None) -> str:
+        """
+        Publish a message, or append it to the outbox if it cannot be sent
+
+        Stored messages never use catalog aliases: they may be replayed after
+        the node re-announced a different catalog, or to a consumer that
+        restarted and only knows the latest birth.
+
+        Args:
+            topic: MQTT topic
+            payload: Message payload
+            qos: QoS level for the live publish
+            portable: Builds the same message with full metric names
+                      (for payloads that use aliases)
+
+        Returns:
+            PUBLISH_SENT, PUBLISH_STORED or PUBLISH_FAILED
+        """
+        if self.connected:
+            started = time.perf_counter()
+            result = self.client.publish(topic, payload, qos=qos, retain=False)
+            self._publish_seconds.observe(time.perf_counter() - started)
+            if result.rc == mqtt.MQTT_ERR_SUCCESS:
+                # Messages stored by an earlier failed publish on this same
+                # connection would otherwise wait for the next reconnect
+                if self.outbox and self.outbox.depth:
+                    self._start_drain()
+                return self.PUBLISH_SENT
+            self.logger.warning(f"Publish failed (code: {result.rc})")
+
+        if not self.outbox:
+            self._dropped.inc()
+            self.logger.warning("MQTT not connected, message dropped")
+            return self.PUBLISH_FAILED
+
+        if portable is not None:
+            payload = portable()
+        if isinstance(payload, str):
+            payload = payload.encode('utf-8')
+
+        if not self.outbox.append(topic, payload):
+            self._dropped.inc()
+            return self.PUBLISH_FAILED
+
+        self._stored.inc()
+
+        self.logger.debug(f"Message stored in outbox (depth: {self.outbox.depth})")
+        return self.PUBLISH_STORED
+
+    def _start_drain(self):
+        """Start replaying the outbox in the background if it has messages"""
+        if not self.outbox or self.outbox.depth == 0:
+            return
+
+        # Called from the network thread and from publishing workers
+        with self._drain_lock:
+            if self._drain_thread and self._drain_thread.is_alive():
+                return
+
+            self._drain_thread = threading.Thread(
+                target=self._drain_outbox,
+                name="mqtt-outbox-drain",
+                daemon=True
+            )
+            self._drain_thread.start()
+
+    def _drain_outbox(self):
+        """
+        Replay stored messages at QoS 1, rate limited to drain_rate
+
+        Records are acknowledged in the outbox only after the broker has
+        confirmed every message of a batch, so a disconnect mid-drain resends
+        the batch (the msg_id lets the server drop duplicates).
+        """
+        interval = 1.0 / self.drain_rate if self.drain_rate > 0 else 0.0
+        sent = 0
+        self.logger.info(f"Replaying {self.outbox.depth} messages from outbox")
+
+        try:
+            while self.connected and not self._closing.is_set():
+                records = self.outbox.peek(self.drain_batch)
+                if not records:
+                    break
+
+                pending = []
+                for record in records:
+                    info = self.client.publish(record.topic, record.payload, qos=1, retain=False)
+                    if info.rc != mqtt.MQTT_ERR_SUCCESS:
+                        self.logger.warning(f"Outbox replay interrupted (code: {info.rc})")
+                        return
+                    pending.append(info)
+
+                    if interval and self._closing.wait(interval):
+                        return
+
+                for info in pending:
+                    info.wait_for_publish(timeout=10)
+                    if not info.is_published():
+                        self.logger.warning("Outbox replay not acknowledged, will retry")
+                        return
+
+                self.outbox.ack(records)
+                sent += len(records)
+                for listener in self._replay_listeners:
+                    try:
+                        listener(len(records))
+                    except Exception as e:
+                        self.logger.error(f"Replay listener failed: {e}")
 
         except Exception as e:
-            self.logger.error(f"Failed to publish sensor data: {e}")
-            return False
+            self.logger.error(f"Outbox replay failed: {e}")
+
+        finally:
+            if sent:
+                self.logger.info(f"Replayed {sent} messages from outbox "
+                                 f"({self.outbox.depth} remaining)")
 
     def publish_death(self) -> bool:
         """
@@ -213,15 +740,74 @@ class MQTTClient:
         """
         Set callback for command messages
 
+        The callback runs on the MQTT network thread and must not block
+        (see utils.commands.CommandDispatcher.submit).
+
         Args:
             callback: Function to call when command received
                      Signature: callback(command: dict)
         """
         self.on_command_callback = callback
 
+    def publish_response(self, response: Dict[str, Any]) -> bool:
+        """
+        Publish a command response
+
+        Responses are not stored in the outbox; a response that cannot be
+        sent is dropped and the caller can repeat the command.
+
+        Args:
+            response: Response with the command's id and status
+
+        Returns:
+            True if publish successful
+        """
+        if not self.connected:
+            self.logger.warning(f"MQTT not connected, dropping response to {response.get('command')}")
+            return False
+
+        try:
+            payload = json.dumps({'node_id': self.node_id, **response}, ensure_ascii=False)
+            result = self.client.publish(self.topic_response, payload, qos=1, retain=False)
+            return result.rc == mqtt.MQTT_ERR_SUCCESS
+        except Exception as e:
+            self.logger.error(f"Failed to publish command response: {e}")
+            return False
+
+    def publish_telemetry(self, telemetry: Dict[str, Any]) -> bool:
+        """
+        Publish node health telemetry
+
+        Telemetry describes the present, so it is sent with QoS 0 and not
+        stored in the outbox while disconnected.
+
+        Args:
+            telemetry: Snapshot from NodeTelemetry.collect()
+
+        Returns:
+            True if publish successful
+        """
+        if not self.connected:
+            return False
+
+        try:
+            payload = json.dumps({
+                'node_id': self.node_id,
+                'timestamp': int(time.time() * 1000),
+                **telemetry
+            }, separators=(',', ':'))
+            result = self.client.publish(self.topic_telemetry, payload, qos=0, retain=False)
+            return result.rc == mqtt.MQTT_ERR_SUCCESS
+        except Exception as e:
+            self.logger.error(f"Failed to publish telemetry: {e}")
+            return False
+
     def _on_connect(self, client, userdata, flags, rc):
         """Callback when connected to broker"""
         if rc == 0:
+            if self._ever_connected:
+                self.reconnect_count += 1
+            self._ever_connected = True
             self.connected = True
             self.logger.info("Connected to MQTT broker")
 
@@ -232,6 +818,11 @@ class MQTTClient:
             # Publish online status
             self.publish_status('online')
 
+            # Replay anything recorded while offline
+            self._start_drain()
+
+            self._set_state(self.STATE_CONNECTED)
+
         else:
             self.connected = False
             error_messages = {
@@ -247,6 +838,7 @@ class MQTTClient:
     def _on_disconnect(self, client, userdata, rc):
         """Callback when disconnected from broker"""
         self.connected = False
+        self._set_state(self.STATE_DISCONNECTED)
         if rc != 0:
             self.logger.warning(f"Unexpected disconnect (code: {rc})")
         else:
@@ -0,0 +1,509 @@
+"""
+Payload encoders for SmartSense sensor messages
+
+The node announces the content type it uses (and, for the struct format, the
+metric layout) in its birth/status message. The decode side of every encoder
+is the reference implementation for consumers; it only needs this module
+(plus cbor2/msgpack for those formats).
+
+Supported formats:
+    json    - application/json (default, UTF-8, compact separators)
+    cbor    - application/cbor (requires cbor2)
+    msgpack - application/msgpack (requires msgpack)
+    struct  - application/vnd.smartsense.struct.v2 (fixed binary layout)
+"""
+
+import hashlib
+import json
+import logging
+import math
+import struct
+from typing import Callable, Dict, Any, List, Optional, Sequence, Union
+
+try:
+    import cbor2
+    CBOR_AVAILABLE = True
+except ImportError:
+    CBOR_AVAILABLE = False
+
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    MSGPACK_AVAILABLE = False
+
+logger = logging.getLogger("smartsense.encoding")
+
+# Maps a metric name to its key in data messages (name or catalog alias)
+KeyFunc = Optional[Callable[[str], Any]]
+
+
+def sensors_message(header: Dict[str, Any], readings: Sequence[Any],
+                    key_func: KeyFunc = None) -> Dict[str, Any]:
+    """
+    Build the documented sensors message dict from reading records
+
+    Args:
+        header: Message fields other than ``sensors`` (node_id, msg_id, ...)
+        readings: Reading records (spec, timestamp, value)
+        key_func: Metric key lookup (None = full metric names)
+
+    Returns:
+        Message dictionary
+    """
+    sensors = {}
+    for reading in readings:
+        name = reading.spec.name
+        key = key_func(name) if key_func else name
+        entry = {'value': reading.value, 'timestamp': reading.timestamp}
+        # Units of aliased metrics are in the catalog
+        if key == name:
+            entry['unit'] = reading.spec.unit
+        sensors[key] = entry
+
+    return {**header, 'sensors': sensors}
+
+
+class PayloadEncoder:
+    """
+    JSON encoder (base class)
+
+    Messages are plain dicts in the documented shapes (sensors message with a
+    ``sensors`` object, batch message with a ``metrics`` object).
+    """
+
+    name = 'json'
+    content_type = 'application/json'
+
+    def __init__(self):
+        # Per metric key: (JSON text before the value, text after the timestamp)
+        self._fragments: Dict[Any, tuple] = {}
+
+    def encode(self, message: Dict[str, Any]) -> bytes:
+        """
+        Encode a message
+
+        Args:
+            message: Message dictionary
+
+        Returns:
+            Encoded payload
+        """
+        # ensure_ascii=False keeps units like "μg/m³" as UTF-8 instead of \\u escapes
+        return json.dumps(message, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+    def decode(self, payload: bytes) -> Dict[str, Any]:
+        """
+        Decode a payload back into the message dictionary
+
+        Args:
+            payload: Encoded payload
+
+        Returns:
+            Message dictionary
+        """
+        return json.loads(payload.decode('utf-8'))
+
+    def encode_readings(self, header: Dict[str, Any], readings: Sequence[Any],
+                        key_func: KeyFunc = None) -> bytes:
+        """
+        Encode a sensors message straight from reading records
+
+        Produces the same bytes as encode(sensors_message(...)) without
+        building the intermediate dicts: the JSON around each value is
+        rendered once per metric key and reused.
+
+        Args:
+            header: Message fields other than ``sensors``
+            readings: Reading records (spec, timestamp, value)
+            key_func: Metric key lookup (None = full metric names)
+
+        Returns:
+            Encoded payload
+        """
+        head = json.dumps(header, ensure_ascii=False, separators=(',', ':'))[:-1]
+        parts = []
+        fragments = self._fragments
+
+        for reading in readings:
+            spec = reading.spec
+            key = key_func(spec.name) if key_func else spec.name
+            fragment = fragments.get(key)
+            if fragment is None:
+                fragment = self._fragment(key, spec.unit if key == spec.name else None)
+            parts.append(f"{fragment[0]}{_json_value(reading.value)}"
+                         f",\"timestamp\":{reading.timestamp}{fragment[1]}")
+
+        separator = ',' if header else ''
+        text = f"{head}{separator}\"sensors\":{{{','.join(parts)}}}}}"
+        return text.encode('utf-8')
+
+    def _fragment(self, key: Any, unit: Optional[str]) -> tuple:
+        """Render and cache the constant JSON around one metric's value"""
+        prefix = json.dumps(str(key), ensure_ascii=False) + ':{"value":'
+        if unit is None:
+            suffix = '}'
+        else:
+            suffix = ',"unit":' + json.dumps(unit, ensure_ascii=False) + '}'
+        fragment = (prefix, suffix)
+        self._fragments[key] = fragment
+        return fragment
+
+    def update_layout(self, metrics: List[Dict[str, Any]]) -> bool:
+        """
+        Register metrics that need a fixed position in the payload layout
+
+        Args:
+            metrics: Catalog entries (name, alias, unit, resolution)
+
+        Returns:
+            True if the layout changed and must be re-announced
+        """
+        return False
+
+    def describe(self) -> Dict[str, Any]:
+        """
+        Get the encoding announcement for the birth message
+
+        Returns:
+            Dict with content_type (and layout for positional formats)
+        """
+        return {'content_type': self.content_type}
+
+
+class CborEncoder(PayloadEncoder):
+    """CBOR encoder (RFC 8949)"""
+
+    name = 'cbor'
+    content_type = 'application/cbor'
+
+    def encode(self, message: Dict[str, Any]) -> bytes:
+        return cbor2.dumps(message)
+
+    def encode_readings(self, header: Dict[str, Any], readings: Sequence[Any],
+                        key_func: KeyFunc = None) -> bytes:
+        return self.encode(sensors_message(header, readings, key_func))
+
+    def decode(self, payload: bytes) -> Dict[str, Any]:
+        return cbor2.loads(payload)
+
+
+class MsgpackEncoder(PayloadEncoder):
+    """MessagePack encoder"""
+
+    name = 'msgpack'
+    content_type = 'application/msgpack'
+
+    def encode(self, message: Dict[str, Any]) -> bytes:
+        return msgpack.packb(message, use_bin_type=True)
+
+    def encode_readings(self, header: Dict[str, Any], readings: Sequence[Any],
+                        key_func: KeyFunc = None) -> bytes:
+        return self.encode(sensors_message(header, readings, key_func))
+
+    def decode(self, payload: bytes) -> Dict[str, Any]:
+        return msgpack.unpackb(payload, raw=False)
+
+
+class StructEncoder(PayloadEncoder):
+    """
+    Fixed-layout binary encoder
+
+    Every numeric metric is sent under its catalog alias, which never
+    changes while the node runs. The layout is announced in the birth
+    message as ``[[index, name, unit, resolution], ...]`` together with a
+    ``layout_id`` (hash of the layout) that every payload carries, so a
+    consumer can tell which layout a payload was encoded with (e.g. for
+    outbox replays after a re-birth) instead of misreading it. Values are
+    sent as signed 32-bit integers in units of the metric's resolution and
+    timestamps as signed 32-bit millisecond offsets from the header
+    timestamp. Non-numeric metrics (category labels) are not sent.
+
+    Layout (big-endian)::
+
+        header:  version u8 | kind u8 | layout_id u32 | timestamp u64 | msg_id_len u8 | msg_id
+        sensors: count u16 | count x (index u16 | dt i32 | value i32)
+        batch:   count u16 | count x (index u16 | n u16 | n x (dt i32 | value i32))
+    """
+
+    name = 'struct'
+    content_type = 'application/vnd.smartsense.struct.v2'
+
+    VERSION = 2
+    KIND_SENSORS = 0
+    KIND_BATCH = 1
+
+    HEADER = struct.Struct('>BBIQB')
+    COUNT = struct.Struct('>H')
+    SAMPLE = struct.Struct('>Hii')
+    COLUMN = struct.Struct('>HH')
+    POINT = struct.Struct('>ii')
+
+    def __init__(self, layout: Optional[List[List[Any]]] = None):
+        """
+        Initialize encoder
+
+        Args:
+            layout: Known layout as announced in a birth message
+                    (required for decoding)
+        """
+        super().__init__()
+        self._set_layout({index: (name, unit, resolution)
+                          for index, name, unit, resolution in layout or []})
+
+    def _set_layout(self, entries: Dict[int, tuple]):
+        self._entries = entries
+        self._index: Dict[str, int] = {name: index for index, (name, _u, _r) in entries.items()}
+        self.layout: List[List[Any]] = [[index, *entries[index]] for index in sorted(entries)]
+        canonical = json.dumps(self.layout, ensure_ascii=False, separators=(',', ':'))
+        self.layout_id = int(hashlib.sha1(canonical.encode('utf-8')).hexdigest()[:8], 16)
+
+    def update_layout(self, metrics: List[Dict[str, Any]]) -> bool:
+        """
+        Rebuild the layout from the metric catalog
+
+        Args:
+            metrics: Catalog entries (name, alias, unit, resolution)
+
+        Returns:
+            True if the layout changed and must be re-announced
+        """
+        # Non-numeric metrics have no resolution and are not sent
+        entries = {
+            metric['alias']: (metric['name'], metric.get('unit', ''), metric['resolution'])
+            for metric in metrics
+            if metric.get('resolution') is not None
+        }
+        if entries == self._entries:
+            return False
+
+        self._set_layout(entries)
+        return True
+
+    def describe(self) -> Dict[str, Any]:
+        return {
+            'content_type': self.content_type,
+            'layout_id': f"{self.layout_id:08x}",
+            'layout': self.layout
+        }
+
+    @classmethod
+    def payload_layout_id(cls, payload: bytes) -> str:
+        """
+        Get the layout id a payload was encoded with (to pick its layout)
+
+        Args:
+            payload: Raw struct payload
+
+        Returns:
+            Layout id as announced in ``encoding.layout_id``
+        """
+        version, _kind, layout_id, _ts, _id_len = cls.HEADER.unpack_from(payload)
+        if version != cls.VERSION:
+            raise ValueError(f"Unsupported struct payload version: {version}")
+        return f"{layout_id:08x}"
+
+    def _scaled(self, index: int, value: Any) -> int:
+        return int(round(value / self._entries[index][2]))
+
+    def encode(self, message: Dict[str, Any]) -> bytes:
+        base_ts = int(message.get('timestamp', 0))
+        msg_id = str(message.get('msg_id', '')).encode('ascii')[:255]
+
+        if 'metrics' in message:
+            kind = self.KIND_BATCH
+            body = self._encode_batch(message['metrics'], base_ts)
+        else:
+            kind = self.KIND_SENSORS
+            body = self._encode_sensors(message.get('sensors', {}), base_ts)
+
+        return self._pack(kind, base_ts, msg_id, body)
+
+    def encode_readings(self, header: Dict[str, Any], readings: Sequence[Any],
+                        key_func: KeyFunc = None) -> bytes:
+        # Positions come from the layout, so metric keys are not used
+        base_ts = int(header.get('timestamp', 0))
+        msg_id = str(header.get('msg_id', '')).encode('ascii')[:255]
+
+        parts = []
+        for reading in readings:
+            index = self._index.get(reading.spec.name)
+            value = reading.value
+            if index is None or isinstance(value, (str, bool)) or value is None:
+                continue
+            parts.append(self.SAMPLE.pack(index, int(reading.timestamp) - base_ts,
+                                          self._scaled(index, value)))
+
+        body = self.COUNT.pack(len(parts)) + b''.join(parts)
+        return self._pack(self.KIND_SENSORS, base_ts, msg_id, body)
+
+    def _pack(self, kind: int, base_ts: int, msg_id: bytes, body: bytes) -> bytes:
+        header = self.HEADER.pack(self.VERSION, kind, self.layout_id, base_ts, len(msg_id))
+        return header + msg_id + body
+
+    def _encode_sensors(self, sensors: Dict[str, Dict[str, Any]], base_ts: int) -> bytes:
+        parts = []
+        for name, data in sensors.items():
+            index = self._index.get(name)
+            value = data.get('value')
+            if index is None or isinstance(value, (str, bool)) or value is None:
+                continue
+            dt = int(data.get('timestamp', base_ts)) - base_ts
+            parts.append(self.SAMPLE.pack(index, dt, self._scaled(index, value)))
+
+        return self.COUNT.pack(len(parts)) + b''.join(parts)
+
+    def _encode_batch(self, columns: Dict[str, Dict[str, Any]], base_ts: int) -> bytes:
+        parts = []
+        count = 0
+        for name, column in columns.items():
+            index = self._index.get(name)
+            if index is None:
+                continue
+
+            points = [
+                self.POINT.pack(int(t) - base_ts, self._scaled(index, v))
+                for t, v in zip(column['t'], column['v'])
+                if not isinstance(v, (str, bool)) and v is not None
+            ]
+            if points:
+                parts.append(self.COLUMN.pack(index, len(points)))
+                parts.extend(points)
+                count += 1
+
+        return self.COUNT.pack(count) + b''.join(parts)
+
+    def _value(self, index: int, raw: int) -> float:
+        resolution = self._entries[index][2]
+        value = raw * resolution
+        if float(resolution).is_integer():
+            return int(value)
+        return round(value, _decimals(resolution))
+
+    def decode(self, payload: bytes) -> Dict[str, Any]:
+        version, kind, layout_id, base_ts, id_len = self.HEADER.unpack_from(payload)
+        if version != self.VERSION:
+            raise ValueError(f"Unsupported struct payload version: {version}")
+        if layout_id != self.layout_id:
+            raise ValueError(f"Struct payload uses layout {layout_id:08x}, "
+                             f"not the known layout {self.layout_id:08x}")
+
+        offset = self.HEADER.size
+        msg_id = payload[offset:offset + id_len].decode('ascii')
+        offset += id_len
+        (count,) = self.COUNT.unpack_from(payload, offset)
+        offset += self.COUNT.size
+
+        message = {'msg_id': msg_id, 'timestamp': base_ts}
+
+        if kind == self.KIND_SENSORS:
+            sensors = {}
+            for _ in range(count):
+                index, dt, raw = self.SAMPLE.unpack_from(payload, offset)
+                offset += self.SAMPLE.size
+                name, unit, _resolution = self._entries[index]
+                sensors[name] = {
+                    'value': self._value(index, raw),
+                    'unit': unit,
+                    'timestamp': base_ts + dt
+                }
+            message['sensors'] = sensors
+        else:
+            metrics = {}
+            for _ in range(count):
+                index, n = self.COLUMN.unpack_from(payload, offset)
+                offset += self.COLUMN.size
+                name, unit, _resolution = self._entries[index]
+                column = {'unit': unit, 't': [], 'v': []}
+                for _ in range(n):
+                    dt, raw = self.POINT.unpack_from(payload, offset)
+                    offset += self.POINT.size
+                    column['t'].append(base_ts + dt)
+                    column['v'].append(self._value(index, raw))
+                metrics[name] = column
+            message['metrics'] = metrics
+
+        return message
+
+
+def _json_value(value: Any) -> str:
+    """Render a value exactly as json.dumps would"""
+    value_type = type(value)
+    if value_type is int:
+        return int.__repr__(value)
+    if value_type is float and math.isfinite(value):
+        return float.__repr__(value)
+    return json.dumps(value, ensure_ascii=False)
+
+
+def _decimals(resolution: float) -> int:
+    """Number of decimal places needed to represent a resolution step"""
+    text = f"{resolution:.10f}".rstrip('0')
+    return len(text.split('.')[1]) if '.' in text else 0
+
+
+ENCODERS = {
+    'json': PayloadEncoder,
+    'cbor': CborEncoder,
+    'msgpack': MsgpackEncoder,
+    'struct': StructEncoder,
+}
+
+
+def create_encoder(name: str = 'json') -> PayloadEncoder:
+    """
+    Create an encoder by name, falling back to JSON if unavailable
+
+    Args:
+        name: Encoder name (json, cbor, msgpack, struct)
+
+    Returns:
+        Encoder instance
+    """
+    name = (name or 'json').lower()
+
+    if name not in ENCODERS:
+        logger.error(f"Unknown payload encoding '{name}', using json")
+        return PayloadEncoder()
+    if name == 'cbor' and not CBOR_AVAILABLE:
+        logger.error("cbor2 not available, using json. Install: pip install cbor2")
+        return PayloadEncoder()
+    if name == 'msgpack' and not MSGPACK_AVAILABLE:
+        logger.error("msgpack not available, using json. Install: pip install msgpack")
+        return PayloadEncoder()
+
+    return ENCODERS[name]()
+
+
+def decode_payload(content_type: str, payload: bytes,
+                   layout: Union[List[List[Any]], Dict[str, List[List[Any]]], None] = None
+                   ) -> Dict[str, Any]:
+    """
+    Reference decoder for consumers of SmartSense data messages
+
+    Args:
+        content_type: Content type announced in the node's birth message
+        payload: Raw MQTT payload
+        layout: Metric layout from the birth message (struct format only),
+                or the layouts seen so far by ``layout_id`` to decode
+                payloads encoded before a re-birth
+
+    Returns:
+        Message dictionary in the documented JSON shape
+
+    Raises:
+        ValueError: Unknown content type, or a struct payload whose layout
+                    is not known
+    """
+    for encoder_class in ENCODERS.values():
+        if encoder_class.content_type == content_type:
+            if encoder_class is StructEncoder:
+                if isinstance(layout, dict):
+                    layout_id = StructEncoder.payload_layout_id(payload)
+                    if layout_id not in layout:
+                        raise ValueError(f"Unknown struct layout: {layout_id}")
+                    layout = layout[layout_id]
+                return StructEncoder(layout).decode(payload)
+            return encoder_class().decode(payload)
+
+    raise ValueError(f"Unknown content type: {content_type}")
@@ -0,0 +1,321 @@
+"""
+Store-and-forward outbox for SmartSense Sensor Node
+
+Append-only segment log on disk that keeps MQTT messages which could not be
+delivered (broker unreachable, WiFi down) until they can be replayed.
+"""
+
+import json
+import logging
+import os
+import struct
+import threading
+import zlib
+from pathlib import Path
+from typing import List, NamedTuple, Optional, Tuple
+
+logger = logging.getLogger("smartsense.outbox")
+
+
+class OutboxRecord(NamedTuple):
+    """Message read back from the outbox"""
+    topic: str
+    payload: bytes
+    next_position: Tuple[int, int]
+
+
+class Outbox:
+    """
+    Size-bounded, crash-safe message log
+
+    Layout on disk::
+
+        {path}/00000001.log   segment files, records appended in order
+        {path}/cursor         (segment, offset) of the first unsent record
+
+    Each record is framed as ``length (u32) | crc32 (u32) | body`` where the
+    body is ``topic length (u16) | topic | payload``. On open, every segment
+    is scanned and truncated at the first torn or corrupt record, so a power
+    cut mid-write loses at most that record. The cursor is replaced
+    atomically (write temp file + rename). When the log exceeds ``max_bytes``
+    the oldest segments are dropped.
+    """
+
+    HEADER = struct.Struct('>II')
+    TOPIC_LEN = struct.Struct('>H')
+    SEGMENT_SUFFIX = '.log'
+    CURSOR_FILE = 'cursor'
+
+    def __init__(self, path: str, max_bytes: int = 50 * 1024 * 1024,
+                 segment_bytes: int = 1024 * 1024, fsync: bool = False):
+        """
+        Initialize outbox
+
+        Args:
+            path: Directory for segment files
+            max_bytes: Maximum total size of all segments
+            segment_bytes: Size at which a new segment is started
+            fsync: fsync every append (safer, but wears SD cards faster)
+        """
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.segment_bytes = segment_bytes
+        self.fsync = fsync
+
+        self._lock = threading.Lock()
+        self._segments: List[int] = []
+        self._sizes = {}
+        self._cursor: Tuple[int, int] = (0, 0)
+        self._pending = 0
+        self._writer = None
+        self.dropped = 0
+
+        self.path.mkdir(parents=True, exist_ok=True)
+        self._recover()
+
+    def _segment_path(self, segment: int) -> Path:
+        return self.path / f"{segment:08d}{self.SEGMENT_SUFFIX}"
+
+    def _recover(self):
+        """Load segments and cursor, truncating any torn tail"""
+        self._segments = sorted(
+            int(p.stem) for p in self.path.glob(f"*{self.SEGMENT_SUFFIX}")
+            if p.stem.isdigit()
+        )
+
+        cursor_file = self.path / self.CURSOR_FILE
+        try:
+            with open(cursor_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            self._cursor = (int(data['segment']), int(data['offset']))
+        except FileNotFoundError:
+            self._cursor = (self._segments[0], 0) if self._segments else (1, 0)
+        except Exception as e:
+            logger.warning(f"Invalid outbox cursor, replaying from start: {e}")
+            self._cursor = (self._segments[0], 0) if self._segments else (1, 0)
+
+        # Drop segments that were fully sent before the last shutdown
+        for segment in list(self._segments):
+            if segment < self._cursor[0]:
+                self._remove_segment(segment)
+
+        self._pending = 0
+        for segment in self._segments:
+            start = self._cursor[1] if segment == self._cursor[0] else 0
+            count, valid_end = self._scan(segment, start)
+            self._pending += count
+
+            size = self._segment_path(segment).stat().st_size
+            if valid_end < size:
+                logger.warning(f"Truncating corrupt outbox tail in segment {segment} "
+                               f"({size - valid_end} bytes)")
+                with open(self._segment_path(segment), 'r+b') as f:
+                    f.truncate(valid_end)
+                size = valid_end
+            self._sizes[segment] = size
+
+        if self._cursor[0] not in self._segments:
+            self._cursor = (self._segments[0], 0) if self._segments else (self._cursor[0], 0)
+
+        if self._pending:
+            logger.info(f"Outbox recovered with {self._pending} pending messages")
+
+    def _scan(self, segment: int, start: int) -> Tuple[int, int]:
+        """
+        Count valid records in a segment
+
+        Returns:
+            (record count from start, offset just past the last valid record)
+        """
+        count = 0
+        offset = 0
+        with open(self._segment_path(segment), 'rb') as f:
+            while True:
+                record = self._read_record(f)
+                if record is None:
+                    break
+                offset = f.tell()
+                if offset > start:
+                    count += 1
+        return count, offset
+
+    def _read_record(self, f) -> Optional[Tuple[str, bytes]]:
+        """Read one record at the current position (None at end or on corruption)"""
+        header = f.read(self.HEADER.size)
+        if len(header) < self.HEADER.size:
+            return None
+
+        length, crc = self.HEADER.unpack(header)
+        body = f.read(length)
+        if len(body) < length or zlib.crc32(body) != crc:
+            return None
+
+        (topic_len,) = self.TOPIC_LEN.unpack_from(body)
+        topic_end = self.TOPIC_LEN.size + topic_len
+        topic = body[self.TOPIC_LEN.size:topic_end].decode('utf-8')
+        return topic, body[topic_end:]
+
+    def _remove_segment(self, segment: int):
+        try:
+            self._segment_path(segment).unlink()
+        except FileNotFoundError:
+            pass
+        self._segments.remove(segment)
+        self._sizes.pop(segment, None)
+
+    def append(self, topic: str, payload: bytes) -> bool:
+        """
+        Append a message to the log
+
+        Args:
+            topic: MQTT topic
+            payload: Encoded message payload
+
+        Returns:
+            True if the message was stored
+        """
+        topic_bytes = topic.encode('utf-8')
+        body = self.TOPIC_LEN.pack(len(topic_bytes)) + topic_bytes + payload
+        record = self.HEADER.pack(len(body), zlib.crc32(body)) + body
+
+        try:
+            with self._lock:
+                writer = self._get_writer(len(record))
+                writer.write(record)
+                writer.flush()
+                if self.fsync:
+                    os.fsync(writer.fileno())
+
+                segment = self._segments[-1]
+                self._sizes[segment] += len(record)
+                self._pending += 1
+                self._enforce_limit()
+            return True
+
+        except Exception as e:
+            logger.error(f"Failed to append to outbox: {e}")
+            return False
+
+    def _get_writer(self, record_size: int):
+        """Get the active segment writer, rolling to a new segment if full (lock held)"""
+        if self._segments:
+            segment = self._segments[-1]
+            if self._sizes[segment] + record_size <= self.segment_bytes or self._sizes[segment] == 0:
+                if self._writer is None:
+                    self._writer = open(self._segment_path(segment), 'ab')
+                return self._writer
+
+        if self._writer is not None:
+            if self.fsync:
+                os.fsync(self._writer.fileno())
+            self._writer.close()
+
+        segment = self._segments[-1] + 1 if self._segments else self._cursor[0]
+        self._segments.append(segment)
+        self._sizes[segment] = 0
+        self._writer = open(self._segment_path(segment), 'ab')
+        return self._writer
+
+    def _enforce_limit(self):
+        """Drop the oldest segments while over the size limit (lock held)"""
+        while len(self._segments) > 1 and sum(self._sizes.values()) > self.max_bytes:
+            oldest = self._segments[0]
+            start = self._cursor[1] if oldest == self._cursor[0] else 0
+            if oldest >= self._cursor[0]:
+                lost, _ = self._scan(oldest, start)
+                self._pending -= lost
+                self.dropped += lost
+                logger.warning(f"Outbox full, dropped {lost} oldest messages")
+
+            self._remove_segment(oldest)
+            if self._cursor[0] <= oldest:
+                self._write_cursor((self._segments[0], 0))
+
+    def peek(self, max_records: int = 100) -> List[OutboxRecord]:
+        """
+        Read pending messages without removing them
+
+        Args:
+            max_records: Maximum number of records to return
+
+        Returns:
+            List of records, oldest first
+        """
+        records = []
+
+        with self._lock:
+            if self._writer is not None:
+                self._writer.flush()
+
+            segment, offset = self._cursor
+            for seg in self._segments:
+                if seg < segment:
+                    continue
+                start = offset if seg == segment else 0
+
+                with open(self._segment_path(seg), 'rb') as f:
+                    f.seek(start)
+                    while len(records) < max_records:
+                        record = self._read_record(f)
+                        if record is None:
+                            break
+                        records.append(OutboxRecord(record[0], record[1], (seg, f.tell())))
+
+                if len(records) >= max_records:
+                    break
+
+        return records
+
+    def ack(self, records: List[OutboxRecord]):
+        """
+        Mark records returned by peek() as delivered
+
+        Args:
+            records: Delivered records, oldest first
+        """
+        if not records:
+            return
+
+        position = records[-1].next_position
+
+        with self._lock:
+            if position <= self._cursor:
+                return
+
+            self._pending = max(0, self._pending - len(records))
+            self._write_cursor(position)
+
+            # Delete fully delivered segments (never the active one)
+            for seg in list(self._segments[:-1]):
+                if seg < position[0] or (seg == position[0] and position[1] >= self._sizes[seg]):
+                    self._remove_segment(seg)
+
+    def _write_cursor(self, position: Tuple[int, int]):
+        """Atomically persist the cursor (lock held)"""
+        self._cursor = position
+        tmp_file = self.path / f"{self.CURSOR_FILE}.tmp"
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump({'segment': position[0], 'offset': position[1]}, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_file, self.path / self.CURSOR_FILE)
+
+    @property
+    def depth(self) -> int:
+        """Number of messages waiting to be sent"""
+        return self._pending
+
+    @property
+    def size_bytes(self) -> int:
+        """Total size of all segments on disk"""
+        with self._lock:
+            return sum(self._sizes.values())
+
+    def close(self):
+        """Flush and close the active segment"""
+        with self._lock:
+            if self._writer is not None:
+                self._writer.flush()
+                os.fsync(self._writer.fileno())
+                self._writer.close()
+                self._writer = None
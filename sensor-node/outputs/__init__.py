@@ -2,7 +2,16 @@
 Output Devices Module
 """
 
+from .patterns import Pattern, PatternPlayer, PRIORITY_LOW, PRIORITY_NORMAL, PRIORITY_HIGH
 from .led_controller import LEDController
 from .buzzer import BuzzerController
 
-__all__ = ['LEDController', 'BuzzerController']
+__all__ = [
+    'LEDController',
+    'BuzzerController',
+    'Pattern',
+    'PatternPlayer',
+    'PRIORITY_LOW',
+    'PRIORITY_NORMAL',
+    'PRIORITY_HIGH'
+]
@@ -3,19 +3,32 @@ Buzzer Controller for audio alerts
 """
 
 import logging
-import time
 from typing import Optional
 
-try:
-    import RPi.GPIO as GPIO
-    GPIO_AVAILABLE = True
-except ImportError:
-    GPIO_AVAILABLE = False
+from .patterns import Pattern, PatternPlayer, PRIORITY_HIGH, PRIORITY_NORMAL
+
+# RPi.GPIO is imported only when an enabled controller is created
+GPIO = None
+
+
+def _load_gpio() -> bool:
+    """Import RPi.GPIO on first use"""
+    global GPIO
+    if GPIO is None:
+        try:
+            import RPi.GPIO
+        except ImportError:
+            return False
+        GPIO = RPi.GPIO
+    return True
 
 
 class BuzzerController:
     """
     Buzzer controller for audio alerts
+
+    Beeps and tones are played by a PatternPlayer thread; no method blocks
+    the caller. Step states are 0 (off), 1 (on) or a PWM frequency in Hz.
     """
 
     def __init__(self, gpio_pin: int = 27, enabled: bool = True):
@@ -30,8 +43,10 @@ class BuzzerController:
         self.gpio_pin = gpio_pin
         self.enabled = enabled
         self._initialized = False
+        self.player: Optional[PatternPlayer] = None
+        self._pwm = None
 
-        if not GPIO_AVAILABLE:
+        if self.enabled and not _load_gpio():
             self.logger.warning("RPi.GPIO not available. Buzzer control disabled.")
             self.enabled = False
 
@@ -54,6 +69,9 @@ class BuzzerController:
             GPIO.setup(self.gpio_pin, GPIO.OUT)
             GPIO.output(self.gpio_pin, GPIO.LOW)
 
+            self.player = PatternPlayer("buzzer", self._apply_state, 0)
+            self.player.start()
+
             self._initialized = True
             self.logger.info(f"Buzzer controller initialized on GPIO {self.gpio_pin}")
 
@@ -66,29 +84,46 @@ class BuzzerController:
             self.logger.error(f"Failed to initialize buzzer: {e}")
             return False
 
-    def beep(self, duration: float = 0.2, times: int = 1, interval: float = 0.1):
+    def _apply_state(self, state: int):
+        """Drive the buzzer (player thread): 0 off, 1 on, >1 tone frequency"""
+        if self._pwm is not None:
+            self._pwm.stop()
+            self._pwm = None
+
+        if state > 1:
+            self._pwm = GPIO.PWM(self.gpio_pin, state)
+            self._pwm.start(50)  # 50% duty cycle
+        else:
+            GPIO.output(self.gpio_pin, GPIO.HIGH if state else GPIO.LOW)
+
+    def play(self, pattern: Pattern) -> bool:
+        """
+        Queue a beep pattern (returns immediately)
+
+        Args:
+            pattern: Pattern of 0/1/frequency steps
+
+        Returns:
+            True if queued
+        """
+        player = self.player
+        if not player:
+            return False
+        return player.play(pattern)
+
+    def beep(self, duration: float = 0.2, times: int = 1, interval: float = 0.1,
+             priority: int = PRIORITY_NORMAL):
         """
-        Make beep sound
+        Make beep sound (returns immediately)
 
         Args:
             duration: Beep duration in seconds
             times: Number of beeps
             interval: Interval between beeps
+            priority: PRIORITY_LOW / NORMAL / HIGH (higher interrupts lower)
         """
-        if not self.enabled or not self._initialized:
-            return
-
-        try:
-            for _ in range(times):
-                GPIO.output(self.gpio_pin, GPIO.HIGH)
-                time.sleep(duration)
-                GPIO.output(self.gpio_pin, GPIO.LOW)
-
-                if _ < times - 1:  # Don't wait after last beep
-                    time.sleep(interval)
-
-        except Exception as e:
-            self.logger.error(f"Failed to beep: {e}")
+        self.play(Pattern.blink(1, 0, duration, interval, times=times,
+                                priority=priority, name='beep'))
 
     def alert_short(self):
         """Short alert (1 beep)"""
@@ -100,34 +135,33 @@ class BuzzerController:
 
     def alert_long(self):
         """Long alert (3 beeps)"""
-        self.beep(duration=0.5, times=3, interval=0.3)
+        self.beep(duration=0.5, times=3, interval=0.3, priority=PRIORITY_HIGH)
 
     def alert_critical(self):
         """Critical alert (rapid beeps)"""
-        self.beep(duration=0.1, times=5, interval=0.1)
+        self.beep(duration=0.1, times=5, interval=0.1, priority=PRIORITY_HIGH)
 
     def tone(self, frequency: int = 2000, duration: float = 0.5):
         """
-        Generate tone with PWM
+        Generate tone with PWM (returns immediately)
 
         Args:
             frequency: Frequency in Hz
             duration: Duration in seconds
         """
-        if not self.enabled or not self._initialized:
-            return
+        self.play(Pattern(((frequency, duration),), name='tone'))
 
-        try:
-            pwm = GPIO.PWM(self.gpio_pin, frequency)
-            pwm.start(50)  # 50% duty cycle
-            time.sleep(duration)
-            pwm.stop()
+    def close(self, drain_timeout: float = 0.0):
+        """
+        Clean up GPIO
 
-        except Exception as e:
-            self.logger.error(f"Failed to generate tone: {e}")
+        Args:
+            drain_timeout: Seconds to let queued beeps finish
+        """
+        if self.player:
+            self.player.stop(drain_timeout)
+            self.player = None
 
-    def close(self):
-        """Clean up GPIO"""
         if self._initialized:
             try:
                 GPIO.output(self.gpio_pin, GPIO.LOW)
@@ -3,18 +3,33 @@ RGB LED Controller for status indication
 """
 
 import logging
-from typing import Tuple
+from typing import Optional, Tuple
 
-try:
-    import RPi.GPIO as GPIO
-    GPIO_AVAILABLE = True
-except ImportError:
-    GPIO_AVAILABLE = False
+from .patterns import Pattern, PatternPlayer, PRIORITY_NORMAL
+
+# RPi.GPIO is imported only when an enabled controller is created
+GPIO = None
+
+
+def _load_gpio() -> bool:
+    """Import RPi.GPIO on first use"""
+    global GPIO
+    if GPIO is None:
+        try:
+            import RPi.GPIO
+        except ImportError:
+            return False
+        GPIO = RPi.GPIO
+    return True
 
 
 class LEDController:
     """
     RGB LED controller for visual status indication
+
+    Flashes and status changes are handed to a PatternPlayer thread, so no
+    method blocks the caller. status_*() set the state the LED returns to
+    after each flash.
     """
 
     # Color presets (R, G, B) - 0-100 scale
@@ -37,8 +52,9 @@ class LEDController:
         self.gpio_pin = gpio_pin
         self.enabled = enabled
         self._initialized = False
+        self.player: Optional[PatternPlayer] = None
 
-        if not GPIO_AVAILABLE:
+        if self.enabled and not _load_gpio():
             self.logger.warning("RPi.GPIO not available. LED control disabled.")
             self.enabled = False
 
@@ -64,6 +80,9 @@ class LEDController:
             self.pwm = GPIO.PWM(self.gpio_pin, 1000)  # 1kHz
             self.pwm.start(0)
 
+            self.player = PatternPlayer("led", self._apply_color, self.COLOR_OFF)
+            self.player.start()
+
             self._initialized = True
             self.logger.info(f"LED controller initialized on GPIO {self.gpio_pin}")
 
@@ -76,23 +95,34 @@ class LEDController:
             self.logger.error(f"Failed to initialize LED: {e}")
             return False
 
+    def _apply_color(self, color: Tuple[int, int, int]):
+        """Drive the LED (player thread)"""
+        r, g, b = color
+        # Calculate brightness (average of RGB)
+        brightness = (r + g + b) / 3
+        self.pwm.ChangeDutyCycle(brightness)
+
     def set_color(self, r: int, g: int, b: int):
         """
         Set LED color (simplified for single pin)
 
+        The color becomes the LED's status and is shown between flashes.
+
         Args:
             r, g, b: RGB values (0-100)
         """
-        if not self.enabled or not self._initialized:
-            return
+        self.set_status(Pattern.steady((r, g, b), name='color'))
 
-        try:
-            # Calculate brightness (average of RGB)
-            brightness = (r + g + b) / 3
-            self.pwm.ChangeDutyCycle(brightness)
+    def set_status(self, pattern: Pattern):
+        """
+        Set the status pattern (steady color or looping blink)
 
-        except Exception as e:
-            self.logger.error(f"Failed to set LED color: {e}")
+        Args:
+            pattern: Status pattern
+        """
+        player = self.player
+        if player:
+            player.set_status(pattern)
 
     def status_ok(self):
         """Set LED to green (normal operation)"""
@@ -110,39 +140,55 @@ class LEDController:
         """Set LED to blue (info)"""
         self.set_color(*self.COLOR_BLUE)
 
+    def status_blinking(self, color: Tuple[int, int, int], period: float = 1.0):
+        """
+        Blink continuously until the status changes (e.g. provisioning)
+
+        Args:
+            color: RGB color tuple
+            period: Blink period in seconds
+        """
+        self.set_status(Pattern(((color, period / 2), (self.COLOR_OFF, period / 2)),
+                                name='blinking'))
+
     def off(self):
         """Turn off LED"""
         self.set_color(*self.COLOR_OFF)
 
     def flash(self, color: Tuple[int, int, int] = COLOR_YELLOW,
-              duration: float = 0.2, times: int = 3):
+              duration: float = 0.2, times: int = 3, priority: int = PRIORITY_NORMAL):
         """
-        Flash LED
+        Flash LED (returns immediately)
+
+        Identical flashes requested while one is queued or playing are
+        coalesced.
 
         Args:
             color: RGB color tuple
             duration: Flash duration in seconds
             times: Number of flashes
+            priority: PRIORITY_LOW / NORMAL / HIGH (higher interrupts lower)
         """
-        if not self.enabled or not self._initialized:
+        player = self.player
+        if not player:
             return
 
-        try:
-            import time
-            for _ in range(times):
-                self.set_color(*color)
-                time.sleep(duration)
-                self.off()
-                time.sleep(duration)
+        steps = ((color, duration), (self.COLOR_OFF, duration))
+        player.play(Pattern(steps, repeat=times, priority=priority, name='flash'))
 
-        except Exception as e:
-            self.logger.error(f"Failed to flash LED: {e}")
+    def close(self, drain_timeout: float = 0.0):
+        """
+        Clean up GPIO
+
+        Args:
+            drain_timeout: Seconds to let queued flashes finish
+        """
+        if self.player:
+            self.player.stop(drain_timeout)
+            self.player = None
 
-    def close(self):
-        """Clean up GPIO"""
         if self._initialized:
             try:
-                self.off()
                 self.pwm.stop()
                 GPIO.cleanup(self.gpio_pin)
                 self._initialized = False
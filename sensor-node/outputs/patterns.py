@@ -0,0 +1,256 @@
+"""
+Asynchronous output patterns for the status LED and buzzer
+"""
+
+import heapq
+import itertools
+import logging
+import threading
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger("smartsense.outputs")
+
+# Pattern priorities (higher plays first and interrupts lower ones)
+PRIORITY_LOW = 0       # Activity indication (e.g. published data)
+PRIORITY_NORMAL = 1    # Information and warnings
+PRIORITY_HIGH = 2      # Errors and alerts
+
+
+class Pattern:
+    """
+    Declarative output pattern
+
+    A sequence of (state, duration) steps, e.g. for the LED
+    ``((COLOR_GREEN, 0.1), (COLOR_OFF, 0.1))``. A step with duration None
+    holds its state until something else is played (steady status).
+    Patterns compare equal by steps and repeat count, which is what the
+    player uses to coalesce duplicate requests.
+    """
+
+    __slots__ = ('steps', 'repeat', 'priority', 'name')
+
+    def __init__(self, steps: Sequence[Tuple[Any, Optional[float]]], repeat: int = 1,
+                 priority: int = PRIORITY_NORMAL, name: str = ''):
+        """
+        Initialize pattern
+
+        Args:
+            steps: (state, duration in seconds or None to hold) pairs
+            repeat: Number of times the steps are played
+            priority: PRIORITY_LOW, PRIORITY_NORMAL or PRIORITY_HIGH
+            name: Label for logs
+        """
+        self.steps = tuple((state, duration) for state, duration in steps)
+        self.repeat = max(1, int(repeat))
+        self.priority = priority
+        self.name = name
+
+    @classmethod
+    def blink(cls, state: Any, off: Any, on_time: float, off_time: float,
+              times: int = 1, priority: int = PRIORITY_NORMAL, name: str = 'blink') -> 'Pattern':
+        """On/off blinks; the trailing off period is dropped"""
+        steps: List[Tuple[Any, Optional[float]]] = []
+        for i in range(times):
+            steps.append((state, on_time))
+            if i < times - 1:
+                steps.append((off, off_time))
+        return cls(steps, priority=priority, name=name)
+
+    @classmethod
+    def steady(cls, state: Any, name: str = 'steady') -> 'Pattern':
+        """Hold one state (status pattern)"""
+        return cls(((state, None),), name=name)
+
+    def __eq__(self, other: Any) -> bool:
+        return (isinstance(other, Pattern) and self.steps == other.steps
+                and self.repeat == other.repeat)
+
+    def __hash__(self) -> int:
+        return hash((self.steps, self.repeat))
+
+    def __repr__(self) -> str:
+        return f"Pattern({self.name or self.steps!r})"
+
+
+class PatternPlayer:
+    """
+    Plays patterns on one output device from a dedicated thread
+
+    Callers only enqueue, so LED flashes and beeps never block the caller
+    (e.g. the sensor read/publish path). The player is a small state
+    machine:
+
+    - status: the pattern the device shows when nothing else plays
+      (steady color, or a looping blink such as "provisioning"). Changing
+      it never queues; only the latest status matters.
+    - queue: one-shot patterns, highest priority first. A request equal
+      to a queued or currently playing pattern is coalesced (dropped), a
+      higher-priority request interrupts a lower-priority pattern, and the
+      queue is bounded by dropping the lowest-priority entries.
+
+    After each one-shot pattern the device returns to the status pattern.
+    """
+
+    MAX_QUEUE = 8
+
+    def __init__(self, name: str, apply: Callable[[Any], None], idle_state: Any):
+        """
+        Initialize player
+
+        Args:
+            name: Device name (thread name and logs)
+            apply: Sets the device to a step state (called on the player thread)
+            idle_state: State applied when the player stops
+        """
+        self.name = name
+        self.apply = apply
+        self.idle_state = idle_state
+
+        self._cond = threading.Condition()
+        self._queue: List[Tuple[int, int, Pattern]] = []
+        self._seq = itertools.count()
+        self._status = Pattern.steady(idle_state, name='idle')
+        self._status_version = 0
+        self._current: Optional[Pattern] = None
+        self._stopping = False
+        self._thread: Optional[threading.Thread] = None
+
+        self.played = 0
+        self.coalesced = 0
+        self.dropped = 0
+        self.interrupted = 0
+
+    def start(self):
+        """Start the player thread"""
+        if self._thread and self._thread.is_alive():
+            return
+
+        self._stopping = False
+        self._thread = threading.Thread(
+            target=self._run,
+            name=f"{self.name}-player",
+            daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, drain_timeout: float = 0.0):
+        """
+        Stop the player and apply the idle state
+
+        Args:
+            drain_timeout: Seconds to let queued patterns finish first
+        """
+        with self._cond:
+            if drain_timeout > 0:
+                self._cond.wait_for(lambda: not self._queue and self._current is None,
+                                    timeout=drain_timeout)
+            self._stopping = True
+            self._queue.clear()
+            self._cond.notify_all()
+
+        if self._thread:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+
+    def play(self, pattern: Pattern) -> bool:
+        """
+        Queue a one-shot pattern (never blocks)
+
+        Args:
+            pattern: Pattern to play
+
+        Returns:
+            True if queued, False if coalesced or dropped
+        """
+        with self._cond:
+            if pattern == self._current or any(queued == pattern for _, _, queued in self._queue):
+                self.coalesced += 1
+                return False
+
+            if len(self._queue) >= self.MAX_QUEUE:
+                lowest = max(self._queue)  # heap keys are (-priority, seq)
+                if -lowest[0] >= pattern.priority:
+                    self.dropped += 1
+                    return False
+                self._queue.remove(lowest)
+                heapq.heapify(self._queue)
+                self.dropped += 1
+
+            heapq.heappush(self._queue, (-pattern.priority, next(self._seq), pattern))
+            self._cond.notify_all()
+        return True
+
+    def set_status(self, pattern: Pattern):
+        """
+        Set the pattern shown while idle (applied after the current one-shot)
+
+        Args:
+            pattern: Status pattern; a pattern with timed steps loops
+        """
+        with self._cond:
+            if pattern == self._status:
+                return
+            self._status = pattern
+            self._status_version += 1
+            self._cond.notify_all()
+
+    @property
+    def busy(self) -> bool:
+        """True while a one-shot pattern is playing or queued"""
+        with self._cond:
+            return self._current is not None or bool(self._queue)
+
+    def _run(self):
+        while True:
+            with self._cond:
+                if self._stopping:
+                    break
+                if self._queue:
+                    _, _, pattern = heapq.heappop(self._queue)
+                    self._current = pattern
+                    one_shot = True
+                else:
+                    pattern = self._status
+                    version = self._status_version
+                    one_shot = False
+
+            if one_shot:
+                self._play(pattern, lambda: self._preempted(pattern))
+                self.played += 1
+                with self._cond:
+                    self._current = None
+                    self._cond.notify_all()
+            else:
+                # Status: loop (or hold) until a one-shot arrives or it changes
+                self._play(pattern, lambda: bool(self._queue) or self._status_version != version,
+                           loop=True)
+
+        self._apply(self.idle_state)
+
+    def _preempted(self, pattern: Pattern) -> bool:
+        """Called with the lock held: stop for shutdown or a higher priority"""
+        if self._stopping:
+            return True
+        if self._queue and -self._queue[0][0] > pattern.priority:
+            self.interrupted += 1
+            return True
+        return False
+
+    def _play(self, pattern: Pattern, interrupted: Callable[[], bool], loop: bool = False):
+        """Apply the steps of a pattern, waiting on the condition between them"""
+        while True:
+            for _ in range(pattern.repeat):
+                for state, duration in pattern.steps:
+                    self._apply(state)
+                    with self._cond:
+                        if self._cond.wait_for(lambda: self._stopping or interrupted(),
+                                               timeout=duration):
+                            return
+            if not loop:
+                return
+
+    def _apply(self, state: Any):
+        try:
+            self.apply(state)
+        except Exception as e:
+            logger.error(f"{self.name}: failed to apply output state: {e}")
@@ -1,12 +1,24 @@
 """
 SmartSense Sensor Drivers Package
+
+Drivers are imported on first access so only enabled sensors load their
+hardware libraries.
 """
 
+import importlib
+from typing import Type
+
 from .base_sensor import BaseSensor
-from .bme680 import BME680Sensor
-from .scd40 import SCD40Sensor
-from .pms5003 import PMS5003Sensor
-from .bh1750 import BH1750Sensor
+
+# Config key -> (module, class name)
+SENSOR_DRIVERS = {
+    'bme680': ('.bme680', 'BME680Sensor'),
+    'scd40': ('.scd40', 'SCD40Sensor'),
+    'pms5003': ('.pms5003', 'PMS5003Sensor'),
+    'bh1750': ('.bh1750', 'BH1750Sensor')
+}
+
+_CLASS_MODULES = {class_name: module for module, class_name in SENSOR_DRIVERS.values()}
 
 __version__ = "1.0.0"
 __all__ = [
@@ -14,5 +26,36 @@ __all__ = [
     'BME680Sensor',
     'SCD40Sensor',
     'PMS5003Sensor',
-    'BH1750Sensor'
+    'BH1750Sensor',
+    'SENSOR_DRIVERS',
+    'load_driver'
 ]
+
+
+def load_driver(sensor_name: str) -> Type[BaseSensor]:
+    """
+    Import a sensor driver by its config key
+
+    Args:
+        sensor_name: Sensor key in config.yaml (e.g. 'bme680')
+
+    Returns:
+        Sensor class
+    """
+    module, class_name = SENSOR_DRIVERS[sensor_name]
+    return getattr(importlib.import_module(module, __name__), class_name)
+
+
+def __getattr__(name: str):
+    """Import driver classes lazily (PEP 562)"""
+    module = _CLASS_MODULES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_CLASS_MODULES))
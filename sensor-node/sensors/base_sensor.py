@@ -3,9 +3,14 @@ Base sensor class for SmartSense
 """
 
 from abc import ABC, abstractmethod
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Tuple
 import logging
 import random
+import threading
+import time
+
+from .reading import MetricSpec, Reading
+from utils.instrumentation import REGISTRY
 
 
 class BaseSensor(ABC):
@@ -13,6 +18,19 @@ class BaseSensor(ABC):
     Abstract base class for all sensors
     """
 
+    # Metric keys this sensor can report (used for the birth catalog)
+    METRICS = ()
+
+    # Native sampling period in seconds for continuous acquisition
+    NATIVE_INTERVAL = 1.0
+
+    # Seconds after initialize() until the first valid sample is expected
+    WARMUP_TIME = 0.0
+
+    # Continuous mode: a sample older than this many sample intervals is
+    # stale (acquisition thread stuck or the sensor stopped answering)
+    STALE_INTERVALS = 3
+
     def __init__(self, name: str, config: Dict[str, Any]):
         """
         Initialize sensor
@@ -26,6 +44,36 @@ class BaseSensor(ABC):
         self.logger = logging.getLogger(f"smartsense.sensor.{name}")
         self._initialized = False
         self.use_dummy = config.get('use_dummy', False)
+        self.read_interval = config.get('read_interval', 60)
+
+        # Continuous acquisition: sample at the native rate in a background
+        # thread and publish the latest value instead of reading on demand
+        self.continuous = config.get('acquisition', 'on_demand') == 'continuous'
+        self.sample_interval = config.get('sample_interval', self.NATIVE_INTERVAL)
+        self._latest: Optional[Tuple[int, Dict[str, Any]]] = None
+        self._last_returned: Optional[int] = None
+        self._stale = False
+        self._acquisition_thread: Optional[threading.Thread] = None
+        self._acquisition_stop = threading.Event()
+        self.samples = 0
+        self.sample_errors = 0
+
+        # Scheduled, on-demand and burst reads may overlap; the bus is not shared
+        self._read_lock = threading.Lock()
+        self._read_seconds = REGISTRY.histogram(
+            'sensor_read_seconds', 'Sensor read latency', sensor=name)
+        self._read_failures = REGISTRY.counter(
+            'sensor_read_failures_total', 'Failed sensor reads', sensor=name)
+
+        # Non-blocking warm-up: initialize() returns immediately and reads
+        # are skipped until the sensor reports its first sample is ready
+        self._warmup_until = 0.0
+        self._ready = False
+
+        # Names, units and resolutions are resolved once, not per reading
+        self._specs: Dict[str, MetricSpec] = {}
+        for key in self.METRICS:
+            self._spec(key)
 
     @abstractmethod
     def initialize(self) -> bool:
@@ -51,6 +99,19 @@ class BaseSensor(ABC):
         """
         pass
 
+    def peek(self) -> Dict[str, Any]:
+        """
+        Read sensor data without consuming driver state (on-demand reads)
+
+        Drivers whose read() has side effects, such as draining a frame
+        buffer or powering down until the next read, override this so that
+        an on-demand or burst read does not disturb the scheduled reads.
+
+        Returns:
+            Dictionary containing sensor readings
+        """
+        return self.read()
+
     @abstractmethod
     def read_dummy(self) -> Dict[str, Any]:
         """
@@ -68,33 +129,55 @@ class BaseSensor(ABC):
         """
         pass
 
-    def get_metrics(self, timestamp: int) -> List[Dict[str, Any]]:
+    def get_metrics(self, timestamp: int, peek: bool = False) -> List[Reading]:
         """
         Get sensor data in metrics format
 
+        In continuous acquisition mode this only snapshots the latest sample
+        and uses its capture time instead of the given timestamp. A sample
+        is returned once: when no new sample was captured since the previous
+        call (read interval shorter than the sample interval), or the latest
+        one is stale, the result is empty.
+
         Args:
             timestamp: Unix timestamp in milliseconds
+            peek: On-demand or burst read: use peek() instead of read(), and
+                  in continuous mode return the latest sample even if it was
+                  already returned (the scheduled reads are not affected)
 
         Returns:
-            List of metrics dictionaries
+            List of readings (name, timestamp, value, unit, resolution)
         """
+        if not self.is_ready():
+            self.logger.debug("Still warming up, no sample yet")
+            return []
+
         try:
-            # Use dummy data if configured
-            if self.use_dummy:
-                data = self.read_dummy()
+            if self._acquisition_thread is not None:
+                latest = self._latest
+                if latest is None:
+                    self.logger.warning("No sample captured yet")
+                    return []
+                timestamp, data = latest
+                if self._is_stale(timestamp):
+                    return []
+                if not peek:
+                    if timestamp == self._last_returned:
+                        self.logger.debug("No new sample since the previous read")
+                        return []
+                    self._last_returned = timestamp
             else:
-                data = self.read()
+                data = self._read_data(peek)
 
+            # One new Reading per sample: consumers may keep them (e.g. the
+            # HTTP endpoint's LatestReadings) and on-demand/burst reads run
+            # concurrently with the scheduled one, so records are never reused
+            specs = self._specs
             metrics = []
 
             for key, value in data.items():
-                metric = {
-                    'name': f"{self.name}/{key}",
-                    'timestamp': timestamp,
-                    'value': value,
-                    'unit': self._get_unit(key)
-                }
-                metrics.append(metric)
+                spec = specs.get(key) or self._spec(key)
+                metrics.append(Reading(spec, timestamp, spec.quantize(value)))
 
             return metrics
 
@@ -102,6 +185,200 @@ class BaseSensor(ABC):
             self.logger.error(f"Failed to get metrics: {e}")
             return []
 
+    def _is_stale(self, captured: int) -> bool:
+        """
+        Check the age of the latest continuous sample (warns once per outage)
+
+        Args:
+            captured: Capture timestamp in milliseconds
+
+        Returns:
+            True if the sample is older than STALE_INTERVALS sample intervals
+        """
+        age = time.time() - captured / 1000
+        if age > self.STALE_INTERVALS * self.sample_interval:
+            if not self._stale:
+                self._stale = True
+                self.logger.warning(f"Latest sample is {age:.0f} seconds old, "
+                                    f"not publishing it ({self.sample_errors} failed samples)")
+            return True
+
+        if self._stale:
+            self._stale = False
+            self.logger.info("Fresh samples again")
+        return False
+
+    def _spec(self, key: str) -> MetricSpec:
+        """Get (or build and cache) the spec of a metric key"""
+        spec = self._specs.get(key)
+        if spec is None:
+            spec = MetricSpec(self.name, key, self._get_unit(key), self._get_resolution(key))
+            self._specs[key] = spec
+        return spec
+
+    def _read_data(self, peek: bool = False) -> Dict[str, Any]:
+        """Read from hardware (peek() for on-demand reads), or dummy data if configured"""
+        with self._read_lock:
+            started = time.perf_counter()
+            try:
+                if self.use_dummy:
+                    data = self.read_dummy()
+                else:
+                    data = self.peek() if peek else self.read()
+            except Exception:
+                self._read_failures.inc()
+                raise
+            self._read_seconds.observe(time.perf_counter() - started)
+            return data
+
+    def start_acquisition(self) -> bool:
+        """
+        Start background sampling if continuous acquisition is configured
+
+        Returns:
+            True if the acquisition thread is running
+        """
+        if not self.continuous:
+            return False
+        if self._acquisition_thread is not None:
+            return True
+
+        self._acquisition_stop.clear()
+        self._acquisition_thread = threading.Thread(
+            target=self._acquisition_loop,
+            name=f"acquire-{self.name}",
+            daemon=True
+        )
+        self._acquisition_thread.start()
+        self.logger.info(f"Continuous acquisition every {self.sample_interval} seconds")
+        return True
+
+    def stop_acquisition(self):
+        """Stop background sampling"""
+        thread = self._acquisition_thread
+        if thread is None:
+            return
+
+        self._acquisition_stop.set()
+        thread.join(timeout=self.sample_interval + 5)
+        self._acquisition_thread = None
+
+    def _acquisition_loop(self):
+        """Sample at the native rate into the latest-value slot"""
+        next_sample = time.monotonic()
+
+        while not self._acquisition_stop.is_set():
+            try:
+                if not self.is_ready():
+                    raise RuntimeError("warming up")
+                data = self._read_data()
+                # Single reference assignment: readers never see a partial sample
+                self._latest = (int(time.time() * 1000), data)
+                self.samples += 1
+            except Exception as e:
+                # e.g. "data not ready"; the previous sample stays valid
+                self.sample_errors += 1
+                self.logger.debug(f"Sample failed: {e}")
+
+            next_sample += self.sample_interval
+            now = time.monotonic()
+            if next_sample < now:
+                next_sample = now
+            self._acquisition_stop.wait(next_sample - now)
+
+    def _begin_warmup(self):
+        """Start the warm-up period (call at the end of initialize())"""
+        self._ready = False
+        self._warmup_until = time.monotonic() + self.WARMUP_TIME
+
+    def _warmup_complete(self) -> bool:
+        """
+        Check whether the first valid sample is available
+        (override in subclass to poll the hardware)
+
+        Returns:
+            True once the sensor can be read
+        """
+        return time.monotonic() >= self._warmup_until
+
+    def is_ready(self) -> bool:
+        """
+        Check whether the sensor finished warming up (never blocks)
+
+        Returns:
+            True if the sensor is initialized and can be read
+        """
+        if self._ready:
+            return True
+        if not self._initialized:
+            return False
+
+        if self.use_dummy:
+            ready = True
+        else:
+            # _warmup_complete() may poll the bus; never interleave it with a
+            # read on another thread. A busy sensor just reports "not yet".
+            if not self._read_lock.acquire(blocking=False):
+                return False
+            try:
+                ready = self._warmup_complete()
+            finally:
+                self._read_lock.release()
+
+        if ready:
+            self._ready = True
+            self.logger.debug("Warm-up complete")
+        return self._ready
+
+    def warmup_remaining(self) -> float:
+        """
+        Estimate the time until the sensor is ready
+
+        Returns:
+            Seconds until the end of the warm-up period (0 if ready)
+        """
+        if self.is_ready():
+            return 0.0
+        return max(0.0, self._warmup_until - time.monotonic())
+
+    def set_read_interval(self, interval: float):
+        """
+        Update the read interval (adaptive sampling)
+
+        Args:
+            interval: New read interval in seconds
+        """
+        self.read_interval = interval
+
+    def begin_burst(self, duration: float):
+        """
+        Prepare for high-rate reads (burst command)
+
+        Drivers that power down between reads override this to stay awake.
+
+        Args:
+            duration: Burst length in seconds
+        """
+        pass
+
+    def snapshot(self) -> Optional[Tuple[int, Dict[str, Any]]]:
+        """
+        Get the latest captured sample
+
+        Returns:
+            (capture timestamp in ms, data) or None if nothing captured yet
+        """
+        return self._latest
+
+    def describe_metrics(self) -> List[Dict[str, Any]]:
+        """
+        Describe every metric this sensor can report
+
+        Returns:
+            List of dicts with name, unit and resolution
+        """
+        return [self._spec(key).describe() for key in self.METRICS]
+
     def _get_unit(self, metric_name: str) -> str:
         """
         Get unit for metric (override in subclass for specific units)
@@ -114,6 +391,19 @@ class BaseSensor(ABC):
         """
         return ''
 
+    def _get_resolution(self, metric_name: str) -> Optional[float]:
+        """
+        Get the real resolution (smallest meaningful step) of a metric
+        (override in subclass)
+
+        Args:
+            metric_name: Name of the metric
+
+        Returns:
+            Resolution in the metric's unit, or None for non-numeric metrics
+        """
+        return None
+
     @staticmethod
     def _random_value(base: float, variance: float) -> float:
         """
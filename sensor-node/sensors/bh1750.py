@@ -2,7 +2,7 @@
 BH1750 Sensor Driver - Light Intensity
 """
 
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 import time
 from .base_sensor import BaseSensor
 
@@ -19,6 +19,14 @@ class BH1750Sensor(BaseSensor):
     Measures: Illuminance (lux)
     """
 
+    METRICS = ('illuminance', 'light_level')
+
+    # High resolution mode measurement time is ~120 ms
+    NATIVE_INTERVAL = 0.5
+
+    # First high resolution measurement completes after up to 180 ms
+    WARMUP_TIME = 0.2
+
     # I2C Commands
     POWER_DOWN = 0x00
     POWER_ON = 0x01
@@ -54,7 +62,7 @@ class BH1750Sensor(BaseSensor):
 
             # Set continuous high resolution mode
             self.bus.write_byte(self.i2c_address, self.CONTINUOUS_HIGH_RES_MODE)
-            time.sleep(0.2)
+            self._begin_warmup()
 
             self._initialized = True
             self.logger.info(f"BH1750 initialized at address 0x{self.i2c_address:02X}")
@@ -136,6 +144,13 @@ class BH1750Sensor(BaseSensor):
         }
         return units.get(metric_name, '')
 
+    def _get_resolution(self, metric_name: str) -> Optional[float]:
+        """Get resolution for BH1750 metrics"""
+        resolutions = {
+            'illuminance': 1
+        }
+        return resolutions.get(metric_name)
+
     def close(self):
         """Clean up BH1750 sensor"""
         try:
@@ -2,7 +2,7 @@
 BME680 Sensor Driver - Temperature, Humidity, Pressure, VOC
 """
 
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 from .base_sensor import BaseSensor
 
 try:
@@ -19,6 +19,11 @@ class BME680Sensor(BaseSensor):
     Measures: Temperature, Humidity, Pressure, Gas Resistance (VOC)
     """
 
+    METRICS = ('temperature', 'humidity', 'pressure', 'gas_resistance', 'air_quality_score')
+
+    # Gas heater cycle limits the useful rate
+    NATIVE_INTERVAL = 3.0
+
     def __init__(self, config: Dict[str, Any]):
         super().__init__("BME680", config)
         self.sensor = None
@@ -146,6 +151,17 @@ class BME680Sensor(BaseSensor):
         }
         return units.get(metric_name, '')
 
+    def _get_resolution(self, metric_name: str) -> Optional[float]:
+        """Get resolution for BME680 metrics"""
+        resolutions = {
+            'temperature': 0.01,
+            'humidity': 0.01,
+            'pressure': 0.01,
+            'gas_resistance': 1,
+            'air_quality_score': 1
+        }
+        return resolutions.get(metric_name)
+
     def close(self):
         """Clean up BME680 sensor"""
         self.sensor = None
@@ -2,8 +2,10 @@
 PMS5003 Sensor Driver - Particulate Matter
 """
 
-from typing import Dict, Any
-import serial
+from collections import deque
+from typing import Dict, Any, Optional, List, Tuple
+import struct
+import threading
 import time
 from .base_sensor import BaseSensor
 
@@ -11,15 +13,81 @@ from .base_sensor import BaseSensor
 class PMS5003Sensor(BaseSensor):
     """
     PMS5003 particulate matter sensor
-    Measures: PM1.0, PM2.5, PM10 (μg/m³)
+    Measures: PM1.0, PM2.5, PM10 (μg/m³), particle counts
+
+    A reader thread bulk-reads the UART into a buffer and decodes every
+    complete frame, so read() never blocks on the serial port.
+
+    With ``sleep_between_reads`` the fan and laser are put to sleep after
+    each read and woken WAKE_LEAD seconds before the next one, which
+    extends their life when the read interval is long.
     """
 
+    METRICS = (
+        'pm1_0', 'pm2_5', 'pm10', 'pm2_5_aqi',
+        'pm1_0_cf1', 'pm2_5_cf1', 'pm10_cf1',
+        'particles_0_3um', 'particles_0_5um', 'particles_1_0um',
+        'particles_2_5um', 'particles_5_0um', 'particles_10um'
+    )
+
+    # Frame: "BM" | length (28) | 13 data words | checksum (big-endian)
+    FRAME_HEADER = b'BM'
+    FRAME_LENGTH = 32
+    FRAME_DATA_LENGTH = 28
+    FRAME = struct.Struct('>2sH13HH')
+    FRAME_FIELDS = (
+        'pm1_0_cf1', 'pm2_5_cf1', 'pm10_cf1',
+        'pm1_0_atm', 'pm2_5_atm', 'pm10_atm',
+        'particles_0_3um', 'particles_0_5um', 'particles_1_0um',
+        'particles_2_5um', 'particles_5_0um', 'particles_10um'
+    )
+
+    # Keep at most this many unconsumed bytes / decoded frames
+    MAX_BUFFER = 4096
+    MAX_FRAMES = 600
+
+    # A frame older than this is considered stale (sensor stopped streaming)
+    STALE_AFTER = 10.0
+
+    # Active mode streams a frame roughly every second
+    NATIVE_INTERVAL = 1.0
+
+    # The fan needs a moment to spin up before the first frame arrives
+    WARMUP_TIME = 2.5
+
+    # Sleep/wake commands (fan and laser off/on)
+    CMD_SLEEP = bytes((0x42, 0x4D, 0xE4, 0x00, 0x00, 0x01, 0x73))
+    CMD_WAKE = bytes((0x42, 0x4D, 0xE4, 0x00, 0x01, 0x01, 0x74))
+
+    # Wake this long before a read; frames of the first SETTLE_TIME seconds
+    # are dropped while the fan spins up, the rest are averaged
+    WAKE_LEAD = 30.0
+    SETTLE_TIME = 20.0
+
+    # Do not cycle the fan for sleeps shorter than this
+    MIN_SLEEP = 30.0
+
     def __init__(self, config: Dict[str, Any]):
         super().__init__("PMS5003", config)
         self.serial_port = config.get('uart_port', '/dev/ttyAMA0')
         self.baudrate = config.get('baudrate', 9600)
         self.ser = None
 
+        self._buffer = bytearray()
+        self._frames: deque = deque(maxlen=self.MAX_FRAMES)
+        self._frames_lock = threading.Lock()
+        self._last_frame: Optional[Tuple[float, Tuple[int, ...]]] = None
+        self._reader: Optional[threading.Thread] = None
+        self._reader_stop = threading.Event()
+        self.frames_received = 0
+        self.checksum_errors = 0
+
+        self.sleep_between_reads = config.get('sleep_between_reads', False)
+        self._wake_timer: Optional[threading.Timer] = None
+        self._settled_at = 0.0
+        self._awake_until = 0.0
+        self._sleep_lock = threading.Lock()
+
     def initialize(self) -> bool:
         """Initialize PMS5003 sensor"""
         # If using dummy data, skip hardware initialization
@@ -28,20 +96,39 @@ class PMS5003Sensor(BaseSensor):
             self.logger.info("PMS5003 initialized in DUMMY mode (no hardware required)")
             return True
 
+        # Imported here so dummy mode does not need pyserial
+        try:
+            import serial
+        except ImportError:
+            self.logger.error("pyserial library not available. Install: pip install pyserial")
+            return False
+
         try:
             # Open serial connection
             self.ser = serial.Serial(
                 self.serial_port,
                 baudrate=self.baudrate,
-                timeout=2.0
+                timeout=0.5
             )
 
-            # Wait for sensor to stabilize
-            time.sleep(1)
-
             # Clear buffer
             self.ser.reset_input_buffer()
 
+            # A previous run may have left the sensor asleep
+            if self.sleep_between_reads:
+                self.ser.write(self.CMD_WAKE)
+
+            # Frames are collected in the background; the first one arrives
+            # within about a second while the rest of the node starts up
+            self._reader_stop.clear()
+            self._reader = threading.Thread(
+                target=self._reader_loop,
+                name="pms5003-reader",
+                daemon=True
+            )
+            self._reader.start()
+            self._begin_warmup()
+
             self._initialized = True
             self.logger.info(f"PMS5003 initialized on {self.serial_port}")
             return True
@@ -54,89 +141,205 @@ class PMS5003Sensor(BaseSensor):
         """
         Read PMS5003 sensor data
 
+        Averages every frame received since the previous read (or returns
+        the latest frame again if none arrived yet). Never blocks.
+
         Returns:
-            Dictionary with PM1.0, PM2.5, PM10 values
+            Dictionary with PM1.0, PM2.5, PM10 (standard and CF=1) and
+            particle counts per 0.1 L (empty while the fan is still
+            settling after an early wake)
         """
         if not self._initialized or not self.ser:
             raise RuntimeError("PMS5003 sensor not initialized")
 
-        try:
-            # Read data frame
-            data = self._read_frame()
-
-            if data:
-                result = {
-                    'pm1_0': data['pm1_0_atm'],
-                    'pm2_5': data['pm2_5_atm'],
-                    'pm10': data['pm10_atm'],
-                    'pm2_5_aqi': self._calculate_aqi(data['pm2_5_atm'])
-                }
-                return result
-            else:
+        with self._frames_lock:
+            frames = list(self._frames)
+            self._frames.clear()
+            last_frame = self._last_frame
+
+        if not frames and time.monotonic() < self._settled_at:
+            # Woken for a shortened interval that came due before the fan
+            # settled; skip this read rather than report a failure
+            self.logger.debug("PMS5003 still settling after wake, skipping read")
+            return {}
+
+        if not frames:
+            if last_frame is None or time.monotonic() - last_frame[0] > self.STALE_AFTER:
                 raise RuntimeError("Failed to read valid data from PMS5003")
+            frames = [last_frame[1]]
 
-        except Exception as e:
-            self.logger.error(f"Failed to read PMS5003: {e}")
-            raise
+        result = self._summarize(frames)
+        self._sleep_until_next_read()
+        return result
 
-    def _read_frame(self) -> Dict[str, Any]:
+    def peek(self) -> Dict[str, Any]:
         """
-        Read and parse PMS5003 data frame
+        Get the latest frame for an on-demand or burst read
+
+        Unlike read(), the buffered frames stay for the next scheduled read
+        and the sensor is never put to sleep.
 
         Returns:
-            Parsed data dictionary or None if invalid
+            Same fields as read() (empty while the fan is settling)
         """
-        max_attempts = 5
-
-        for _ in range(max_attempts):
-            # Look for start bytes (0x42, 0x4d)
-            byte = self.ser.read(1)
-            if byte == b'\x42':
-                byte = self.ser.read(1)
-                if byte == b'\x4d':
-                    # Read remaining frame (30 bytes)
-                    frame = self.ser.read(30)
-
-                    if len(frame) == 30:
-                        # Parse frame
-                        data = self._parse_frame(frame)
-                        if data:
-                            return data
-
-        return None
-
-    def _parse_frame(self, frame: bytes) -> Dict[str, Any]:
+        if not self._initialized or not self.ser:
+            raise RuntimeError("PMS5003 sensor not initialized")
+
+        with self._frames_lock:
+            last_frame = self._last_frame
+
+        if last_frame is None or time.monotonic() - last_frame[0] > self.STALE_AFTER:
+            if time.monotonic() < self._settled_at:
+                return {}
+            if self._wake_timer:
+                raise RuntimeError("PMS5003 is asleep until shortly before the next read")
+            raise RuntimeError("Failed to read valid data from PMS5003")
+        return self._summarize([last_frame[1]])
+
+    def _summarize(self, frames: List[Tuple[int, ...]]) -> Dict[str, Any]:
         """
-        Parse PMS5003 data frame
+        Average decoded frames into the reported fields
 
         Args:
-            frame: 30-byte data frame
+            frames: Data words of one or more frames (FRAME_FIELDS order)
 
         Returns:
-            Parsed data dictionary or None if checksum fails
+            Dictionary with PM (standard and CF=1), AQI and particle counts
         """
-        # Calculate checksum
-        checksum = 0x42 + 0x4d
-        for byte in frame[:-2]:
-            checksum += byte
-
-        frame_checksum = (frame[-2] << 8) | frame[-1]
-
-        if checksum != frame_checksum:
-            self.logger.warning("PMS5003 checksum mismatch")
-            return None
-
-        # Extract values (big-endian)
+        count = len(frames)
         data = {
-            'pm1_0_cf1': (frame[2] << 8) | frame[3],
-            'pm2_5_cf1': (frame[4] << 8) | frame[5],
-            'pm10_cf1': (frame[6] << 8) | frame[7],
-            'pm1_0_atm': (frame[8] << 8) | frame[9],
-            'pm2_5_atm': (frame[10] << 8) | frame[11],
-            'pm10_atm': (frame[12] << 8) | frame[13],
+            field: sum(frame[i] for frame in frames) / count
+            for i, field in enumerate(self.FRAME_FIELDS)
         }
 
-        return data
+        result = {
+            'pm1_0': data['pm1_0_atm'],
+            'pm2_5': data['pm2_5_atm'],
+            'pm10': data['pm10_atm'],
+            'pm2_5_aqi': self._calculate_aqi(data['pm2_5_atm']),
+            'pm1_0_cf1': data['pm1_0_cf1'],
+            'pm2_5_cf1': data['pm2_5_cf1'],
+            'pm10_cf1': data['pm10_cf1'],
+        }
+        for field in self.FRAME_FIELDS[6:]:
+            result[field] = data[field]
+        return result
+
+    def _sleep_until_next_read(self):
+        """Power down the fan and laser until shortly before the next read"""
+        if not self.sleep_between_reads:
+            return
+
+        duration = self.read_interval - self.WAKE_LEAD
+        if duration < self.MIN_SLEEP or time.monotonic() < self._awake_until:
+            return
+
+        with self._sleep_lock:
+            if self._wake_timer:
+                return
+            try:
+                self.ser.write(self.CMD_SLEEP)
+            except Exception as e:
+                self.logger.error(f"Failed to put PMS5003 to sleep: {e}")
+                return
+            self._wake_timer = threading.Timer(duration, self._wake)
+            self._wake_timer.daemon = True
+            self._wake_timer.start()
+        self.logger.debug(f"PMS5003 sleeping for {duration:.0f} seconds")
+
+    def _wake(self):
+        """Wake the fan and laser; frames are used once they are stable"""
+        with self._sleep_lock:
+            if self._wake_timer:
+                self._wake_timer.cancel()
+                self._wake_timer = None
+            self._settled_at = time.monotonic() + self.SETTLE_TIME
+            try:
+                self.ser.write(self.CMD_WAKE)
+            except Exception as e:
+                self.logger.error(f"Failed to wake PMS5003: {e}")
+
+    def begin_burst(self, duration: float):
+        """Stay awake for the burst (wakes now if sleeping)"""
+        self._awake_until = time.monotonic() + duration
+        if self._wake_timer:
+            self._wake()
+
+    def set_read_interval(self, interval: float):
+        """Update the read interval, waking early if the next read moved closer"""
+        previous = self.read_interval
+        super().set_read_interval(interval)
+        if interval < previous and self._wake_timer:
+            self._wake()
+
+    def _reader_loop(self):
+        """Bulk-read the UART and decode frames until stopped"""
+        while not self._reader_stop.is_set():
+            try:
+                chunk = self.ser.read(max(self.ser.in_waiting, self.FRAME_LENGTH))
+            except Exception as e:
+                if self._reader_stop.is_set():
+                    break
+                self.logger.error(f"PMS5003 serial read failed: {e}")
+                self._reader_stop.wait(1.0)
+                continue
+
+            if chunk:
+                self._buffer += chunk
+                for frame in self._parse_buffer():
+                    self._store_frame(frame)
+
+    def _parse_buffer(self) -> List[Tuple[int, ...]]:
+        """
+        Extract every complete, valid frame from the receive buffer
+
+        Returns:
+            List of decoded data words (FRAME_FIELDS order)
+        """
+        buf = self._buffer
+        frames = []
+        pos = 0
+
+        with memoryview(buf) as view:
+            while True:
+                start = buf.find(self.FRAME_HEADER, pos)
+                if start < 0:
+                    # Keep a trailing "B" that may start the next header
+                    pos = len(buf) - 1 if buf.endswith(self.FRAME_HEADER[:1]) else len(buf)
+                    break
+                if len(buf) - start < self.FRAME_LENGTH:
+                    pos = start
+                    break
+
+                _header, length, *words, checksum = self.FRAME.unpack_from(buf, start)
+                if length == self.FRAME_DATA_LENGTH and sum(view[start:start + 30]) == checksum:
+                    frames.append(tuple(words[:12]))
+                    pos = start + self.FRAME_LENGTH
+                else:
+                    # False header inside data or corrupted frame: resync
+                    self.checksum_errors += 1
+                    pos = start + 1
+
+        del buf[:pos]
+        if len(buf) > self.MAX_BUFFER:
+            del buf[:-self.FRAME_LENGTH]
+
+        return frames
+
+    def _store_frame(self, frame: Tuple[int, ...]):
+        """Keep a decoded frame for the next read"""
+        # Frames right after waking are not stable yet
+        if self._settled_at and time.monotonic() < self._settled_at:
+            return
+
+        with self._frames_lock:
+            self._frames.append(frame)
+            self._last_frame = (time.monotonic(), frame)
+        self.frames_received += 1
+
+    def _warmup_complete(self) -> bool:
+        """Ready as soon as the first valid frame was decoded"""
+        return self._last_frame is not None
 
     def _calculate_aqi(self, pm2_5: float) -> int:
         """
@@ -152,6 +355,10 @@ class PMS5003Sensor(BaseSensor):
         if pm2_5 < 0:
             return 0
 
+        # Breakpoints are given at 0.1 μg/m³ precision; averaged values
+        # would otherwise fall into the gaps between ranges (e.g. 12.05)
+        pm2_5 = round(pm2_5, 1)
+
         # AQI breakpoints for PM2.5
         breakpoints = [
             (0.0, 12.0, 0, 50),
@@ -178,11 +385,22 @@ class PMS5003Sensor(BaseSensor):
             Dictionary with simulated sensor values
         """
         pm2_5_value = self._random_value(15.0, 8.0)  # 7-23 μg/m³
+        pm1_0_value = self._random_value(10.0, 5.0)  # 5-15 μg/m³
+        pm10_value = self._random_value(25.0, 10.0)  # 15-35 μg/m³
         return {
-            'pm1_0': int(self._random_value(10.0, 5.0)),   # 5-15 μg/m³
+            'pm1_0': int(pm1_0_value),
             'pm2_5': int(pm2_5_value),
-            'pm10': int(self._random_value(25.0, 10.0)),   # 15-35 μg/m³
-            'pm2_5_aqi': self._calculate_aqi(pm2_5_value)
+            'pm10': int(pm10_value),
+            'pm2_5_aqi': self._calculate_aqi(pm2_5_value),
+            'pm1_0_cf1': int(pm1_0_value * 1.1),
+            'pm2_5_cf1': int(pm2_5_value * 1.1),
+            'pm10_cf1': int(pm10_value * 1.1),
+            'particles_0_3um': int(pm2_5_value * 150),
+            'particles_0_5um': int(pm2_5_value * 45),
+            'particles_1_0um': int(pm2_5_value * 8),
+            'particles_2_5um': int(pm10_value * 0.8),
+            'particles_5_0um': int(pm10_value * 0.2),
+            'particles_10um': int(pm10_value * 0.05)
         }
 
     def _get_unit(self, metric_name: str) -> str:
@@ -191,12 +409,44 @@ class PMS5003Sensor(BaseSensor):
             'pm1_0': 'μg/m³',
             'pm2_5': 'μg/m³',
             'pm10': 'μg/m³',
-            'pm2_5_aqi': 'AQI'
+            'pm2_5_aqi': 'AQI',
+            'pm1_0_cf1': 'μg/m³',
+            'pm2_5_cf1': 'μg/m³',
+            'pm10_cf1': 'μg/m³',
+            'particles_0_3um': 'count/0.1L',
+            'particles_0_5um': 'count/0.1L',
+            'particles_1_0um': 'count/0.1L',
+            'particles_2_5um': 'count/0.1L',
+            'particles_5_0um': 'count/0.1L',
+            'particles_10um': 'count/0.1L'
         }
         return units.get(metric_name, '')
 
+    def _get_resolution(self, metric_name: str) -> Optional[float]:
+        """Get resolution for PMS5003 metrics"""
+        resolutions = {
+            'pm1_0': 1,
+            'pm2_5': 1,
+            'pm10': 1,
+            'pm2_5_aqi': 1
+        }
+        if metric_name in resolutions:
+            return resolutions[metric_name]
+        # CF=1 values and particle counts are integer registers
+        return 1 if metric_name in self.METRICS else None
+
     def close(self):
         """Clean up PMS5003 sensor"""
+        with self._sleep_lock:
+            if self._wake_timer:
+                self._wake_timer.cancel()
+                self._wake_timer = None
+
+        self._reader_stop.set()
+        if self._reader:
+            self._reader.join(timeout=2.0)
+            self._reader = None
+
         if self.ser and self.ser.is_open:
             self.ser.close()
 
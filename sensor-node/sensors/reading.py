@@ -0,0 +1,134 @@
+"""
+Compact metric records for the read/publish hot path
+"""
+
+import sys
+from typing import Any, Dict, Optional
+
+
+class MetricSpec:
+    """
+    Static description of one metric, built once per sensor
+
+    The full "SENSOR/key" name and the unit are interned so every reading
+    shares the same string objects and dict lookups by name hit the
+    identity fast path.
+    """
+
+    __slots__ = ('key', 'name', 'unit', 'resolution', '_decimals', '_integral')
+
+    def __init__(self, sensor_name: str, key: str, unit: str,
+                 resolution: Optional[float]):
+        self.key = sys.intern(key)
+        self.name = sys.intern(f"{sensor_name}/{key}")
+        self.unit = sys.intern(unit)
+        self.resolution = resolution
+
+        if resolution is None:
+            self._integral = False
+            self._decimals = 0
+        else:
+            self._integral = float(resolution).is_integer()
+            text = f"{resolution:.10f}".rstrip('0')
+            self._decimals = len(text.split('.')[1]) if '.' in text else 0
+
+    def quantize(self, value: Any) -> Any:
+        """
+        Round a value to a multiple of the metric's resolution
+
+        Args:
+            value: Raw value
+
+        Returns:
+            Quantized value (int for integer resolutions)
+        """
+        resolution = self.resolution
+        if resolution is None or value is None or isinstance(value, (str, bool)):
+            return value
+
+        steps = round(value / resolution)
+        if self._integral:
+            return int(steps * resolution)
+        return round(steps * resolution, self._decimals)
+
+    def derive(self, suffix: str, unit: Optional[str] = None,
+               resolution: Any = ...) -> 'MetricSpec':
+        """
+        Build the spec of a derived metric (e.g. "BME680/temperature/max")
+
+        Args:
+            suffix: Appended to the key after a slash
+            unit: Unit (default: same as this metric)
+            resolution: Resolution (default: same as this metric)
+
+        Returns:
+            New metric spec
+        """
+        sensor_name = self.name[:-len(self.key) - 1]
+        return MetricSpec(
+            sensor_name,
+            f"{self.key}/{suffix}",
+            self.unit if unit is None else unit,
+            self.resolution if resolution is ... else resolution
+        )
+
+    def describe(self) -> Dict[str, Any]:
+        """Get the description used in the birth catalog"""
+        return {'name': self.name, 'unit': self.unit, 'resolution': self.resolution}
+
+    def __repr__(self) -> str:
+        return f"MetricSpec({self.name!r})"
+
+
+class Reading:
+    """
+    One metric sample
+
+    Slot-based record referencing its shared MetricSpec, so a sample costs
+    one small object instead of a dict plus a freshly formatted name. Item
+    access (``reading['name']``, ``reading.get('unit')``) is kept for code
+    that handles readings and plain metric dicts alike.
+    """
+
+    __slots__ = ('spec', 'timestamp', 'value')
+
+    def __init__(self, spec: MetricSpec, timestamp: int, value: Any):
+        self.spec = spec
+        self.timestamp = timestamp
+        self.value = value
+
+    @property
+    def name(self) -> str:
+        return self.spec.name
+
+    @property
+    def unit(self) -> str:
+        return self.spec.unit
+
+    @property
+    def resolution(self) -> Optional[float]:
+        return self.spec.resolution
+
+    def __getitem__(self, key: str) -> Any:
+        if key in ('name', 'unit', 'resolution', 'timestamp', 'value'):
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Get the reading in the metrics dictionary format"""
+        return {
+            'name': self.spec.name,
+            'timestamp': self.timestamp,
+            'value': self.value,
+            'unit': self.spec.unit,
+            'resolution': self.spec.resolution
+        }
+
+    def __repr__(self) -> str:
+        return f"Reading({self.spec.name!r}, {self.timestamp}, {self.value!r})"
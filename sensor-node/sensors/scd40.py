@@ -2,8 +2,7 @@
 SCD40 Sensor Driver - CO2, Temperature, Humidity
 """
 
-from typing import Dict, Any
-import time
+from typing import Dict, Any, Optional
 from .base_sensor import BaseSensor
 
 try:
@@ -20,6 +19,14 @@ class SCD40Sensor(BaseSensor):
     Measures: CO2 (ppm), Temperature, Humidity
     """
 
+    METRICS = ('co2', 'temperature', 'humidity', 'co2_level')
+
+    # Periodic measurement mode produces a sample every 5 seconds
+    NATIVE_INTERVAL = 5.0
+
+    # First measurement is available about 5 seconds after starting
+    WARMUP_TIME = 5.0
+
     def __init__(self, config: Dict[str, Any]):
         super().__init__("SCD40", config)
         self.sensor = None
@@ -41,11 +48,9 @@ class SCD40Sensor(BaseSensor):
             i2c = board.I2C()
             self.sensor = adafruit_scd4x.SCD4X(i2c)
 
-            # Start periodic measurement
+            # Start periodic measurement (first sample is polled in is_ready)
             self.sensor.start_periodic_measurement()
-
-            # Wait for first measurement
-            time.sleep(5)
+            self._begin_warmup()
 
             self._initialized = True
             self.logger.info("SCD40 initialized")
@@ -82,6 +87,17 @@ class SCD40Sensor(BaseSensor):
             self.logger.error(f"Failed to read SCD40: {e}")
             raise
 
+    def _warmup_complete(self) -> bool:
+        """
+        Poll the data-ready flag until the first measurement is available
+        (called by is_ready() with the read lock held, like read())
+        """
+        try:
+            return bool(self.sensor and self.sensor.data_ready)
+        except Exception as e:
+            self.logger.debug(f"Data-ready check failed: {e}")
+            return False
+
     def _get_co2_level(self, co2_ppm: int) -> str:
         """
         Determine CO2 level category
@@ -128,6 +144,15 @@ class SCD40Sensor(BaseSensor):
         }
         return units.get(metric_name, '')
 
+    def _get_resolution(self, metric_name: str) -> Optional[float]:
+        """Get resolution for SCD40 metrics"""
+        resolutions = {
+            'co2': 1,
+            'temperature': 0.01,
+            'humidity': 0.01
+        }
+        return resolutions.get(metric_name)
+
     def close(self):
         """Clean up SCD40 sensor"""
         try:
@@ -0,0 +1,31 @@
+"""
+On-node Time-Series Storage Module
+
+The SQLite store is imported on first access; nodes without
+local_store.enabled never load sqlite3.
+"""
+
+import importlib
+
+from .ring_buffer import TimeSeriesBuffer
+
+# Attribute -> submodule, imported lazily (PEP 562)
+_LAZY_IMPORTS = {
+    'HistoryStore': '.sqlite_store'
+}
+
+__all__ = ['TimeSeriesBuffer', 'HistoryStore']
+
+
+def __getattr__(name: str):
+    module = _LAZY_IMPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_LAZY_IMPORTS))
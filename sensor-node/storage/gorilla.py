@@ -0,0 +1,240 @@
+"""
+Gorilla time-series compression
+
+Timestamps are stored as delta-of-deltas and values as the XOR with the
+previous value (Pelkonen et al., "Gorilla: A Fast, Scalable, In-Memory
+Time Series Database", VLDB 2015). Regularly sampled sensor data needs a
+few bits per timestamp and typically 10-40 bits per value instead of 128
+bits per (timestamp, value) pair.
+"""
+
+import struct
+from typing import Iterator, List, Tuple
+
+_DOUBLE = struct.Struct('>d')
+_UINT64 = struct.Struct('>Q')
+
+# Delta-of-delta buckets: (prefix value, prefix bits, payload bits)
+# Timestamps are in milliseconds; the last bucket holds any 64-bit value.
+_DOD_BUCKETS = (
+    (0b10, 2, 7),
+    (0b110, 3, 9),
+    (0b1110, 4, 12),
+)
+_DOD_FALLBACK = (0b1111, 4, 64)
+
+
+def _float_bits(value: float) -> int:
+    return _UINT64.unpack(_DOUBLE.pack(value))[0]
+
+
+def _bits_float(bits: int) -> float:
+    return _DOUBLE.unpack(_UINT64.pack(bits))[0]
+
+
+class BitWriter:
+    """Append-only bit string backed by a Python int"""
+
+    __slots__ = ('value', 'length')
+
+    def __init__(self):
+        self.value = 0
+        self.length = 0
+
+    def write(self, bits: int, count: int):
+        """Append the lowest ``count`` bits of ``bits`` (MSB first)"""
+        self.value = (self.value << count) | (bits & ((1 << count) - 1))
+        self.length += count
+
+    def to_bytes(self) -> bytes:
+        """Get the bit string left-aligned and padded to whole bytes"""
+        padding = -self.length % 8
+        return (self.value << padding).to_bytes((self.length + padding) // 8, 'big')
+
+
+class BitReader:
+    """Sequential reader over a bit string"""
+
+    __slots__ = ('value', 'length', 'position')
+
+    def __init__(self, value: int, length: int):
+        self.value = value
+        self.length = length
+        self.position = 0
+
+    @classmethod
+    def from_bytes(cls, data: bytes, length: int) -> 'BitReader':
+        padding = len(data) * 8 - length
+        return cls(int.from_bytes(data, 'big') >> padding, length)
+
+    def read(self, count: int) -> int:
+        self.position += count
+        return (self.value >> (self.length - self.position)) & ((1 << count) - 1)
+
+    def read_bit(self) -> int:
+        self.position += 1
+        return (self.value >> (self.length - self.position)) & 1
+
+
+class GorillaEncoder:
+    """
+    Streaming encoder for one block of (timestamp, value) points
+
+    The first point is stored verbatim (64-bit timestamp and value), every
+    following point as a delta-of-delta timestamp and an XOR-compressed
+    value.
+    """
+
+    __slots__ = ('bits', 'count', 'first_ts', 'last_ts', '_delta',
+                 '_value_bits', '_leading', '_trailing')
+
+    def __init__(self):
+        self.bits = BitWriter()
+        self.count = 0
+        self.first_ts = 0
+        self.last_ts = 0
+        self._delta = 0
+        self._value_bits = 0
+        self._leading = -1
+        self._trailing = 0
+
+    def append(self, timestamp: int, value: float):
+        """
+        Add a point (timestamps must not decrease)
+
+        Args:
+            timestamp: Unix timestamp in milliseconds
+            value: Sample value
+        """
+        bits = self.bits
+        value_bits = _float_bits(float(value))
+
+        if self.count == 0:
+            bits.write(timestamp & 0xFFFFFFFFFFFFFFFF, 64)
+            bits.write(value_bits, 64)
+            self.first_ts = timestamp
+        else:
+            self._write_timestamp(timestamp)
+            self._write_value(value_bits)
+
+        self._value_bits = value_bits
+        self.last_ts = timestamp
+        self.count += 1
+
+    def _write_timestamp(self, timestamp: int):
+        bits = self.bits
+        delta = timestamp - self.last_ts
+        dod = delta - self._delta
+        self._delta = delta
+
+        if dod == 0:
+            bits.write(0, 1)
+            return
+
+        for prefix, prefix_bits, payload_bits in _DOD_BUCKETS:
+            limit = 1 << (payload_bits - 1)
+            if -limit < dod <= limit:
+                bits.write(prefix, prefix_bits)
+                bits.write(dod, payload_bits)
+                return
+
+        prefix, prefix_bits, payload_bits = _DOD_FALLBACK
+        bits.write(prefix, prefix_bits)
+        bits.write(dod, payload_bits)
+
+    def _write_value(self, value_bits: int):
+        bits = self.bits
+        xor = value_bits ^ self._value_bits
+
+        if xor == 0:
+            bits.write(0, 1)
+            return
+
+        leading = min(64 - xor.bit_length(), 31)
+        trailing = (xor & -xor).bit_length() - 1
+
+        if self._leading >= 0 and leading >= self._leading and trailing >= self._trailing:
+            # Meaningful bits fit in the previous window
+            bits.write(0b10, 2)
+            length = 64 - self._leading - self._trailing
+            bits.write(xor >> self._trailing, length)
+        else:
+            length = 64 - leading - trailing
+            bits.write(0b11, 2)
+            bits.write(leading, 5)
+            bits.write(length - 1, 6)
+            bits.write(xor >> trailing, length)
+            self._leading = leading
+            self._trailing = trailing
+
+    @property
+    def size_bytes(self) -> int:
+        return (self.bits.length + 7) // 8
+
+
+def decode(reader: BitReader, count: int) -> Iterator[Tuple[int, float]]:
+    """
+    Decode a block written by GorillaEncoder
+
+    Args:
+        reader: Bit reader positioned at the start of the block
+        count: Number of points in the block
+
+    Yields:
+        (timestamp, value) pairs
+    """
+    if count == 0:
+        return
+
+    timestamp = reader.read(64)
+    if timestamp >= 1 << 63:
+        timestamp -= 1 << 64
+    value_bits = reader.read(64)
+    yield timestamp, _bits_float(value_bits)
+
+    delta = 0
+    leading = 0
+    trailing = 0
+
+    for _ in range(count - 1):
+        # Timestamp
+        if reader.read_bit() == 0:
+            dod = 0
+        else:
+            payload_bits = _DOD_FALLBACK[2]
+            for _prefix, prefix_bits, bucket_bits in _DOD_BUCKETS:
+                if reader.read_bit() == 0:
+                    payload_bits = bucket_bits
+                    break
+            dod = reader.read(payload_bits)
+            if dod > 1 << (payload_bits - 1):
+                dod -= 1 << payload_bits
+        delta += dod
+        timestamp += delta
+
+        # Value
+        if reader.read_bit() == 1:
+            if reader.read_bit() == 1:
+                leading = reader.read(5)
+                length = reader.read(6) + 1
+                trailing = 64 - leading - length
+            else:
+                length = 64 - leading - trailing
+            value_bits ^= reader.read(length) << trailing
+
+        yield timestamp, _bits_float(value_bits)
+
+
+def decode_block(data: bytes, length: int, count: int) -> List[Tuple[int, float]]:
+    """
+    Decode a sealed block
+
+    Args:
+        data: Block bytes (GorillaEncoder.bits.to_bytes())
+        length: Length of the bit string
+        count: Number of points
+
+    Returns:
+        List of (timestamp, value) pairs
+    """
+    return list(decode(BitReader.from_bytes(data, length), count))
@@ -0,0 +1,324 @@
+"""
+In-memory time-series history for SmartSense Sensor Node
+
+Keeps a bounded, Gorilla-compressed history of every numeric metric so
+node features can answer "the last hour" without asking the server.
+"""
+
+import threading
+from collections import deque
+from typing import Any, Deque, Dict, Iterable, List, Optional, Tuple
+
+from .gorilla import BitReader, GorillaEncoder, decode, decode_block
+
+
+class SealedBlock:
+    """Immutable compressed block of points"""
+
+    __slots__ = ('data', 'length', 'count', 'first_ts', 'last_ts')
+
+    def __init__(self, encoder: GorillaEncoder):
+        self.data = encoder.bits.to_bytes()
+        self.length = encoder.bits.length
+        self.count = encoder.count
+        self.first_ts = encoder.first_ts
+        self.last_ts = encoder.last_ts
+
+    def points(self) -> List[Tuple[int, float]]:
+        return decode_block(self.data, self.length, self.count)
+
+
+class MetricRing:
+    """
+    Compressed ring buffer of one metric
+
+    Points are appended to an open block that is sealed (converted to bytes)
+    every ``block_points`` points. Whole blocks are dropped from the old end
+    once they fall out of the retention window or the metric exceeds its
+    byte budget.
+    """
+
+    def __init__(self, name: str, block_points: int, retention_ms: int, max_bytes: int):
+        self.name = name
+        self.block_points = block_points
+        self.retention_ms = retention_ms
+        self.max_bytes = max_bytes
+
+        self.blocks: Deque[SealedBlock] = deque()
+        self.active = GorillaEncoder()
+        self.sealed_bytes = 0
+        self.integral = True
+        self.dropped = 0
+        self.last: Optional[Tuple[int, Any]] = None
+
+    def append(self, timestamp: int, value: float):
+        """Add a point (out-of-order points are ignored)"""
+        if self.active.count and timestamp < self.active.last_ts:
+            return
+        if not self.active.count and self.blocks and timestamp < self.blocks[-1].last_ts:
+            return
+
+        if type(value) is not int:
+            self.integral = False
+
+        self.active.append(timestamp, value)
+        self.last = (timestamp, value)
+        if self.active.count >= self.block_points:
+            self._seal()
+
+        self._evict(timestamp)
+
+    def _seal(self):
+        block = SealedBlock(self.active)
+        self.blocks.append(block)
+        self.sealed_bytes += len(block.data)
+        self.active = GorillaEncoder()
+
+    def _evict(self, now_ts: int):
+        """Drop the oldest blocks beyond retention or the byte budget"""
+        cutoff = now_ts - self.retention_ms
+        while self.blocks and (self.blocks[0].last_ts < cutoff or self.size_bytes > self.max_bytes):
+            block = self.blocks.popleft()
+            self.sealed_bytes -= len(block.data)
+            self.dropped += block.count
+
+    def snapshot(self, start: Optional[int] = None, end: Optional[int] = None) -> 'RingSnapshot':
+        """
+        Capture the blocks overlapping a time range (cheap, no decoding)
+
+        Sealed blocks are immutable and the open block is captured as its
+        current bit string, so the snapshot can be decoded without holding
+        the buffer lock.
+        """
+        blocks = [
+            block for block in self.blocks
+            if not ((start is not None and block.last_ts < start) or
+                    (end is not None and block.first_ts > end))
+        ]
+        active = (self.active.bits.value, self.active.bits.length, self.active.count)
+        return RingSnapshot(blocks, active, self.integral, start, end)
+
+    @property
+    def count(self) -> int:
+        return sum(block.count for block in self.blocks) + self.active.count
+
+    @property
+    def size_bytes(self) -> int:
+        return self.sealed_bytes + self.active.size_bytes
+
+
+class RingSnapshot:
+    """Point-in-time view of a MetricRing for decoding outside the lock"""
+
+    def __init__(self, blocks: List[SealedBlock], active: Tuple[int, int, int],
+                 integral: bool, start: Optional[int], end: Optional[int]):
+        self.blocks = blocks
+        self.active = active
+        self.integral = integral
+        self.start = start
+        self.end = end
+
+    def points(self) -> List[Tuple[int, Any]]:
+        """Decode points with start <= timestamp <= end (None = unbounded)"""
+        start, end = self.start, self.end
+        result = []
+        for block in self.blocks:
+            result.extend(block.points())
+
+        value, length, count = self.active
+        if count:
+            result.extend(decode(BitReader(value, length), count))
+
+        if start is not None or end is not None:
+            result = [
+                (t, v) for t, v in result
+                if (start is None or t >= start) and (end is None or t <= end)
+            ]
+
+        if self.integral:
+            result = [(t, int(v)) for t, v in result]
+        return result
+
+
+class TimeSeriesBuffer:
+    """
+    Per-metric compressed history with range queries and downsampling
+
+    Only numeric values are kept (category labels such as "good"/"poor" are
+    skipped). All methods are thread-safe.
+    """
+
+    # Aggregations supported by downsample()
+    AGGREGATES = ('mean', 'min', 'max', 'first', 'last', 'count', 'sum')
+
+    def __init__(self, retention_hours: float = 72, max_bytes_per_metric: int = 512 * 1024,
+                 block_points: int = 120):
+        """
+        Initialize history buffer
+
+        Args:
+            retention_hours: How long samples are kept
+            max_bytes_per_metric: Compressed size budget per metric
+            block_points: Points per compressed block (eviction granularity)
+        """
+        self.retention_ms = int(retention_hours * 3600 * 1000)
+        self.max_bytes_per_metric = max_bytes_per_metric
+        self.block_points = max(2, int(block_points))
+
+        self._lock = threading.Lock()
+        self._rings: Dict[str, MetricRing] = {}
+
+    def append(self, name: str, timestamp: int, value: Any) -> bool:
+        """
+        Add one sample
+
+        Args:
+            name: Metric name (e.g. "BME680/temperature")
+            timestamp: Unix timestamp in milliseconds
+            value: Sample value
+
+        Returns:
+            True if the sample was stored (numeric values only)
+        """
+        if value is None or isinstance(value, (str, bool)):
+            return False
+
+        with self._lock:
+            ring = self._rings.get(name)
+            if ring is None:
+                ring = MetricRing(name, self.block_points, self.retention_ms,
+                                  self.max_bytes_per_metric)
+                self._rings[name] = ring
+            ring.append(int(timestamp), value)
+        return True
+
+    def append_readings(self, readings: Iterable[Any]) -> int:
+        """
+        Add a read cycle
+
+        Args:
+            readings: Readings (see sensors.reading.Reading)
+
+        Returns:
+            Number of samples stored
+        """
+        stored = 0
+        for reading in readings:
+            if self.append(reading.spec.name, reading.timestamp, reading.value):
+                stored += 1
+        return stored
+
+    def query(self, name: str, start: Optional[int] = None,
+              end: Optional[int] = None) -> List[Tuple[int, Any]]:
+        """
+        Get raw samples of a metric in a time range
+
+        Args:
+            name: Metric name
+            start: Start timestamp in ms (inclusive, None = oldest)
+            end: End timestamp in ms (inclusive, None = newest)
+
+        Returns:
+            List of (timestamp, value), oldest first
+        """
+        with self._lock:
+            ring = self._rings.get(name)
+            if ring is None:
+                return []
+            snapshot = ring.snapshot(start, end)
+
+        return snapshot.points()
+
+    def downsample(self, name: str, bucket_ms: int, start: Optional[int] = None,
+                   end: Optional[int] = None, aggregate: str = 'mean') -> List[Tuple[int, Any]]:
+        """
+        Aggregate samples into fixed time buckets
+
+        Buckets are aligned to multiples of ``bucket_ms`` since the epoch and
+        labelled with their start time; empty buckets are omitted.
+
+        Args:
+            name: Metric name
+            bucket_ms: Bucket width in milliseconds
+            start: Start timestamp in ms (inclusive, None = oldest)
+            end: End timestamp in ms (inclusive, None = newest)
+            aggregate: One of AGGREGATES
+
+        Returns:
+            List of (bucket start, aggregated value)
+        """
+        if aggregate not in self.AGGREGATES:
+            raise ValueError(f"Unknown aggregate: {aggregate}")
+        if bucket_ms <= 0:
+            raise ValueError(f"Invalid bucket width: {bucket_ms}")
+
+        result = []
+        bucket_start = None
+        values: List[Any] = []
+
+        for timestamp, value in self.query(name, start, end):
+            bucket = timestamp - timestamp % bucket_ms
+            if bucket != bucket_start:
+                if values:
+                    result.append((bucket_start, _aggregate(values, aggregate)))
+                bucket_start = bucket
+                values = []
+            values.append(value)
+
+        if values:
+            result.append((bucket_start, _aggregate(values, aggregate)))
+        return result
+
+    def latest(self, name: str) -> Optional[Tuple[int, Any]]:
+        """Get the newest sample of a metric (None if unknown)"""
+        with self._lock:
+            ring = self._rings.get(name)
+            return ring.last if ring else None
+
+    def metrics(self) -> List[str]:
+        """Get the names of all metrics with history"""
+        with self._lock:
+            return sorted(self._rings)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get memory usage statistics
+
+        Returns:
+            Dict with totals and per-metric point counts and sizes
+        """
+        with self._lock:
+            rings = {
+                name: {
+                    'points': ring.count,
+                    'bytes': ring.size_bytes,
+                    'dropped': ring.dropped
+                }
+                for name, ring in self._rings.items()
+            }
+
+        points = sum(r['points'] for r in rings.values())
+        size = sum(r['bytes'] for r in rings.values())
+        return {
+            'metrics': len(rings),
+            'points': points,
+            'bytes': size,
+            'bits_per_point': round(size * 8 / points, 1) if points else 0.0,
+            'series': rings
+        }
+
+
+def _aggregate(values: List[Any], aggregate: str) -> Any:
+    if aggregate == 'mean':
+        return sum(values) / len(values)
+    if aggregate == 'min':
+        return min(values)
+    if aggregate == 'max':
+        return max(values)
+    if aggregate == 'first':
+        return values[0]
+    if aggregate == 'last':
+        return values[-1]
+    if aggregate == 'count':
+        return len(values)
+    return sum(values)
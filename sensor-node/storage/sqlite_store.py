@@ -0,0 +1,340 @@
+"""
+Tiered on-disk history for SmartSense Sensor Node
+
+SQLite (WAL mode) store with a raw tier and 1-minute / 1-hour rollups so a
+node can survive long server outages and still answer local queries.
+"""
+
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from utils.instrumentation import REGISTRY
+
+logger = logging.getLogger("smartsense.store")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS metrics (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    unit TEXT NOT NULL DEFAULT ''
+);
+CREATE TABLE IF NOT EXISTS raw (
+    metric_id INTEGER NOT NULL,
+    ts INTEGER NOT NULL,
+    value REAL NOT NULL,
+    PRIMARY KEY (metric_id, ts)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS rollup_1m (
+    metric_id INTEGER NOT NULL,
+    bucket INTEGER NOT NULL,
+    min REAL NOT NULL,
+    max REAL NOT NULL,
+    sum REAL NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (metric_id, bucket)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS rollup_1h (
+    metric_id INTEGER NOT NULL,
+    bucket INTEGER NOT NULL,
+    min REAL NOT NULL,
+    max REAL NOT NULL,
+    sum REAL NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (metric_id, bucket)
+) WITHOUT ROWID;
+"""
+
+
+class HistoryStore:
+    """
+    SQLite time-series store with raw and rollup tiers
+
+    Samples are buffered in memory and written by flush() in a single
+    transaction (typically from a periodic scheduler job), so the SD card
+    sees one WAL append per flush interval instead of one write per read.
+    The rollup tiers keep min/max/sum/count per bucket and are updated in
+    the same transaction with an UPSERT, so they stay consistent with the
+    raw tier even if the raw data has since expired.
+
+    add() on the sampling path only waits for the in-memory buffer; the
+    disk transaction runs under a separate lock. If writes keep failing,
+    at most ``max_pending`` samples are kept for the next attempt and the
+    oldest are dropped.
+
+    Tiers:
+        raw  - every sample
+        1m   - 1-minute buckets
+        1h   - 1-hour buckets
+    """
+
+    TIERS = {
+        '1m': ('rollup_1m', 60 * 1000),
+        '1h': ('rollup_1h', 3600 * 1000),
+    }
+
+    # How often expired rows are deleted (seconds)
+    RETENTION_INTERVAL = 3600
+
+    def __init__(self, path: str = "data/history.db", raw_retention_days: float = 7,
+                 minute_retention_days: float = 30, hour_retention_days: float = 365,
+                 max_pending: int = 100000):
+        """
+        Initialize store
+
+        Args:
+            path: SQLite database file
+            raw_retention_days: How long raw samples are kept
+            minute_retention_days: How long 1-minute rollups are kept
+            hour_retention_days: How long 1-hour rollups are kept
+            max_pending: Samples kept in memory while writes fail
+        """
+        self.path = Path(path)
+        self.retention_ms = {
+            'raw': int(raw_retention_days * 86400 * 1000),
+            '1m': int(minute_retention_days * 86400 * 1000),
+            '1h': int(hour_retention_days * 86400 * 1000),
+        }
+
+        self.max_pending = max_pending
+
+        # _lock guards the pending buffer only; _db_lock serializes use of
+        # the connection (flush, queries, close)
+        self._lock = threading.Lock()
+        self._db_lock = threading.Lock()
+        self._pending: List[Tuple[str, str, int, float]] = []
+        self._dropped = REGISTRY.counter(
+            'history_samples_dropped_total', 'History samples dropped after failed writes')
+        self._metric_ids: Dict[str, int] = {}
+        self._last_retention = 0.0
+        self.rows_written = 0
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        # NORMAL is durable across application crashes in WAL mode and
+        # only fsyncs at checkpoints
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute("PRAGMA temp_store=MEMORY")
+        self._db.executescript(SCHEMA)
+
+        for metric_id, name in self._db.execute("SELECT id, name FROM metrics"):
+            self._metric_ids[name] = metric_id
+
+    def add(self, name: str, timestamp: int, value: Any, unit: str = '') -> bool:
+        """
+        Buffer one sample for the next flush
+
+        Args:
+            name: Metric name
+            timestamp: Unix timestamp in milliseconds
+            value: Sample value (numeric values only)
+            unit: Metric unit
+
+        Returns:
+            True if the sample was buffered
+        """
+        if value is None or isinstance(value, (str, bool)):
+            return False
+
+        with self._lock:
+            self._pending.append((name, unit, int(timestamp), float(value)))
+        return True
+
+    def add_readings(self, readings: Iterable[Any]) -> int:
+        """
+        Buffer a read cycle
+
+        Args:
+            readings: Readings (see sensors.reading.Reading)
+
+        Returns:
+            Number of samples buffered
+        """
+        buffered = 0
+        for reading in readings:
+            if self.add(reading.spec.name, reading.timestamp, reading.value, reading.spec.unit):
+                buffered += 1
+        return buffered
+
+    def flush(self) -> int:
+        """
+        Write buffered samples and rollups in one transaction
+
+        Returns:
+            Number of samples written
+        """
+        with self._db_lock:
+            with self._lock:
+                pending = self._pending
+                self._pending = []
+
+            if pending:
+                try:
+                    self._write(pending)
+                except sqlite3.Error as e:
+                    logger.error(f"Failed to write history: {e}")
+                    self._requeue(pending)
+                    return 0
+
+            if time.monotonic() - self._last_retention >= self.RETENTION_INTERVAL:
+                self._enforce_retention()
+
+        return len(pending)
+
+    def _requeue(self, pending: List[Tuple[str, str, int, float]]):
+        """Keep samples of a failed write for the next attempt, oldest dropped first"""
+        with self._lock:
+            self._pending = pending + self._pending
+            overflow = len(self._pending) - self.max_pending
+            if overflow > 0:
+                del self._pending[:overflow]
+
+        if overflow > 0:
+            self._dropped.inc(overflow)
+            logger.warning(f"History buffer full, dropped {overflow} oldest samples")
+
+    def _write(self, pending: List[Tuple[str, str, int, float]]):
+        """Insert samples and merge rollups (_db_lock held)"""
+        rollups: Dict[str, Dict[Tuple[int, int], List[float]]] = {tier: {} for tier in self.TIERS}
+        new_metrics = []
+        inserted = 0
+
+        db = self._db
+        db.execute("BEGIN")
+        try:
+            for name, unit, timestamp, value in pending:
+                metric_id = self._metric_ids.get(name)
+                if metric_id is None:
+                    metric_id = db.execute(
+                        "INSERT INTO metrics (name, unit) VALUES (?, ?)", (name, unit)
+                    ).lastrowid
+                    self._metric_ids[name] = metric_id
+                    new_metrics.append(name)
+
+                # A repeated (metric, timestamp) is ignored by the raw tier
+                # and must not be counted in the rollups either
+                if not db.execute(
+                    "INSERT OR IGNORE INTO raw (metric_id, ts, value) VALUES (?, ?, ?)",
+                    (metric_id, timestamp, value)
+                ).rowcount:
+                    continue
+                inserted += 1
+
+                for tier, (_table, width) in self.TIERS.items():
+                    key = (metric_id, timestamp - timestamp % width)
+                    agg = rollups[tier].get(key)
+                    if agg is None:
+                        rollups[tier][key] = [value, value, value, 1]
+                    else:
+                        agg[0] = min(agg[0], value)
+                        agg[1] = max(agg[1], value)
+                        agg[2] += value
+                        agg[3] += 1
+
+            for tier, (table, _width) in self.TIERS.items():
+                db.executemany(
+                    f"INSERT INTO {table} (metric_id, bucket, min, max, sum, count) "
+                    f"VALUES (?, ?, ?, ?, ?, ?) "
+                    f"ON CONFLICT (metric_id, bucket) DO UPDATE SET "
+                    f"min = min({table}.min, excluded.min), "
+                    f"max = max({table}.max, excluded.max), "
+                    f"sum = {table}.sum + excluded.sum, "
+                    f"count = {table}.count + excluded.count",
+                    [(m, b, *agg) for (m, b), agg in rollups[tier].items()]
+                )
+
+            db.execute("COMMIT")
+        except Exception:
+            db.execute("ROLLBACK")
+            # Ids assigned in the rolled back transaction do not exist
+            for name in new_metrics:
+                self._metric_ids.pop(name, None)
+            raise
+
+        self.rows_written += inserted
+        if inserted < len(pending):
+            logger.debug(f"Skipped {len(pending) - inserted} repeated samples")
+        logger.debug(f"Wrote {inserted} samples to history")
+
+    def _enforce_retention(self):
+        """Delete rows that fell out of each tier's retention (_db_lock held)"""
+        self._last_retention = time.monotonic()
+        now_ms = int(time.time() * 1000)
+
+        try:
+            self._db.execute("DELETE FROM raw WHERE ts < ?", (now_ms - self.retention_ms['raw'],))
+            for tier, (table, _width) in self.TIERS.items():
+                self._db.execute(f"DELETE FROM {table} WHERE bucket < ?",
+                                 (now_ms - self.retention_ms[tier],))
+        except sqlite3.Error as e:
+            logger.error(f"Failed to enforce history retention: {e}")
+
+    def query(self, name: str, start: Optional[int] = None, end: Optional[int] = None,
+              tier: str = 'raw') -> List[Dict[str, Any]]:
+        """
+        Query a metric by time range (flushed samples only)
+
+        Args:
+            name: Metric name
+            start: Start timestamp in ms (inclusive, None = oldest)
+            end: End timestamp in ms (inclusive, None = newest)
+            tier: 'raw', '1m' or '1h'
+
+        Returns:
+            Raw tier: list of {timestamp, value}
+            Rollup tiers: list of {timestamp, min, max, mean, count}
+        """
+        if tier != 'raw' and tier not in self.TIERS:
+            raise ValueError(f"Unknown tier: {tier}")
+
+        start = start if start is not None else -2 ** 63
+        end = end if end is not None else 2 ** 63 - 1
+
+        with self._db_lock:
+            metric_id = self._metric_ids.get(name)
+            if metric_id is None:
+                return []
+
+            if tier == 'raw':
+                rows = self._db.execute(
+                    "SELECT ts, value FROM raw WHERE metric_id = ? AND ts BETWEEN ? AND ? ORDER BY ts",
+                    (metric_id, start, end)
+                ).fetchall()
+                return [{'timestamp': ts, 'value': value} for ts, value in rows]
+
+            table = self.TIERS[tier][0]
+            rows = self._db.execute(
+                f"SELECT bucket, min, max, sum, count FROM {table} "
+                f"WHERE metric_id = ? AND bucket BETWEEN ? AND ? ORDER BY bucket",
+                (metric_id, start, end)
+            ).fetchall()
+
+        return [
+            {'timestamp': bucket, 'min': low, 'max': high, 'mean': total / count, 'count': count}
+            for bucket, low, high, total, count in rows
+        ]
+
+    def metrics(self) -> List[Dict[str, str]]:
+        """Get all stored metrics (name and unit)"""
+        with self._db_lock:
+            rows = self._db.execute("SELECT name, unit FROM metrics ORDER BY name").fetchall()
+        return [{'name': name, 'unit': unit} for name, unit in rows]
+
+    @property
+    def pending(self) -> int:
+        """Number of samples waiting for the next flush"""
+        return len(self._pending)
+
+    def close(self):
+        """Flush remaining samples, checkpoint the WAL and close the database"""
+        self.flush()
+        with self._db_lock:
+            try:
+                self._db.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            except sqlite3.Error as e:
+                logger.warning(f"WAL checkpoint failed: {e}")
+            self._db.close()
@@ -0,0 +1,47 @@
+"""
+Startup import budget of main.py (see tools/import_budget.py)
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'tools'))
+
+import import_budget  # noqa: E402
+
+
+@pytest.fixture(scope='module')
+def probe():
+    """Import main.py once in a fresh interpreter"""
+    return import_budget.run_probe()
+
+
+def test_lazy_modules_not_imported(probe):
+    _entries, info = probe
+    assert info.get('MODULES'), "probe did not report the loaded modules"
+    assert import_budget.eager_modules(info) == []
+
+
+def test_import_time_within_budget(probe):
+    entries, _info = probe
+    assert entries, "probe did not report import times"
+    assert import_budget.total_import_ms(entries) <= import_budget.BUDGET_MS
+
+
+def test_eager_modules_matches_submodules():
+    info = {'MODULES': 'json,paho.mqtt.client,sqlite3,storage.ring_buffer'}
+    assert import_budget.eager_modules(info) == ['sqlite3', 'paho']
+
+
+def test_parse_importtime():
+    stderr = (
+        "import time: self [us] | cumulative | imported package\n"
+        "import time:       120 |        120 |   storage.ring_buffer\n"
+        "import time:       300 |        420 | storage\n"
+        "unrelated line\n"
+    )
+    entries = import_budget.parse_importtime(stderr)
+    assert entries == [('  storage.ring_buffer', 120, 120), ('storage', 300, 420)]
+    assert import_budget.total_import_ms(entries) == pytest.approx(0.42)
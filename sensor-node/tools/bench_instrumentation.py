@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Benchmark of the instrumentation hot path
+
+Measures the cost of one Histogram.observe() and Counter.inc() call, net of
+the loop overhead, with log-normally distributed latencies. Also compares
+the histogram's quantile estimates with the exact quantiles.
+
+Usage:
+    python tools/bench_instrumentation.py [--observations 200000]
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from utils.instrumentation import Histogram, Counter  # noqa: E402
+
+
+def per_call_ns(func, values) -> float:
+    """Net nanoseconds per call (best of 5 runs)"""
+    best = float('inf')
+    for _ in range(5):
+        started = time.perf_counter()
+        for value in values:
+            func(value)
+        elapsed = time.perf_counter() - started
+
+        started = time.perf_counter()
+        for value in values:
+            pass
+        baseline = time.perf_counter() - started
+
+        best = min(best, (elapsed - baseline) / len(values))
+    return best * 1e9
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Instrumentation overhead benchmark")
+    parser.add_argument('--observations', type=int, default=200000)
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    values = [rng.lognormvariate(-7, 1.5) for _ in range(args.observations)]
+
+    histogram = Histogram('bench_seconds')
+    counter = Counter('bench_total')
+
+    print(f"Histogram.observe: {per_call_ns(histogram.observe, values):7.0f} ns")
+    print(f"Counter.inc:       {per_call_ns(counter.inc, values):7.0f} ns")
+
+    exact = sorted(values)
+    print()
+    print(f"{'quantile':>8} {'exact':>12} {'estimate':>12}")
+    for q in (0.5, 0.9, 0.99):
+        print(f"{q:>8} {exact[int(q * (len(exact) - 1))]:>12.6f} {histogram.quantile(q):>12.6f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Benchmark of the read/publish hot path (get_metrics + payload encoding)
+
+Compares the previous dict-based metric representation ("before") with
+the slot-based Reading records ("after") for every dummy sensor driver,
+using fixed sensor values so both paths encode the same payload.
+
+Reported per read cycle:
+    cpu us       CPU time (time.process_time)
+    peak bytes   transient memory while reading + encoding (tracemalloc)
+    blocks       memory blocks still referenced by the metrics list
+                 (what a consumer holding the readings keeps alive)
+
+Usage:
+    python tools/bench_publish.py [--cycles 20000] [--encoding json]
+"""
+
+import argparse
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sensors import SENSOR_DRIVERS, load_driver  # noqa: E402
+from mqtt.catalog import MetricCatalog  # noqa: E402
+from mqtt.encoding import create_encoder  # noqa: E402
+
+
+def legacy_quantize(value, resolution):
+    """Quantization as previously done per metric"""
+    if resolution is None or isinstance(value, (str, bool)) or value is None:
+        return value
+    steps = round(value / resolution)
+    if float(resolution).is_integer():
+        return int(steps * resolution)
+    decimals = len(f"{resolution:.10f}".rstrip('0').split('.')[1])
+    return round(steps * resolution, decimals)
+
+
+def legacy_get_metrics(sensor, timestamp):
+    """Previous BaseSensor.get_metrics (one dict and f-string per metric)"""
+    metrics = []
+    for key, value in sensor._read_data().items():
+        resolution = sensor._get_resolution(key)
+        metrics.append({
+            'name': f"{sensor.name}/{key}",
+            'timestamp': timestamp,
+            'value': legacy_quantize(value, resolution),
+            'unit': sensor._get_unit(key),
+            'resolution': resolution
+        })
+    return metrics
+
+
+def legacy_cycle(sensor, encoder, header, timestamp):
+    metrics = legacy_get_metrics(sensor, timestamp)
+    message = dict(header, sensors={})
+    for metric in metrics:
+        message['sensors'][metric.get('name', 'unknown')] = {
+            'value': metric.get('value'),
+            'timestamp': metric.get('timestamp', timestamp),
+            'unit': metric.get('unit', '')
+        }
+    return metrics, encoder.encode(message)
+
+
+def reading_cycle(sensor, encoder, header, timestamp):
+    metrics = sensor.get_metrics(timestamp)
+    return metrics, encoder.encode_readings(header, metrics)
+
+
+def measure(cycle, sensor, encoder, header, cycles):
+    """Run one path and return (cpu us, peak bytes, retained blocks) per cycle"""
+    timestamp = header['timestamp']
+
+    for _ in range(100):
+        cycle(sensor, encoder, header, timestamp)
+
+    start = time.process_time()
+    for _ in range(cycles):
+        cycle(sensor, encoder, header, timestamp)
+    cpu_us = (time.process_time() - start) / cycles * 1e6
+
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    base = tracemalloc.get_traced_memory()[0]
+    cycle(sensor, encoder, header, timestamp)
+    peak = tracemalloc.get_traced_memory()[1] - base
+
+    kept = []
+    before = tracemalloc.take_snapshot()
+    for _ in range(100):
+        kept.append(cycle(sensor, encoder, header, timestamp)[0])
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+
+    blocks = sum(stat.count_diff for stat in after.compare_to(before, 'filename'))
+    return cpu_us, peak, blocks / 100
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Read/publish hot path benchmark")
+    parser.add_argument('--cycles', type=int, default=20000, help="Read cycles per measurement")
+    parser.add_argument('--encoding', default='json', help="Payload encoding")
+    args = parser.parse_args()
+
+    encoder = create_encoder(args.encoding)
+    header = {'node_id': 'sensor-node-01', 'msg_id': '65f0a1b2-1', 'timestamp': 1761794865340}
+
+    print(f"{'sensor':<10} {'path':<8} {'cpu us':>8} {'peak bytes':>11} {'blocks':>7}")
+    for sensor_name in SENSOR_DRIVERS:
+        sensor = load_driver(sensor_name)({'use_dummy': True})
+        sensor.initialize()
+
+        # Fixed values so both paths encode identical payloads
+        data = sensor.read_dummy()
+        sensor._read_data = lambda peek=False, data=data: data
+        encoder.update_layout(MetricCatalog(sensor.describe_metrics()).entries())
+
+        before = legacy_cycle(sensor, encoder, header, header['timestamp'])[1]
+        after = reading_cycle(sensor, encoder, header, header['timestamp'])[1]
+        if before != after:
+            print(f"{sensor.name}: payload mismatch\n  before: {before!r}\n  after:  {after!r}")
+            return 1
+
+        for label, cycle in (('before', legacy_cycle), ('after', reading_cycle)):
+            cpu_us, peak, blocks = measure(cycle, sensor, encoder, header, args.cycles)
+            print(f"{sensor.name:<10} {label:<8} {cpu_us:>8.1f} {peak:>11} {blocks:>7.1f}")
+
+        sensor.close()
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Import-time report and startup budget check for the sensor node
+
+Imports main.py in a fresh interpreter with ``-X importtime`` and prints the
+slowest modules (cumulative time), the total import time and the peak RSS.
+Exits with status 1 if the total exceeds the budget or if a module that
+must stay lazy (sensor drivers, pyserial, zeroconf, provisioning and
+metrics HTTP servers, the SQLite store, NumPy, RPi.GPIO, paho) was
+imported, so it can be used as a pre-commit or CI check.
+
+Usage:
+    python tools/import_budget.py [--budget-ms 400] [--top 15]
+"""
+
+import argparse
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+NODE_DIR = Path(__file__).resolve().parent.parent
+
+# Default startup budget for the total import time of main.py
+BUDGET_MS = 400.0
+
+# Modules that importing main.py must not load
+LAZY_MODULES = (
+    'sensors.bme680',
+    'sensors.scd40',
+    'sensors.pms5003',
+    'sensors.bh1750',
+    'serial',
+    'zeroconf',
+    'utils.mdns_discovery',
+    'utils.web_server',
+    'utils.wifi_provisioning',
+    'utils.network_check',
+    'utils.aggregation',
+    'utils.metrics_server',
+    'storage.sqlite_store',
+    'sqlite3',
+    'http.server',
+    'numpy',
+    'RPi',
+    'paho',
+)
+
+PROBE = (
+    "import sys, resource, main\n"
+    "print('RSS_KB', resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)\n"
+    "print('MODULES', ','.join(sorted(sys.modules)))\n"
+)
+
+
+def parse_importtime(stderr: str) -> List[Tuple[str, int, int]]:
+    """
+    Parse ``-X importtime`` output
+
+    Returns:
+        List of (module, self_us, cumulative_us)
+    """
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+
+        fields = line[len('import time:'):].split('|')
+        if len(fields) != 3:
+            continue
+        self_us, cumulative_us, name = fields
+        # Nesting is encoded as indentation after the first space
+        entries.append((name[1:].rstrip(), int(self_us), int(cumulative_us)))
+    return entries
+
+
+def run_probe() -> Tuple[List[Tuple[str, int, int]], Dict[str, str]]:
+    """Import main.py in a subprocess and collect timings and module list"""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', PROBE],
+        cwd=NODE_DIR,
+        capture_output=True,
+        text=True
+    )
+    if result.returncode != 0:
+        tail = result.stderr.strip().splitlines()[-1:] or ['unknown error']
+        raise RuntimeError(f"Importing main.py failed: {tail[0]}")
+
+    info = {}
+    for line in result.stdout.splitlines():
+        key, _, value = line.partition(' ')
+        info[key] = value
+    return parse_importtime(result.stderr), info
+
+
+def total_import_ms(entries: List[Tuple[str, int, int]]) -> float:
+    """Total import time in milliseconds (sum of the top-level imports)"""
+    # Top-level imports are the entries without leading indentation
+    return sum(cumulative for name, _, cumulative in entries
+               if not name.startswith(' ') and cumulative) / 1000
+
+
+def eager_modules(info: Dict[str, str]) -> List[str]:
+    """Modules from LAZY_MODULES (or their submodules) that were imported"""
+    loaded = set(info.get('MODULES', '').split(','))
+    return [name for name in LAZY_MODULES
+            if name in loaded or any(m.startswith(name + '.') for m in loaded)]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Sensor node import-time report")
+    parser.add_argument('--budget-ms', type=float, default=BUDGET_MS,
+                        help="Maximum total import time of main.py in milliseconds")
+    parser.add_argument('--top', type=int, default=15,
+                        help="Number of slowest modules to list")
+    args = parser.parse_args()
+
+    try:
+        entries, info = run_probe()
+    except RuntimeError as e:
+        print(e, file=sys.stderr)
+        return 2
+
+    slowest = sorted(entries, key=lambda e: e[2], reverse=True)[:args.top]
+
+    print(f"{'module':<40} {'self ms':>9} {'cumul ms':>9}")
+    for name, self_us, cumulative_us in slowest:
+        print(f"{name.strip():<40} {self_us / 1000:>9.1f} {cumulative_us / 1000:>9.1f}")
+
+    total_ms = total_import_ms(entries)
+    print(f"\nTotal import time: {total_ms:.1f} ms (budget {args.budget_ms:.0f} ms)")
+    if 'RSS_KB' in info:
+        print(f"Peak RSS after import: {int(info['RSS_KB']) / 1024:.1f} MB")
+
+    eager = eager_modules(info)
+
+    failed = False
+    if eager:
+        print(f"FAIL: modules that should load lazily were imported: {', '.join(eager)}")
+        failed = True
+    if total_ms > args.budget_ms:
+        print(f"FAIL: import time exceeds budget by {total_ms - args.budget_ms:.1f} ms")
+        failed = True
+
+    if not failed:
+        print("OK")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
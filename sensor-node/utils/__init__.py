@@ -1,13 +1,33 @@
 """
 SmartSense Sensor Node Utilities
+
+Network and provisioning helpers (mDNS, web servers, WiFi) and the
+aggregation stage (optional NumPy) are imported on first access; nodes that
+do not use them never load them.
 """
 
+import importlib
+
 from .logger import setup_logger
 from .config_loader import load_config, get_node_info, get_sensor_config, get_mqtt_config
-from .wifi_provisioning import WiFiProvisioning
-from .mdns_discovery import ServiceDiscovery
-from .web_server import ProvisioningServer
-from .network_check import NetworkChecker
+from .scheduler import SensorScheduler
+from .startup import StartupPipeline
+from .deadband import Deadband, DeadbandFilter
+from .adaptive import AdaptiveSampler
+from .commands import CommandDispatcher, CommandError
+from .instrumentation import REGISTRY
+
+# Attribute -> submodule, imported lazily (PEP 562)
+_LAZY_IMPORTS = {
+    'WiFiProvisioning': '.wifi_provisioning',
+    'ServiceDiscovery': '.mdns_discovery',
+    'ProvisioningServer': '.web_server',
+    'NetworkChecker': '.network_check',
+    'WindowAggregator': '.aggregation',
+    'NodeTelemetry': '.telemetry',
+    'LatestReadings': '.metrics_server',
+    'MetricsServer': '.metrics_server'
+}
 
 __all__ = [
     'setup_logger',
@@ -18,5 +38,31 @@ __all__ = [
     'WiFiProvisioning',
     'ServiceDiscovery',
     'ProvisioningServer',
-    'NetworkChecker'
+    'NetworkChecker',
+    'SensorScheduler',
+    'StartupPipeline',
+    'Deadband',
+    'DeadbandFilter',
+    'AdaptiveSampler',
+    'CommandDispatcher',
+    'CommandError',
+    'REGISTRY',
+    'WindowAggregator',
+    'NodeTelemetry',
+    'LatestReadings',
+    'MetricsServer'
 ]
+
+
+def __getattr__(name: str):
+    module = _LAZY_IMPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_LAZY_IMPORTS))
@@ -0,0 +1,143 @@
+"""
+Adaptive sampling rate control
+Read a sensor faster while its signal changes quickly and slower while stable
+"""
+
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+from sensors.reading import Reading
+
+
+class AdaptiveSampler:
+    """
+    Variability-driven read interval for one sensor
+
+    For every driving metric the controller keeps an EWMA of its absolute
+    change per second between reads. The interval is chosen so that the
+    expected change per read stays around the metric's ``target`` step
+    (interval = target / rate), taking the shortest interval over all
+    metrics and clamping it to [min_interval, max_interval]. A stable signal
+    therefore drifts to max_interval and a fast-changing one (CO2 when a
+    meeting starts, PM2.5 while cooking) drops towards min_interval.
+
+    Shorter intervals are applied at once so fast events are not missed;
+    longer intervals grow by at most RELEASE_FACTOR per read, and changes
+    smaller than HYSTERESIS are ignored to avoid rescheduling on noise.
+    """
+
+    # Maximum growth of the interval per update
+    RELEASE_FACTOR = 1.5
+
+    # Minimum relative change before a new interval is applied
+    HYSTERESIS = 0.1
+
+    def __init__(self, min_interval: float, max_interval: float,
+                 targets: Dict[str, float], alpha: float = 0.3,
+                 initial: Optional[float] = None):
+        """
+        Initialize controller
+
+        Args:
+            min_interval: Shortest read interval in seconds
+            max_interval: Longest read interval in seconds
+            targets: Metric key (e.g. "co2") -> change per read worth resolving
+            alpha: EWMA smoothing factor (0-1, higher reacts faster)
+            initial: Starting interval (default: max_interval)
+        """
+        if min_interval <= 0 or max_interval < min_interval:
+            raise ValueError(f"Invalid adaptive interval bounds: {min_interval}-{max_interval}")
+        if not 0 < alpha <= 1:
+            raise ValueError(f"Invalid EWMA alpha: {alpha}")
+        for key, target in targets.items():
+            if target <= 0:
+                raise ValueError(f"Invalid adaptive target for {key}: {target}")
+
+        self.min_interval = float(min_interval)
+        self.max_interval = float(max_interval)
+        self.targets = targets
+        self.alpha = alpha
+        self.interval = self._clamp(initial if initial is not None else max_interval)
+
+        # Metric key -> (last value, last timestamp ms)
+        self._last: Dict[str, Tuple[float, int]] = {}
+        # Metric key -> EWMA of absolute change per second
+        self.rates: Dict[str, float] = {}
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any], initial: Optional[float] = None) -> 'AdaptiveSampler':
+        """
+        Build a controller from a sensor's ``adaptive`` config section
+
+        Args:
+            config: Dict with min_interval, max_interval, alpha and metrics
+                    ({key: target change per read})
+            initial: Starting interval (the sensor's read_interval)
+
+        Returns:
+            Configured controller
+        """
+        return cls(
+            min_interval=config['min_interval'],
+            max_interval=config['max_interval'],
+            targets={key: float(target) for key, target in config['metrics'].items()},
+            alpha=config.get('alpha', 0.3),
+            initial=initial
+        )
+
+    def _clamp(self, interval: float) -> float:
+        return min(self.max_interval, max(self.min_interval, float(interval)))
+
+    def update(self, readings: Sequence[Reading]) -> Optional[float]:
+        """
+        Feed a read cycle
+
+        Args:
+            readings: Readings of one sensor
+
+        Returns:
+            New interval in seconds if it should change, otherwise None
+        """
+        for reading in readings:
+            key = reading.spec.key
+            value = reading.value
+            if key not in self.targets or value is None or isinstance(value, (str, bool)):
+                continue
+
+            last = self._last.get(key)
+            self._last[key] = (value, reading.timestamp)
+            if last is None or reading.timestamp <= last[1]:
+                continue
+
+            rate = abs(value - last[0]) * 1000.0 / (reading.timestamp - last[1])
+            previous = self.rates.get(key)
+            self.rates[key] = rate if previous is None else previous + self.alpha * (rate - previous)
+
+        if not self.rates:
+            return None
+
+        desired = self.max_interval
+        for key, rate in self.rates.items():
+            if rate > 0:
+                desired = min(desired, self.targets[key] / rate)
+        desired = self._clamp(desired)
+
+        # Fast attack, slow release
+        if desired > self.interval:
+            desired = min(desired, self.interval * self.RELEASE_FACTOR)
+
+        desired = round(desired, 1)
+        if desired == self.interval:
+            return None
+        at_bound = desired in (self.min_interval, self.max_interval)
+        if not at_bound and abs(desired - self.interval) < self.interval * self.HYSTERESIS:
+            return None
+
+        self.interval = desired
+        return desired
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get the current interval and change rates"""
+        return {
+            'interval': self.interval,
+            'rates': {key: round(rate, 4) for key, rate in self.rates.items()}
+        }
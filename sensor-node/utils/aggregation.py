@@ -0,0 +1,234 @@
+"""
+Windowed aggregation of sensor readings
+Sample fast, publish one statistics summary per tumbling window
+"""
+
+import logging
+import math
+from array import array
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from sensors.reading import MetricSpec, Reading
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+logger = logging.getLogger("smartsense.aggregation")
+
+
+class _StreamingStats:
+    """Welford running statistics of one metric (pure Python path)"""
+
+    __slots__ = ('count', 'mean', 'm2', 'min', 'max', 'last')
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self.last = None
+
+    def add(self, value: float):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        self.last = value
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            'mean': self.mean,
+            'min': self.min,
+            'max': self.max,
+            'stddev': math.sqrt(self.m2 / self.count),
+            'last': self.last,
+            'count': self.count
+        }
+
+
+class _SampleBuffer:
+    """Raw samples of one metric, summarized with NumPy at window close"""
+
+    __slots__ = ('values',)
+
+    def __init__(self):
+        self.values = array('d')
+
+    def add(self, value: float):
+        self.values.append(value)
+
+    @property
+    def count(self) -> int:
+        return len(self.values)
+
+    def summary(self) -> Dict[str, Any]:
+        data = np.frombuffer(self.values, dtype=np.float64)
+        return {
+            'mean': float(data.mean()),
+            'min': float(data.min()),
+            'max': float(data.max()),
+            'stddev': float(data.std()),
+            'last': float(data[-1]),
+            'count': int(data.size)
+        }
+
+
+class WindowAggregator:
+    """
+    Tumbling-window statistics for one sensor
+
+    Readings are collected per metric until a reading falls into the next
+    window (windows are aligned to multiples of ``window`` seconds since the
+    epoch); the closed window is then returned as summary readings:
+
+        BME680/temperature          mean
+        BME680/temperature/min      minimum
+        BME680/temperature/max      maximum
+        BME680/temperature/stddev   population standard deviation
+        BME680/temperature/last     last sample
+        BME680/temperature/count    number of samples
+
+    The mean keeps the original metric name, so consumers that ignore the
+    extra statistics see one value per window. Non-numeric metrics (category
+    labels) are published with their last value only. Summaries are stamped
+    with the window end time.
+    """
+
+    STATS = ('min', 'max', 'stddev', 'last', 'count')
+
+    def __init__(self, window: float, stats: Optional[Sequence[str]] = None,
+                 use_numpy: Optional[bool] = None):
+        """
+        Initialize aggregator
+
+        Args:
+            window: Window length in seconds
+            stats: Statistics published next to the mean (default: all STATS)
+            use_numpy: Force the NumPy (True) or pure Python (False) path;
+                       default uses NumPy when it is installed
+        """
+        if window <= 0:
+            raise ValueError(f"Invalid aggregation window: {window}")
+
+        self.window_ms = int(window * 1000)
+        self.stats = tuple(stats) if stats is not None else self.STATS
+        for stat in self.stats:
+            if stat not in self.STATS:
+                raise ValueError(f"Unknown statistic: {stat}")
+
+        if use_numpy and not NUMPY_AVAILABLE:
+            logger.warning("numpy not available, using pure Python aggregation. Install: pip install numpy")
+        self.use_numpy = NUMPY_AVAILABLE if use_numpy is None else (use_numpy and NUMPY_AVAILABLE)
+
+        self._window: Optional[int] = None
+        self._numeric: Dict[MetricSpec, Any] = {}
+        self._labels: Dict[MetricSpec, Any] = {}
+        self._derived: Dict[Tuple[MetricSpec, str], MetricSpec] = {}
+
+    def add(self, readings: Sequence[Reading]) -> List[Reading]:
+        """
+        Add a read cycle
+
+        Args:
+            readings: Readings of one sensor
+
+        Returns:
+            Summary readings of the window that was closed by this cycle
+            (empty while the current window is still open)
+        """
+        if not readings:
+            return []
+
+        summary = []
+        window = readings[0].timestamp // self.window_ms
+        if self._window is not None and window != self._window:
+            summary = self.flush()
+        self._window = window
+
+        for reading in readings:
+            value = reading.value
+            if value is None:
+                continue
+            if isinstance(value, (str, bool)):
+                self._labels[reading.spec] = value
+                continue
+
+            stats = self._numeric.get(reading.spec)
+            if stats is None:
+                stats = _SampleBuffer() if self.use_numpy else _StreamingStats()
+                self._numeric[reading.spec] = stats
+            stats.add(value)
+
+        return summary
+
+    def flush(self) -> List[Reading]:
+        """
+        Close the current window
+
+        Returns:
+            Summary readings (empty if the window has no samples)
+        """
+        if self._window is None:
+            return []
+
+        timestamp = (self._window + 1) * self.window_ms
+        summary = []
+
+        for spec, stats in self._numeric.items():
+            if not stats.count:
+                continue
+            values = stats.summary()
+            summary.append(Reading(spec, timestamp, spec.quantize(values['mean'])))
+            for stat in self.stats:
+                derived = self._derive(spec, stat)
+                summary.append(Reading(derived, timestamp, derived.quantize(values[stat])))
+
+        for spec, value in self._labels.items():
+            summary.append(Reading(spec, timestamp, value))
+
+        self._window = None
+        self._numeric = {}
+        self._labels = {}
+        return summary
+
+    def _derive(self, spec: MetricSpec, stat: str) -> MetricSpec:
+        """Get (or build) the spec of a statistic of a metric"""
+        derived = self._derived.get((spec, stat))
+        if derived is None:
+            if stat == 'count':
+                derived = spec.derive(stat, unit='', resolution=1)
+            else:
+                derived = spec.derive(stat)
+            self._derived[(spec, stat)] = derived
+        return derived
+
+    def describe(self, metrics: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Extend metric descriptions with the published statistics
+
+        Args:
+            metrics: Descriptions of the raw metrics (describe_metrics())
+
+        Returns:
+            Descriptions of every metric the aggregator publishes
+        """
+        described = []
+        for metric in metrics:
+            described.append(metric)
+            if metric.get('resolution') is None:
+                continue
+            for stat in self.stats:
+                described.append({
+                    'name': f"{metric['name']}/{stat}",
+                    'unit': '' if stat == 'count' else metric.get('unit', ''),
+                    'resolution': 1 if stat == 'count' else metric['resolution']
+                })
+        return described
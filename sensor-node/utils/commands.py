@@ -0,0 +1,183 @@
+"""
+Command dispatcher for SmartSense Sensor Node
+Runs remote commands on a worker thread, off the MQTT network thread
+"""
+
+import logging
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger("smartsense.commands")
+
+
+class CommandError(Exception):
+    """Command rejected by its handler (reported in the response)"""
+
+
+class CommandDispatcher:
+    """
+    Bounded command queue with a single worker thread
+
+    submit() is called from the MQTT network thread and only enqueues, so a
+    slow command never stalls keepalives or incoming publishes. Commands run
+    one at a time in arrival order; every command is answered through the
+    responder callback with its id, status ('ok' or 'error') and either the
+    handler's result or an error message. When the queue is full the command
+    is rejected immediately with status 'error' (busy).
+
+    Handlers take the command's ``parameters`` dict and return a result dict
+    (or None); they raise CommandError (or ValueError) to reject a command.
+    """
+
+    def __init__(self, responder: Callable[[Dict[str, Any]], Any], max_queue: int = 16):
+        """
+        Initialize dispatcher
+
+        Args:
+            responder: Called with each response (e.g. MQTTClient.publish_response)
+            max_queue: Maximum number of queued commands
+        """
+        self.responder = responder
+        self._queue: queue.Queue = queue.Queue(maxsize=max(1, int(max_queue)))
+        self._handlers: Dict[str, Callable[[Dict[str, Any]], Optional[Dict[str, Any]]]] = {}
+        self._worker: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+        self.executed = 0
+        self.failed = 0
+        self.rejected = 0
+
+    def register(self, name: str, handler: Callable[[Dict[str, Any]], Optional[Dict[str, Any]]]):
+        """
+        Register a command handler
+
+        Args:
+            name: Command name (the message's "command" field)
+            handler: Callable taking the parameters dict
+        """
+        self._handlers[name] = handler
+
+    @property
+    def commands(self):
+        """Names of the registered commands"""
+        return sorted(self._handlers)
+
+    def start(self):
+        """Start the worker thread (commands submitted earlier are kept)"""
+        if self._worker and self._worker.is_alive():
+            return
+
+        self._stop.clear()
+        self._worker = threading.Thread(
+            target=self._run,
+            name="command-worker",
+            daemon=True
+        )
+        self._worker.start()
+
+    def stop(self, timeout: float = 2.0):
+        """Stop the worker thread after the running command finishes"""
+        self._stop.set()
+        try:
+            self._queue.put_nowait(None)
+        except queue.Full:
+            pass
+        if self._worker:
+            self._worker.join(timeout=timeout)
+            self._worker = None
+
+    def submit(self, command: Any) -> bool:
+        """
+        Queue a command (never blocks)
+
+        Args:
+            command: Parsed command message
+                     {"command": name, "id": ..., "parameters": {...}}
+
+        Returns:
+            True if the command was queued
+        """
+        if not isinstance(command, dict) or not command.get('command'):
+            logger.warning(f"Ignoring malformed command: {command!r}")
+            self._respond(command if isinstance(command, dict) else {}, 'error',
+                          error="Missing 'command' field")
+            return False
+
+        try:
+            self._queue.put_nowait(command)
+        except queue.Full:
+            self.rejected += 1
+            logger.warning(f"Command queue full, rejecting {command['command']}")
+            self._respond(command, 'error', error="Command queue full, try again later")
+            return False
+
+        return True
+
+    def _run(self):
+        while not self._stop.is_set():
+            command = self._queue.get()
+            if command is None:
+                continue
+            self.execute(command)
+
+    def execute(self, command: Dict[str, Any]):
+        """
+        Run one command and send its response
+
+        Args:
+            command: Parsed command message
+        """
+        name = command.get('command')
+        handler = self._handlers.get(name)
+        if handler is None:
+            self.failed += 1
+            self._respond(command, 'error', error=f"Unknown command: {name}")
+            return
+
+        parameters = command.get('parameters') or {}
+        started = time.monotonic()
+        try:
+            result = handler(parameters)
+        except (CommandError, ValueError) as e:
+            self.failed += 1
+            logger.warning(f"Command {name} rejected: {e}")
+            self._respond(command, 'error', error=str(e))
+            return
+        except Exception as e:
+            self.failed += 1
+            logger.error(f"Command {name} failed: {e}")
+            self._respond(command, 'error', error=f"Internal error: {e}")
+            return
+
+        self.executed += 1
+        logger.info(f"Command {name} executed in {(time.monotonic() - started) * 1000:.1f} ms")
+        self._respond(command, 'ok', result=result)
+
+    def _respond(self, command: Dict[str, Any], status: str,
+                 result: Optional[Dict[str, Any]] = None, error: Optional[str] = None):
+        response = {
+            'id': command.get('id'),
+            'command': command.get('command'),
+            'status': status,
+            'timestamp': int(time.time() * 1000)
+        }
+        if result is not None:
+            response['result'] = result
+        if error is not None:
+            response['error'] = error
+
+        try:
+            self.responder(response)
+        except Exception as e:
+            logger.error(f"Failed to send command response: {e}")
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get executed/failed/rejected counts and queue depth"""
+        return {
+            'executed': self.executed,
+            'failed': self.failed,
+            'rejected': self.rejected,
+            'queued': self._queue.qsize()
+        }
@@ -0,0 +1,172 @@
+"""
+Report-by-exception filtering of sensor readings
+Publish a metric only when it moves beyond its deadband, plus a heartbeat
+"""
+
+from typing import Any, Dict, List, Sequence, Tuple
+
+from sensors.reading import Reading
+
+
+class Deadband:
+    """Absolute and/or percent change threshold of one metric"""
+
+    __slots__ = ('absolute', 'percent')
+
+    def __init__(self, absolute: float = 0.0, percent: float = 0.0):
+        if absolute < 0 or percent < 0:
+            raise ValueError(f"Invalid deadband: absolute={absolute}, percent={percent}")
+        self.absolute = float(absolute)
+        self.percent = float(percent)
+
+    def exceeded(self, reference: Any, value: Any) -> bool:
+        """
+        Check whether a value moved beyond the deadband
+
+        The band is the wider of the absolute and the percent threshold
+        (percent of the reference value), so a metric configured with both
+        uses the absolute band near zero and the relative band at large
+        values. Non-numeric values pass on any change.
+
+        Args:
+            reference: Last published value
+            value: New value
+
+        Returns:
+            True if the value must be published
+        """
+        if isinstance(value, (str, bool)) or isinstance(reference, (str, bool)):
+            return value != reference
+
+        band = max(self.absolute, abs(reference) * self.percent / 100.0)
+        if band == 0.0:
+            return value != reference
+        return abs(value - reference) > band
+
+    def describe(self) -> Dict[str, float]:
+        """Get the description used in the birth catalog"""
+        described = {}
+        if self.absolute:
+            described['absolute'] = self.absolute
+        if self.percent:
+            described['percent'] = self.percent
+        return described
+
+
+class DeadbandFilter:
+    """
+    Report-by-exception filter for one sensor
+
+    Each configured metric is compared with the value it last published;
+    it is published again only when it moves beyond its deadband, or when
+    it has been silent for ``max_silence`` seconds (heartbeat). A consumer
+    can therefore rebuild the signal as a step function (hold the last
+    value until the next sample) that stays within the deadband of the
+    real signal, and treat a metric as dead once it has been silent for
+    longer than ``max_silence``.
+
+    Metrics without a configured deadband are always published.
+    """
+
+    def __init__(self, deadbands: Dict[str, Deadband], max_silence: float = 300):
+        """
+        Initialize filter
+
+        Args:
+            deadbands: Metric key (e.g. "temperature") -> Deadband
+            max_silence: Longest time a metric may go unpublished (seconds)
+        """
+        if max_silence <= 0:
+            raise ValueError(f"Invalid max_silence: {max_silence}")
+
+        self.deadbands = deadbands
+        self.max_silence = max_silence
+        self.max_silence_ms = int(max_silence * 1000)
+
+        # Metric key -> (value, timestamp) of the last published sample
+        self._published: Dict[str, Tuple[Any, int]] = {}
+        self.passed = 0
+        self.suppressed = 0
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> 'DeadbandFilter':
+        """
+        Build a filter from a sensor's ``deadband`` config section
+
+        Args:
+            config: Dict with max_silence and metrics
+                    ({key: {absolute: x, percent: y}})
+
+        Returns:
+            Configured filter
+        """
+        deadbands = {}
+        for key, band in (config.get('metrics') or {}).items():
+            band = band or {}
+            deadbands[key] = Deadband(
+                absolute=band.get('absolute', 0.0),
+                percent=band.get('percent', 0.0)
+            )
+        return cls(deadbands, max_silence=config.get('max_silence', 300))
+
+    def filter(self, readings: Sequence[Reading]) -> List[Reading]:
+        """
+        Drop readings that stayed within their deadband
+
+        Args:
+            readings: Readings of one read cycle
+
+        Returns:
+            Readings that must be published
+        """
+        result = []
+        for reading in readings:
+            key = reading.spec.key
+            deadband = self.deadbands.get(key)
+            if deadband is None or reading.value is None:
+                result.append(reading)
+                continue
+
+            last = self._published.get(key)
+            if (last is None
+                    or reading.timestamp - last[1] >= self.max_silence_ms
+                    or deadband.exceeded(last[0], reading.value)):
+                self._published[key] = (reading.value, reading.timestamp)
+                result.append(reading)
+                self.passed += 1
+            else:
+                self.suppressed += 1
+
+        return result
+
+    def reset(self):
+        """Forget published values so the next cycle is published in full"""
+        self._published.clear()
+
+    def describe(self, metrics: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Add deadband and max_silence to the descriptions of filtered metrics
+
+        Args:
+            metrics: Metric descriptions (name, unit, resolution)
+
+        Returns:
+            Descriptions with report-by-exception details
+        """
+        described = []
+        for metric in metrics:
+            key = metric['name'].split('/', 1)[-1]
+            deadband = self.deadbands.get(key)
+            if deadband is not None:
+                metric = dict(metric, deadband=deadband.describe(), max_silence=self.max_silence)
+            described.append(metric)
+        return described
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get passed/suppressed sample counts"""
+        total = self.passed + self.suppressed
+        return {
+            'passed': self.passed,
+            'suppressed': self.suppressed,
+            'suppressed_ratio': round(self.suppressed / total, 3) if total else 0.0
+        }
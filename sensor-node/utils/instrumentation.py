@@ -0,0 +1,258 @@
+"""
+Lightweight hot-path instrumentation for SmartSense Sensor Node
+Counters, gauges and fixed-bucket log-linear histograms
+"""
+
+import math
+import threading
+from bisect import bisect_left as _bisect_left
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+def _label_key(labels: Dict[str, str]) -> Tuple[Tuple[str, str], ...]:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def format_name(name: str, labels: Tuple[Tuple[str, str], ...]) -> str:
+    """Format an instrument name with its labels, e.g. read_seconds{sensor="BME680"}"""
+    if not labels:
+        return name
+    return name + '{' + ','.join(f'{k}="{v}"' for k, v in labels) + '}'
+
+
+class Counter:
+    """Monotonic counter"""
+
+    __slots__ = ('name', 'labels', 'help', 'value')
+
+    kind = 'counter'
+
+    def __init__(self, name: str, labels: Tuple[Tuple[str, str], ...] = (), help: str = ''):
+        self.name = name
+        self.labels = labels
+        self.help = help
+        self.value = 0
+
+    def inc(self, amount: int = 1):
+        self.value += amount
+
+
+class Gauge:
+    """Gauge read from a callback when exported (no cost on the hot path)"""
+
+    __slots__ = ('name', 'labels', 'help', 'func')
+
+    kind = 'gauge'
+
+    def __init__(self, name: str, func: Callable[[], float],
+                 labels: Tuple[Tuple[str, str], ...] = (), help: str = ''):
+        self.name = name
+        self.labels = labels
+        self.help = help
+        self.func = func
+
+    @property
+    def value(self) -> Optional[float]:
+        try:
+            return self.func()
+        except Exception:
+            return None
+
+
+class Histogram:
+    """
+    Fixed-bucket log-linear histogram
+
+    Every power of two above ``lowest`` is split into ``sub_buckets`` linear
+    buckets (4 by default, i.e. at most 25% relative bucket width), HDR
+    style. The bucket bounds are computed once; observe() is a single
+    bisect over them (in C) plus two updates, so it costs a few hundred
+    nanoseconds and never allocates. Bucket i counts values <= bound i
+    (Prometheus ``le`` semantics); values beyond the top octave land in the
+    +inf bucket.
+
+    Updates are not locked: a concurrent observer may very rarely lose an
+    increment, which is acceptable for diagnostics.
+    """
+
+    __slots__ = ('name', 'labels', 'help', 'unit', 'bounds', 'buckets', 'sum', 'max')
+
+    kind = 'histogram'
+
+    def __init__(self, name: str, labels: Tuple[Tuple[str, str], ...] = (), help: str = '',
+                 unit: str = 'seconds', lowest: float = 1e-6, octaves: int = 24,
+                 sub_buckets: int = 4):
+        """
+        Initialize histogram
+
+        Args:
+            name: Instrument name
+            labels: Sorted (label, value) pairs
+            help: Description
+            unit: Unit of the observed values
+            lowest: Upper bound of the first bucket
+            octaves: Number of powers of two covered above ``lowest``
+            sub_buckets: Linear buckets per power of two
+        """
+        self.name = name
+        self.labels = labels
+        self.help = help
+        self.unit = unit
+        self.bounds = [lowest] + [
+            lowest * (2 ** octave) * (1 + (sub + 1) / sub_buckets)
+            for octave in range(octaves)
+            for sub in range(sub_buckets)
+        ]
+        self.buckets = [0] * (len(self.bounds) + 1)
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float):
+        """Record one value"""
+        self.sum += value
+        if value > self.max:
+            self.max = value
+        self.buckets[_bisect_left(self.bounds, value)] += 1
+
+    @property
+    def count(self) -> int:
+        """Number of observations"""
+        return sum(self.buckets)
+
+    def upper_bounds(self) -> List[float]:
+        """Upper bound of every bucket (the last one is +inf)"""
+        return self.bounds + [math.inf]
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        Estimate a quantile (upper bound of the bucket holding it)
+
+        Args:
+            q: Quantile between 0 and 1
+
+        Returns:
+            Estimated value (never above the observed maximum), or None
+        """
+        buckets = list(self.buckets)
+        count = sum(buckets)
+        if not count:
+            return None
+
+        rank = q * count
+        seen = 0
+        for bound, n in zip(self.bounds, buckets):
+            seen += n
+            if seen >= rank:
+                return min(bound, self.max)
+        return self.max
+
+    def summary(self) -> Dict[str, Any]:
+        """Count, sum, mean, p50/p90/p99 and max"""
+        count = self.count
+        if not count:
+            return {'count': 0}
+        return {
+            'count': count,
+            'sum': self.sum,
+            'mean': self.sum / count,
+            'p50': self.quantile(0.5),
+            'p90': self.quantile(0.9),
+            'p99': self.quantile(0.99),
+            'max': self.max
+        }
+
+
+# Bucket layouts used by the node
+LATENCY = {'unit': 'seconds', 'lowest': 1e-6, 'octaves': 24}   # 1 us .. ~17 s
+SIZE = {'unit': 'bytes', 'lowest': 16, 'octaves': 16}           # 16 B .. 1 MB
+
+
+class Registry:
+    """
+    Collection of instruments
+
+    Instruments are created once (typically in a constructor) and then
+    updated directly, so the hot path never looks anything up. Asking again
+    for the same name and labels returns the existing instrument.
+    """
+
+    def __init__(self):
+        self._instruments: Dict[Tuple[str, Tuple[Tuple[str, str], ...]], Any] = {}
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, name: str, labels: Dict[str, str], factory):
+        key = (name, _label_key(labels))
+        with self._lock:
+            instrument = self._instruments.get(key)
+            if instrument is None:
+                instrument = factory(key[1])
+                self._instruments[key] = instrument
+            return instrument
+
+    def counter(self, name: str, help: str = '', **labels) -> Counter:
+        """Get or create a counter"""
+        return self._get_or_create(name, labels, lambda key: Counter(name, key, help))
+
+    def histogram(self, name: str, help: str = '', layout: Optional[Dict[str, Any]] = None,
+                  **labels) -> Histogram:
+        """
+        Get or create a histogram
+
+        Args:
+            name: Instrument name
+            help: Description
+            layout: Bucket layout (LATENCY by default, or SIZE)
+            **labels: Label values (e.g. sensor="BME680")
+        """
+        return self._get_or_create(
+            name, labels, lambda key: Histogram(name, key, help, **(layout or LATENCY))
+        )
+
+    def gauge(self, name: str, func: Callable[[], float], help: str = '', **labels) -> Gauge:
+        """Register a callback gauge (replaces an existing one)"""
+        gauge = Gauge(name, func, _label_key(labels), help)
+        with self._lock:
+            self._instruments[(name, gauge.labels)] = gauge
+        return gauge
+
+    def remove(self, name: str, **labels):
+        """Remove an instrument (e.g. a gauge whose source was closed)"""
+        with self._lock:
+            self._instruments.pop((name, _label_key(labels)), None)
+
+    def find(self, name: str) -> List[Any]:
+        """Get every instrument with the given name (any labels)"""
+        with self._lock:
+            return [instrument for (key, _), instrument in sorted(self._instruments.items())
+                    if key == name]
+
+    def value(self, name: str, default: Any = 0, **labels) -> Any:
+        """Get the value of a counter or gauge (default if not registered)"""
+        with self._lock:
+            instrument = self._instruments.get((name, _label_key(labels)))
+        return default if instrument is None else instrument.value
+
+    def collect(self) -> List[Any]:
+        """Get all instruments, sorted by name and labels"""
+        with self._lock:
+            return [self._instruments[key] for key in sorted(self._instruments)]
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Export every instrument in one dict
+
+        Returns:
+            ``name{labels}`` -> counter/gauge value or histogram summary
+        """
+        result = {}
+        for instrument in self.collect():
+            key = format_name(instrument.name, instrument.labels)
+            if instrument.kind == 'histogram':
+                result[key] = instrument.summary()
+            else:
+                result[key] = instrument.value
+        return result
+
+
+# Process-wide registry (like logging.getLogger, shared by all modules)
+REGISTRY = Registry()
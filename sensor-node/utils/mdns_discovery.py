@@ -3,14 +3,21 @@ mDNS Service Discovery
 Auto-discover SmartSense server on local network
 """
 
+import json
 import logging
-import time
-from typing import Optional, Dict
+import os
+import socket
+import threading
+from pathlib import Path
+from typing import Callable, List, Optional, Dict
 
 try:
     from zeroconf import ServiceBrowser, ServiceListener, Zeroconf
     MDNS_AVAILABLE = True
 except ImportError:
+    # Placeholders so the module (and the cached-server path) still loads
+    ServiceBrowser = Zeroconf = None
+    ServiceListener = object
     MDNS_AVAILABLE = False
 
 logger = logging.getLogger("smartsense.mdns")
@@ -19,9 +26,17 @@ logger = logging.getLogger("smartsense.mdns")
 class SmartSenseServiceListener(ServiceListener):
     """Listener for SmartSense server discovery"""
 
-    def __init__(self):
+    def __init__(self, on_found: Optional[Callable[[Dict], None]] = None):
+        """
+        Initialize listener
+
+        Args:
+            on_found: Called (on the zeroconf thread) with the server info
+                      whenever the service is added or updated
+        """
         self.server_info: Optional[Dict] = None
-        self.found = False
+        self.found = threading.Event()
+        self.on_found = on_found
 
     def add_service(self, zc: Zeroconf, type_: str, name: str) -> None:
         info = zc.get_service_info(type_, name)
@@ -38,32 +53,68 @@ class SmartSenseServiceListener(ServiceListener):
                     'mqtt_port': info.properties.get(b'mqtt_port', b'1883').decode(),
                     'api_port': info.properties.get(b'api_port', b'3000').decode(),
                 }
-                self.found = True
+                self.found.set()
                 logger.info(f"Server address: {self.server_info['address']}")
                 logger.info(f"MQTT port: {self.server_info['mqtt_port']}")
 
+                if self.on_found:
+                    self.on_found(dict(self.server_info))
+
     def remove_service(self, zc: Zeroconf, type_: str, name: str) -> None:
+        # Keep the last address: a restarting server comes back the same way
         logger.info(f"SmartSense server removed: {name}")
-        if self.server_info and self.server_info['name'] == name:
-            self.server_info = None
-            self.found = False
 
     def update_service(self, zc: Zeroconf, type_: str, name: str) -> None:
-        pass
+        # Address or port records changed: resolve again
+        self.add_service(zc, type_, name)
 
 
 class ServiceDiscovery:
     """
     mDNS Service Discovery for SmartSense server
+
+    The last discovered server is saved to disk. discover() first probes it
+    with a TCP connect to its MQTT port and only browses mDNS when the probe
+    fails. With tracking enabled the ServiceBrowser stays open after
+    discovery, and listeners are told when the server's address or MQTT
+    port changes (e.g. a new DHCP lease), so the MQTT client can follow it.
     """
 
     SERVICE_TYPE = "_smartsense._tcp.local."
 
-    def __init__(self):
+    def __init__(self, cache_path: Optional[str] = "data/server.json", track: bool = True,
+                 probe_timeout: float = 1.0):
+        """
+        Initialize service discovery
+
+        Args:
+            cache_path: File holding the last known server (None to disable)
+            track: Keep browsing after discovery and report server changes
+            probe_timeout: TCP connect timeout for the cached server
+        """
         self.zeroconf: Optional[Zeroconf] = None
         self.browser: Optional[ServiceBrowser] = None
         self.listener: Optional[SmartSenseServiceListener] = None
 
+        self.cache_path = Path(cache_path) if cache_path else None
+        self.track = track
+        self.probe_timeout = probe_timeout
+        self.server_info: Optional[Dict] = None
+        self._listeners: List[Callable[[Dict], None]] = []
+        self._lock = threading.Lock()
+
+    def add_listener(self, listener: Callable[[Dict], None]):
+        """
+        Register a callback for server address changes
+
+        Listeners are called from the zeroconf thread with the new server
+        info and must not block.
+
+        Args:
+            listener: Callable taking the server info dict
+        """
+        self._listeners.append(listener)
+
     def discover(self, timeout: int = 10) -> Optional[Dict]:
         """
         Discover SmartSense server on local network
@@ -74,41 +125,141 @@ class ServiceDiscovery:
         Returns:
             Server information dict or None
         """
+        cached = self.load_cached()
+        if cached and self.probe(cached):
+            logger.info(f"Using last known server {cached['address']}:{cached['mqtt_port']}")
+            self.server_info = cached
+            if self.track:
+                self._start_browser()
+            return cached
+
         if not MDNS_AVAILABLE:
             logger.error("mDNS not available. Install: pip install zeroconf")
-            return None
+            return cached
 
         try:
             logger.info("Starting SmartSense server discovery...")
+            if not self._start_browser():
+                return cached
+
+            # Wait for discovery
+            if self.listener.found.wait(timeout):
+                logger.info("Server discovered successfully")
+                return self.server_info
+
+            logger.warning("Server discovery timeout")
+            if cached:
+                # Not answering right now; keep trying it in the background
+                logger.warning(f"Falling back to last known server {cached['address']}")
+                self.server_info = cached
+                return cached
+            return None
+
+        except Exception as e:
+            logger.error(f"Discovery failed: {e}")
+            return cached
+
+        finally:
+            if not self.track:
+                self.close()
+
+    def _start_browser(self) -> bool:
+        """Open the zeroconf instance and browser (kept open when tracking)"""
+        if not MDNS_AVAILABLE:
+            return False
+        if self.browser:
+            return True
 
+        try:
             self.zeroconf = Zeroconf()
-            self.listener = SmartSenseServiceListener()
+            self.listener = SmartSenseServiceListener(on_found=self._on_found)
             self.browser = ServiceBrowser(
                 self.zeroconf,
                 self.SERVICE_TYPE,
                 self.listener
             )
+            return True
+        except Exception as e:
+            logger.error(f"Failed to start mDNS browser: {e}")
+            self.close()
+            return False
 
-            # Wait for discovery
-            start_time = time.time()
-            while time.time() - start_time < timeout:
-                if self.listener.found:
-                    logger.info("Server discovered successfully")
-                    return self.listener.server_info
-                time.sleep(0.5)
+    def _on_found(self, server_info: Dict):
+        """Listener callback: remember the server and report address changes"""
+        with self._lock:
+            previous = self.server_info
+            self.server_info = server_info
+            changed = previous is not None and (
+                (previous['address'], str(previous['mqtt_port']))
+                != (server_info['address'], str(server_info['mqtt_port']))
+            )
 
-            logger.warning("Server discovery timeout")
-            return None
+        self._save_cache(server_info)
 
-        except Exception as e:
-            logger.error(f"Discovery failed: {e}")
+        if changed:
+            logger.info(f"Server moved to {server_info['address']}:{server_info['mqtt_port']}")
+            for listener in self._listeners:
+                try:
+                    listener(dict(server_info))
+                except Exception as e:
+                    logger.error(f"Discovery listener failed: {e}")
+
+    def probe(self, server_info: Dict) -> bool:
+        """
+        Check that a server accepts TCP connections on its MQTT port
+
+        Args:
+            server_info: Server information dict
+
+        Returns:
+            True if the connection succeeded within probe_timeout
+        """
+        try:
+            address = (server_info['address'], int(server_info['mqtt_port']))
+            with socket.create_connection(address, timeout=self.probe_timeout):
+                return True
+        except (OSError, KeyError, ValueError) as e:
+            logger.info(f"Last known server not reachable: {e}")
+            return False
+
+    def load_cached(self) -> Optional[Dict]:
+        """
+        Load the last known server
+
+        Returns:
+            Server information dict or None
+        """
+        if not self.cache_path or not self.cache_path.exists():
             return None
 
-        finally:
-            self.close()
+        try:
+            with open(self.cache_path) as f:
+                server_info = json.load(f)
+            if server_info.get('address') and server_info.get('mqtt_port'):
+                return server_info
+        except (OSError, ValueError, AttributeError) as e:
+            logger.warning(f"Ignoring unreadable server cache: {e}")
+        return None
+
+    def _save_cache(self, server_info: Dict):
+        """Write the server info atomically (temp file + rename)"""
+        if not self.cache_path:
+            return
+
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = self.cache_path.with_suffix('.tmp')
+            with open(tmp_file, 'w') as f:
+                json.dump(server_info, f, indent=2)
+            os.replace(tmp_file, self.cache_path)
+        except OSError as e:
+            logger.warning(f"Failed to save server cache: {e}")
 
     def close(self):
         """Clean up resources"""
+        if self.browser:
+            self.browser.cancel()
+            self.browser = None
         if self.zeroconf:
             self.zeroconf.close()
             self.zeroconf = None
@@ -0,0 +1,287 @@
+"""
+HTTP metrics endpoint for SmartSense Sensor Node
+Serves the latest readings and internal counters for Prometheus and tools
+"""
+
+import json
+import logging
+import math
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .instrumentation import REGISTRY
+
+logger = logging.getLogger("smartsense.metrics")
+
+OPENMETRICS_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+JSON_TYPE = "application/json"
+PREFIX = "smartsense_"
+
+
+class LatestReadings:
+    """
+    Latest sample of every metric, with a version bumped on each update
+
+    update() is called on the read path and only stores references to the
+    Reading records; rendering happens on request.
+    """
+
+    def __init__(self):
+        self._readings: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+        self.version = 0
+
+    def update(self, readings: Iterable[Any]):
+        """
+        Store new samples
+
+        Args:
+            readings: Readings of one read cycle
+        """
+        with self._lock:
+            for reading in readings:
+                self._readings[reading.spec.name] = reading
+            self.version += 1
+
+    def snapshot(self) -> Tuple[int, List[Any]]:
+        """Get the version and the latest readings, sorted by name"""
+        with self._lock:
+            return self.version, [self._readings[name] for name in sorted(self._readings)]
+
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(pairs: Iterable[Tuple[str, Any]]) -> str:
+    text = ','.join(f'{key}="{_escape(value)}"' for key, value in pairs)
+    return '{' + text + '}' if text else ''
+
+
+def _number(value: float) -> str:
+    if value == math.inf:
+        return '+Inf'
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+def _bound(value: float) -> str:
+    # Bucket bounds are products of binary fractions; drop the float noise
+    return '+Inf' if value == math.inf else format(value, '.6g')
+
+
+def render_openmetrics(node_id: str, readings: List[Any], instruments: List[Any]) -> str:
+    """
+    Render readings and instruments in the OpenMetrics text format
+
+    Args:
+        node_id: Node ID (label on every reading)
+        readings: Latest readings
+        instruments: Instruments from the registry
+
+    Returns:
+        Exposition text ending with "# EOF"
+    """
+    lines = [
+        f"# TYPE {PREFIX}node info",
+        f"# HELP {PREFIX}node SmartSense sensor node",
+        f"{PREFIX}node_info{_labels([('node_id', node_id)])} 1",
+        f"# TYPE {PREFIX}reading gauge",
+        f"# HELP {PREFIX}reading Latest sensor reading"
+    ]
+    for reading in readings:
+        value = reading.value
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            continue  # text values (e.g. grades) are only in /readings.json
+        spec = reading.spec
+        sensor = spec.name[:-len(spec.key) - 1]
+        labels = _labels([('node_id', node_id), ('sensor', sensor),
+                          ('metric', spec.key), ('unit', spec.unit)])
+        lines.append(f"{PREFIX}reading{labels} {_number(value)}")
+
+    family = None
+    for instrument in instruments:
+        name = PREFIX + instrument.name
+        if instrument.kind == 'counter' and name.endswith('_total'):
+            name = name[:-len('_total')]
+
+        if name != family:
+            family = name
+            lines.append(f"# TYPE {name} {instrument.kind}")
+            if instrument.help:
+                lines.append(f"# HELP {name} {instrument.help}")
+
+        labels = list(instrument.labels)
+        if instrument.kind == 'counter':
+            lines.append(f"{name}_total{_labels(labels)} {instrument.value}")
+        elif instrument.kind == 'gauge':
+            value = instrument.value
+            if value is not None:
+                lines.append(f"{name}{_labels(labels)} {_number(value)}")
+        else:
+            cumulative = 0
+            for bound, count in zip(instrument.upper_bounds(), list(instrument.buckets)):
+                cumulative += count
+                lines.append(f"{name}_bucket{_labels(labels + [('le', _bound(bound))])} {cumulative}")
+            lines.append(f"{name}_count{_labels(labels)} {cumulative}")
+            lines.append(f"{name}_sum{_labels(labels)} {_number(instrument.sum)}")
+
+    lines.append("# EOF")
+    return '\n'.join(lines) + '\n'
+
+
+def render_json(node_id: str, readings: List[Any], version: int) -> str:
+    """Render the latest readings like the "sensors" field of a data message"""
+    return json.dumps({
+        'node_id': node_id,
+        'timestamp': int(time.time() * 1000),
+        'version': version,
+        'sensors': {
+            reading.spec.name: {
+                'value': reading.value,
+                'unit': reading.spec.unit,
+                'timestamp': reading.timestamp
+            }
+            for reading in readings
+        }
+    }, ensure_ascii=False)
+
+
+class MetricsHandler(BaseHTTPRequestHandler):
+    """HTTP request handler for /metrics and /readings.json"""
+
+    server: 'MetricsServer'
+
+    def log_message(self, format, *args):
+        """Override to use our logger"""
+        logger.debug(format % args)
+
+    def do_GET(self):
+        """Handle GET requests"""
+        path = self.path.split('?', 1)[0]
+        if path not in MetricsServer.ROUTES:
+            self.send_error(404)
+            return
+
+        version, body = self.server.metrics.render(path)
+        etag = f'"{version}"'
+        if self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", MetricsServer.ROUTES[path])
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", etag)
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class MetricsServer:
+    """
+    Threaded HTTP endpoint serving /metrics (OpenMetrics) and /readings.json
+
+    Rendered responses are cached per path together with the readings
+    version they were built from, and rebuilt only after a new sample
+    arrives. Scrapes between two reads (any number of Prometheus servers,
+    dashboards, curl) reuse the cached bytes, so serving costs about one
+    socket write. Counters in /metrics are therefore as fresh as the latest
+    sample. Responses carry the version as ETag; a matching If-None-Match
+    gets 304 Not Modified.
+    """
+
+    ROUTES = {
+        '/metrics': OPENMETRICS_TYPE,
+        '/readings.json': JSON_TYPE
+    }
+
+    def __init__(self, readings: LatestReadings, node_id: str,
+                 host: str = '0.0.0.0', port: int = 9108):
+        """
+        Initialize metrics server
+
+        Args:
+            readings: Latest readings store
+            node_id: Node ID (label / field in the responses)
+            host: Bind address
+            port: TCP port
+        """
+        self.readings = readings
+        self.node_id = node_id
+        self.host = host
+        self.port = port
+        self.server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+        self._cache: Dict[str, Tuple[int, bytes]] = {}
+        self._lock = threading.Lock()
+
+        self.renders = 0
+        self.cache_hits = 0
+
+    def render(self, path: str) -> Tuple[int, bytes]:
+        """
+        Get the response body for a path (cached per readings version)
+
+        Args:
+            path: '/metrics' or '/readings.json'
+
+        Returns:
+            (version, body)
+        """
+        with self._lock:
+            version = self.readings.version
+            cached = self._cache.get(path)
+            if cached and cached[0] == version:
+                self.cache_hits += 1
+                return cached
+
+            version, readings = self.readings.snapshot()
+            if path == '/metrics':
+                text = render_openmetrics(self.node_id, readings, REGISTRY.collect())
+            else:
+                text = render_json(self.node_id, readings, version)
+
+            cached = (version, text.encode('utf-8'))
+            self._cache[path] = cached
+            self.renders += 1
+            return cached
+
+    def start(self) -> bool:
+        """
+        Start serving on a background thread
+
+        Returns:
+            True if the server is listening
+        """
+        try:
+            self.server = ThreadingHTTPServer((self.host, self.port), MetricsHandler)
+        except OSError as e:
+            logger.error(f"Failed to start metrics server on port {self.port}: {e}")
+            return False
+
+        self.server.daemon_threads = True
+        self.server.metrics = self
+        self._thread = threading.Thread(
+            target=self.server.serve_forever,
+            name="metrics-http",
+            daemon=True
+        )
+        self._thread.start()
+        logger.info(f"Metrics endpoint on http://{self.host}:{self.port}/metrics")
+        return True
+
+    def stop(self):
+        """Stop the server"""
+        if self.server:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+            logger.info("Metrics server stopped")
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get render and cache hit counts"""
+        return {'renders': self.renders, 'cache_hits': self.cache_hits}
@@ -1,245 +1,472 @@
 """
 Network connectivity checker
+
+Reads interface state from sysfs and ioctls instead of forking `cat`, `ip`
+or `iwgetid`, and follows link/address changes through a netlink route
+socket, so connectivity checks are cache lookups.
 """
 
+import array
 import logging
-import subprocess
 import platform
-from typing import Optional, Dict
+import socket
+import struct
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+try:
+    import fcntl
+    FCNTL_AVAILABLE = True
+except ImportError:
+    FCNTL_AVAILABLE = False
 
 logger = logging.getLogger("smartsense.network")
 
+# ioctl requests (linux/sockios.h, linux/wireless.h)
+SIOCGIFADDR = 0x8915
+SIOCGIWESSID = 0x8B1B
+SIOCGIWRATE = 0x8B21
+IW_ESSID_MAX_SIZE = 32
 
-class NetworkChecker:
+# rtnetlink multicast groups and message types (linux/rtnetlink.h)
+RTMGRP_LINK = 0x1
+RTMGRP_IPV4_IFADDR = 0x10
+RTM_NEWLINK = 16
+RTM_DELLINK = 17
+RTM_NEWADDR = 20
+RTM_DELADDR = 21
+NLMSG_HEADER = struct.Struct('=IHHII')  # length, type, flags, seq, pid
+
+NO_CONNECTION = {'type': 'none', 'ip': None, 'interface': None}
+
+
+def read_operstate(interface: str) -> Optional[str]:
     """
-    Check network connectivity (Ethernet and WiFi)
+    Read the operational state of an interface from sysfs
+
+    Args:
+        interface: Interface name (e.g. eth0)
+
+    Returns:
+        'up', 'down', 'dormant', ... or None if the interface does not exist
     """
+    try:
+        with open(f"/sys/class/net/{interface}/operstate") as f:
+            return f.read().strip()
+    except OSError:
+        return None
 
-    @staticmethod
-    def is_ethernet_connected() -> bool:
-        """
-        Check if Ethernet (eth0) is connected
 
-        Returns:
-            True if Ethernet is connected and has IP
-        """
-        # Skip on non-Linux platforms
-        if platform.system() != 'Linux':
-            logger.debug("Ethernet check skipped on non-Linux platform")
-            return False
+def get_interface_ip(interface: str) -> Optional[str]:
+    """
+    Get the IPv4 address of an interface (SIOCGIFADDR)
 
-        try:
-            # Check if eth0 exists and is up
-            result = subprocess.run(
-                ["cat", "/sys/class/net/eth0/operstate"],
-                capture_output=True,
-                text=True,
-                timeout=2
-            )
-
-            if result.returncode != 0:
-                logger.debug("Ethernet interface not found")
-                return False
-
-            state = result.stdout.strip()
-            if state != "up":
-                logger.debug(f"Ethernet state: {state}")
-                return False
-
-            # Check if it has an IP address
-            ip = NetworkChecker.get_ethernet_ip()
-            if ip:
-                logger.info(f"Ethernet connected: {ip}")
-                return True
+    Args:
+        interface: Interface name
 
-            return False
+    Returns:
+        IP address or None
+    """
+    if not FCNTL_AVAILABLE:
+        return None
 
-        except Exception as e:
-            logger.debug(f"Ethernet check error: {e}")
-            return False
+    request = struct.pack('256s', interface.encode()[:15])
+    try:
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+            data = fcntl.ioctl(sock.fileno(), SIOCGIFADDR, request)
+    except OSError:
+        # No address assigned (EADDRNOTAVAIL) or no such interface
+        return None
+    return socket.inet_ntoa(data[20:24])
 
-    @staticmethod
-    def get_ethernet_ip() -> Optional[str]:
-        """
-        Get Ethernet IP address
 
-        Returns:
-            IP address or None
-        """
-        if platform.system() != 'Linux':
-            return None
+def get_wifi_ssid(interface: str) -> Optional[str]:
+    """
+    Get the SSID a wireless interface is associated with (SIOCGIWESSID)
 
-        try:
-            result = subprocess.run(
-                ["ip", "-4", "addr", "show", "eth0"],
-                capture_output=True,
-                text=True,
-                timeout=2
-            )
-
-            if result.returncode != 0:
-                return None
-
-            # Parse IP address from output
-            for line in result.stdout.split('\n'):
-                if 'inet ' in line:
-                    ip = line.strip().split()[1].split('/')[0]
-                    return ip
+    Args:
+        interface: Wireless interface name
 
-            return None
+    Returns:
+        SSID or None if not associated
+    """
+    if not FCNTL_AVAILABLE:
+        return None
+
+    # struct iwreq: name[16] + struct iw_point {pointer, length, flags}
+    essid = array.array('B', bytes(IW_ESSID_MAX_SIZE + 1))
+    address, _ = essid.buffer_info()
+    request = struct.pack('16sPHH', interface.encode()[:15], address, len(essid), 0)
+    request += bytes(64 - len(request))
+    try:
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+            data = fcntl.ioctl(sock.fileno(), SIOCGIWESSID, request)
+    except OSError:
+        return None
+
+    length = struct.unpack_from('H', data, 16 + struct.calcsize('P'))[0]
+    ssid = essid.tobytes()[:length].rstrip(b'\0')
+    return ssid.decode('utf-8', 'replace') if ssid else None
+
+
+def get_wifi_bitrate(interface: str) -> Optional[int]:
+    """
+    Get the current transmit bitrate of a wireless interface (SIOCGIWRATE)
 
-        except Exception as e:
-            logger.debug(f"Failed to get Ethernet IP: {e}")
-            return None
+    Args:
+        interface: Wireless interface name
 
-    @staticmethod
-    def is_wifi_connected() -> bool:
-        """
-        Check if WiFi (wlan0) is connected
+    Returns:
+        Bitrate in bit/s or None
+    """
+    if not FCNTL_AVAILABLE:
+        return None
 
-        Returns:
-            True if WiFi is connected
-        """
-        if platform.system() != 'Linux':
-            logger.debug("WiFi check skipped on non-Linux platform")
-            return False
+    # struct iwreq: name[16] + struct iw_param {value, fixed, disabled, flags}
+    request = struct.pack('16s', interface.encode()[:15]) + bytes(48)
+    try:
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+            data = fcntl.ioctl(sock.fileno(), SIOCGIWRATE, request)
+    except OSError:
+        return None
 
+    bitrate = struct.unpack_from('i', data, 16)[0]
+    return bitrate if bitrate > 0 else None
+
+
+def read_wireless_quality(interface: str) -> Optional[Dict[str, int]]:
+    """
+    Read link quality and signal level from /proc/net/wireless
+
+    Args:
+        interface: Wireless interface name
+
+    Returns:
+        Dict with 'link_quality' and 'signal_dbm', or None
+    """
+    try:
+        with open("/proc/net/wireless") as f:
+            lines = f.readlines()[2:]  # two header lines
+    except OSError:
+        return None
+
+    for line in lines:
+        name, _, values = line.partition(':')
+        if name.strip() != interface:
+            continue
+        fields = values.split()
         try:
-            result = subprocess.run(
-                ["iwgetid", "-r"],
-                capture_output=True,
-                text=True,
-                timeout=2
-            )
-
-            ssid = result.stdout.strip()
-            if ssid:
-                logger.info(f"WiFi connected: {ssid}")
-                return True
+            return {
+                'link_quality': int(float(fields[1].rstrip('.'))),
+                'signal_dbm': int(float(fields[2].rstrip('.')))
+            }
+        except (IndexError, ValueError):
+            return None
+    return None
 
-            return False
 
-        except Exception as e:
-            logger.debug(f"WiFi check error: {e}")
-            return False
+class NetworkChecker:
+    """
+    Check network connectivity (Ethernet and WiFi)
 
-    @staticmethod
-    def get_wifi_ip() -> Optional[str]:
+    Interface state is kept in a cache. start() runs a monitor thread on a
+    netlink route socket that refreshes an interface when its link or IPv4
+    address changes and calls the listeners when the active connection
+    changes; without netlink the monitor falls back to polling. Lookups
+    (get_active_connection, is_connected, ...) never touch the system.
+    """
+
+    def __init__(self, ethernet: str = 'eth0', wifi: str = 'wlan0',
+                 poll_interval: float = 10.0):
         """
-        Get WiFi IP address
+        Initialize network checker
 
-        Returns:
-            IP address or None
+        Args:
+            ethernet: Ethernet interface name (preferred connection)
+            wifi: WiFi interface name
+            poll_interval: Refresh interval when netlink is not available
         """
-        if platform.system() != 'Linux':
-            return None
+        self.ethernet = ethernet
+        self.wifi = wifi
+        self.poll_interval = poll_interval
+        self.supported = platform.system() == 'Linux'
+
+        self._cond = threading.Condition()
+        self._interfaces: Dict[str, Dict[str, Any]] = {}
+        self._connection: Dict[str, Any] = dict(NO_CONNECTION)
+        self._listeners: List[Callable[[Dict[str, Any]], None]] = []
+        self._stop = threading.Event()
+        self._monitor: Optional[threading.Thread] = None
+        self._netlink: Optional[socket.socket] = None
+
+        self.events = 0
+        self.changes = 0
+
+        if not self.supported:
+            logger.debug("Network checks skipped on non-Linux platform")
+        self.refresh()
+
+    def add_listener(self, listener: Callable[[Dict[str, Any]], None]):
+        """
+        Register a callback for active connection changes
 
-        try:
-            result = subprocess.run(
-                ["ip", "-4", "addr", "show", "wlan0"],
-                capture_output=True,
-                text=True,
-                timeout=2
-            )
-
-            if result.returncode != 0:
-                return None
-
-            # Parse IP address from output
-            for line in result.stdout.split('\n'):
-                if 'inet ' in line:
-                    ip = line.strip().split()[1].split('/')[0]
-                    return ip
+        Listeners are called on the monitor thread with the new connection
+        (see get_active_connection) and must not block.
 
-            return None
+        Args:
+            listener: Callable taking the connection dict
+        """
+        self._listeners.append(listener)
+
+    def start(self):
+        """Start the monitor thread (netlink events, or polling as fallback)"""
+        if self._monitor and self._monitor.is_alive():
+            return
+
+        self._stop.clear()
+        if self.supported:
+            try:
+                self._netlink = socket.socket(socket.AF_NETLINK, socket.SOCK_RAW,
+                                              socket.NETLINK_ROUTE)
+                self._netlink.bind((0, RTMGRP_LINK | RTMGRP_IPV4_IFADDR))
+                self._netlink.settimeout(1.0)
+            except (OSError, AttributeError) as e:
+                logger.warning(f"Netlink not available, polling every {self.poll_interval}s: {e}")
+                self._netlink = None
+
+        # Catch changes between the constructor and the subscription
+        self.refresh()
+
+        self._monitor = threading.Thread(
+            target=self._run,
+            name="network-monitor",
+            daemon=True
+        )
+        self._monitor.start()
+
+    def stop(self):
+        """Stop the monitor thread"""
+        self._stop.set()
+        if self._monitor:
+            self._monitor.join(timeout=2)
+            self._monitor = None
+        if self._netlink:
+            self._netlink.close()
+            self._netlink = None
+
+    def refresh(self, interfaces: Optional[List[str]] = None):
+        """
+        Re-read interface state and notify listeners on a change
 
-        except Exception as e:
-            logger.debug(f"Failed to get WiFi IP: {e}")
-            return None
+        Args:
+            interfaces: Interfaces to re-read (default: all)
+        """
+        if not self.supported:
+            return
 
-    @staticmethod
-    def get_active_connection() -> Dict[str, str]:
+        for interface in interfaces or (self.ethernet, self.wifi):
+            state = {
+                'operstate': read_operstate(interface),
+                'ip': get_interface_ip(interface)
+            }
+            if interface == self.wifi:
+                state['ssid'] = get_wifi_ssid(interface) if state['operstate'] == 'up' else None
+            with self._cond:
+                self._interfaces[interface] = state
+
+        self._update()
+
+    def _update(self):
+        with self._cond:
+            connection = self._select_connection()
+            if connection == self._connection:
+                return
+            previous = self._connection
+            self._connection = connection
+            self.changes += 1
+            self._cond.notify_all()
+
+        if connection['type'] != 'none':
+            logger.info(f"Network connected ({connection['type']}): {connection['ip']}")
+        elif previous['type'] != 'none':
+            logger.warning(f"Network connection lost ({previous['interface']})")
+
+        for listener in self._listeners:
+            try:
+                listener(dict(connection))
+            except Exception as e:
+                logger.error(f"Network listener failed: {e}")
+
+    def _select_connection(self) -> Dict[str, Any]:
+        """Called with the lock held: Ethernet first, then WiFi"""
+        ethernet = self._interfaces.get(self.ethernet, {})
+        if ethernet.get('operstate') == 'up' and ethernet.get('ip'):
+            return {'type': 'ethernet', 'ip': ethernet['ip'], 'interface': self.ethernet}
+
+        wifi = self._interfaces.get(self.wifi, {})
+        if wifi.get('ssid') and wifi.get('ip'):
+            return {'type': 'wifi', 'ip': wifi['ip'], 'interface': self.wifi,
+                    'ssid': wifi['ssid']}
+
+        return dict(NO_CONNECTION)
+
+    def _run(self):
+        while not self._stop.is_set():
+            if self._netlink is None:
+                if self._stop.wait(self.poll_interval):
+                    break
+                self.refresh()
+                continue
+
+            try:
+                data = self._netlink.recv(65536)
+            except socket.timeout:
+                continue
+            except OSError as e:
+                if not self._stop.is_set():
+                    logger.error(f"Netlink receive failed: {e}")
+                    self._stop.wait(1.0)
+                continue
+
+            interfaces = self._parse_netlink(data)
+            if interfaces:
+                self.events += 1
+                self.refresh(interfaces)
+
+    def _parse_netlink(self, data: bytes) -> List[str]:
+        """Get the tracked interfaces named in a batch of rtnetlink messages"""
+        tracked = (self.ethernet, self.wifi)
+        changed = set()
+        offset = 0
+        while offset + NLMSG_HEADER.size <= len(data):
+            length, msg_type = NLMSG_HEADER.unpack_from(data, offset)[:2]
+            if length < NLMSG_HEADER.size:
+                break
+
+            if msg_type in (RTM_NEWLINK, RTM_DELLINK, RTM_NEWADDR, RTM_DELADDR):
+                # ifinfomsg and ifaddrmsg both carry the index at byte 4
+                index = struct.unpack_from('=i', data, offset + NLMSG_HEADER.size + 4)[0]
+                try:
+                    name = socket.if_indextoname(index)
+                except OSError:
+                    # Interface already removed: re-read everything
+                    return list(tracked)
+                if name in tracked:
+                    changed.add(name)
+
+            offset += (length + 3) & ~3  # NLMSG_ALIGN
+        return sorted(changed)
+
+    def get_active_connection(self) -> Dict[str, Any]:
         """
-        Get currently active network connection
+        Get currently active network connection (cached)
 
         Returns:
-            Dict with 'type' (ethernet/wifi/none) and 'ip'
+            Dict with 'type' (ethernet/wifi/none), 'ip' and 'interface'
+            ('ssid' as well for WiFi)
         """
-        # Check Ethernet first (preferred)
-        if NetworkChecker.is_ethernet_connected():
-            ip = NetworkChecker.get_ethernet_ip()
-            return {
-                'type': 'ethernet',
-                'ip': ip,
-                'interface': 'eth0'
-            }
+        with self._cond:
+            return dict(self._connection)
+
+    @property
+    def is_connected(self) -> bool:
+        """True if Ethernet or WiFi has an address"""
+        return self._connection['type'] != 'none'
+
+    def is_ethernet_connected(self) -> bool:
+        """Check if Ethernet is up and has an IP (cached)"""
+        return self._connection['type'] == 'ethernet'
+
+    def get_ethernet_ip(self) -> Optional[str]:
+        """Get Ethernet IP address (cached)"""
+        with self._cond:
+            return self._interfaces.get(self.ethernet, {}).get('ip')
+
+    def is_wifi_connected(self) -> bool:
+        """Check if WiFi is associated (cached)"""
+        with self._cond:
+            return bool(self._interfaces.get(self.wifi, {}).get('ssid'))
+
+    def get_wifi_ip(self) -> Optional[str]:
+        """Get WiFi IP address (cached)"""
+        with self._cond:
+            return self._interfaces.get(self.wifi, {}).get('ip')
+
+    def get_wifi_quality(self) -> Optional[Dict[str, int]]:
+        """
+        Get WiFi link quality and signal level
 
-        # Check WiFi
-        if NetworkChecker.is_wifi_connected():
-            ip = NetworkChecker.get_wifi_ip()
-            return {
-                'type': 'wifi',
-                'ip': ip,
-                'interface': 'wlan0'
-            }
+        Read from /proc/net/wireless on each call (one file read); signal
+        changes do not produce netlink events.
 
-        # No connection
-        return {
-            'type': 'none',
-            'ip': None,
-            'interface': None
-        }
+        Returns:
+            Dict with 'link_quality' and 'signal_dbm', or None
+        """
+        if not self.supported:
+            return None
+        return read_wireless_quality(self.wifi)
 
-    @staticmethod
-    def wait_for_network(timeout: int = 30) -> bool:
+    def wait_for_network(self, timeout: float = 30) -> bool:
         """
         Wait for network connection (Ethernet or WiFi)
 
+        Woken by the monitor thread; without a running monitor the state is
+        re-read every 2 seconds.
+
         Args:
             timeout: Maximum wait time in seconds
 
         Returns:
             True if network is available
         """
-        import time
-
         logger.info(f"Waiting for network connection (timeout: {timeout}s)...")
 
-        start_time = time.time()
-        while time.time() - start_time < timeout:
-            connection = NetworkChecker.get_active_connection()
+        deadline = time.monotonic() + timeout
+        while True:
+            monitored = self._monitor is not None and self._monitor.is_alive()
+            remaining = max(0.0, deadline - time.monotonic())
+            with self._cond:
+                available = self._cond.wait_for(lambda: self._connection['type'] != 'none',
+                                                timeout=remaining if monitored else min(remaining, 2.0))
+                connection = dict(self._connection)
 
-            if connection['type'] != 'none':
+            if available:
                 logger.info(f"Network available: {connection['type']} ({connection['ip']})")
                 return True
-
-            time.sleep(2)
+            if time.monotonic() >= deadline:
+                break
+            if not monitored:
+                self.refresh()
 
         logger.warning("Network connection timeout")
         return False
 
     @staticmethod
-    def test_internet_connectivity() -> bool:
+    def test_internet_connectivity(host: str = "8.8.8.8", port: int = 53,
+                                   timeout: float = 2.0) -> bool:
         """
-        Test if internet is accessible (ping Google DNS)
+        Test if internet is accessible (TCP connect to Google DNS)
+
+        Args:
+            host: Host to connect to
+            port: TCP port
+            timeout: Connect timeout in seconds
 
         Returns:
             True if internet is accessible
         """
         try:
-            # Use platform-specific ping command
-            if platform.system() == 'Windows':
-                cmd = ["ping", "-n", "1", "-w", "2000", "8.8.8.8"]
-            else:
-                cmd = ["ping", "-c", "1", "-W", "2", "8.8.8.8"]
-
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                timeout=3
-            )
-            return result.returncode == 0
-
-        except Exception as e:
+            with socket.create_connection((host, port), timeout=timeout):
+                return True
+        except OSError as e:
             logger.debug(f"Internet test failed: {e}")
             return False
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get monitor mode and event/change counts"""
+        return {
+            'monitor': 'netlink' if self._netlink else 'poll',
+            'events': self.events,
+            'changes': self.changes
+        }
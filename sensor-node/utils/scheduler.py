@@ -0,0 +1,257 @@
+"""
+Sensor acquisition scheduler
+Runs each sensor on its own read cadence using a bounded worker pool
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Any, Optional
+
+from .instrumentation import REGISTRY
+
+logger = logging.getLogger("smartsense.scheduler")
+
+
+class ScheduledJob:
+    """Periodic job tracked by the scheduler"""
+
+    def __init__(self, name: str, interval: float, func: Callable[[], None],
+                 first_run: float):
+        self.name = name
+        self.interval = interval
+        self.func = func
+        self.next_run = first_run
+        self.running = False
+        self.runs = 0
+        self.skipped = 0
+        self.missed = 0
+        self.last_lag = 0.0
+
+
+class SensorScheduler:
+    """
+    Per-job cadence scheduler
+
+    Every job (typically one per sensor) has its own interval and is executed
+    on a shared, bounded thread pool. A job that is still running when it
+    becomes due again is skipped for that cycle, so a slow or stuck driver
+    only delays itself and never queues up work for the other sensors.
+
+    Deadlines are kept on the monotonic clock and advanced by exactly one
+    interval per run, so sample times stay phase-locked to the configured
+    interval instead of drifting by the read duration. The loop sleeps until
+    the earliest deadline (or until woken by stop/add/set_interval).
+    """
+
+    # Smoothing factor for the moving average of loop lag
+    LAG_ALPHA = 0.1
+
+    def __init__(self, max_workers: int = 4):
+        """
+        Initialize scheduler
+
+        Args:
+            max_workers: Maximum number of jobs executing concurrently
+        """
+        self.max_workers = max(1, int(max_workers))
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_workers,
+            thread_name_prefix="sensor-read"
+        )
+        self._jobs: Dict[str, ScheduledJob] = {}
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopping = False
+
+        # Loop jitter (how late jobs were dispatched relative to deadline)
+        self._lag_last = 0.0
+        self._lag_max = 0.0
+        self._lag_avg = 0.0
+        self._dispatches = 0
+        self._lag_seconds = REGISTRY.histogram(
+            'scheduler_lag_seconds', 'Delay between a job deadline and its dispatch')
+
+    def add_job(self, name: str, interval: float, func: Callable[[], None],
+                delay: float = 0.0):
+        """
+        Register a periodic job
+
+        Args:
+            name: Unique job name
+            interval: Interval between runs in seconds
+            func: Callable executed on the worker pool
+            delay: Seconds until the first run (0 = due immediately)
+        """
+        if interval <= 0:
+            raise ValueError(f"Invalid interval for {name}: {interval}")
+
+        first_run = time.monotonic() + max(0.0, delay)
+        with self._lock:
+            self._jobs[name] = ScheduledJob(name, float(interval), func, first_run)
+
+        self._wakeup.set()
+        logger.info(f"Scheduled {name} every {interval} seconds")
+
+    def remove_job(self, name: str):
+        """Remove a job (a run already in flight is allowed to finish)"""
+        with self._lock:
+            self._jobs.pop(name, None)
+
+    def set_interval(self, name: str, interval: float) -> bool:
+        """
+        Change the interval of an existing job
+
+        The next deadline is moved so it is one new interval after the
+        previous one, keeping the job's phase.
+
+        Args:
+            name: Job name
+            interval: New interval in seconds
+
+        Returns:
+            True if the job exists and was updated
+        """
+        if interval <= 0:
+            raise ValueError(f"Invalid interval for {name}: {interval}")
+
+        with self._lock:
+            job = self._jobs.get(name)
+            if not job:
+                return False
+            job.next_run = job.next_run - job.interval + interval
+            job.interval = float(interval)
+
+        self._wakeup.set()
+        logger.info(f"Interval for {name} set to {interval} seconds")
+        return True
+
+    def get_jobs(self) -> List[ScheduledJob]:
+        """Get a snapshot of registered jobs"""
+        with self._lock:
+            return list(self._jobs.values())
+
+    def run_pending(self) -> Optional[float]:
+        """
+        Submit every job that is due
+
+        Returns:
+            Monotonic time of the earliest upcoming deadline
+            (or None if no jobs are registered)
+        """
+        now = time.monotonic()
+        next_deadline = None
+
+        with self._lock:
+            for job in self._jobs.values():
+                if now >= job.next_run:
+                    self._dispatch(job, now)
+
+                if next_deadline is None or job.next_run < next_deadline:
+                    next_deadline = job.next_run
+
+        return next_deadline
+
+    def _dispatch(self, job: ScheduledJob, now: float):
+        """Submit a due job and advance its deadline (lock held)"""
+        lag = now - job.next_run
+        job.last_lag = lag
+        self._record_lag(lag)
+
+        # Stay on the original grid; periods that were overrun are counted
+        job.next_run += job.interval
+        if job.next_run <= now:
+            missed = int((now - job.next_run) // job.interval) + 1
+            job.missed += missed
+            job.next_run += missed * job.interval
+
+        if job.running:
+            job.skipped += 1
+            logger.warning(f"{job.name} still running, skipping this cycle")
+            return
+
+        job.running = True
+        self._executor.submit(self._run_job, job)
+
+    def _record_lag(self, lag: float):
+        """Update loop jitter statistics (lock held)"""
+        self._dispatches += 1
+        self._lag_last = lag
+        if lag > self._lag_max:
+            self._lag_max = lag
+        self._lag_avg += (lag - self._lag_avg) * self.LAG_ALPHA
+        self._lag_seconds.observe(lag)
+
+    def _run_job(self, job: ScheduledJob):
+        """Execute a job on a worker thread"""
+        try:
+            job.func()
+        except Exception as e:
+            logger.error(f"Job {job.name} failed: {e}")
+        finally:
+            job.runs += 1
+            job.running = False
+
+    def run(self):
+        """
+        Run the scheduling loop until stop() is called
+
+        Sleeps exactly until the next deadline instead of polling.
+        """
+        logger.info("Scheduler started")
+
+        while not self._stopping:
+            self._wakeup.clear()
+            next_deadline = self.run_pending()
+
+            if next_deadline is None:
+                timeout = None
+            else:
+                timeout = max(0.0, next_deadline - time.monotonic())
+
+            self._wakeup.wait(timeout)
+
+        logger.info("Scheduler stopped")
+
+    def stop(self):
+        """Stop the scheduling loop (safe to call from a signal handler)"""
+        self._stopping = True
+        self._wakeup.set()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get scheduler timing statistics
+
+        Returns:
+            Dict with dispatch lag (jitter) in milliseconds and per-job counters
+        """
+        with self._lock:
+            return {
+                'dispatches': self._dispatches,
+                'lag_last_ms': round(self._lag_last * 1000, 3),
+                'lag_avg_ms': round(self._lag_avg * 1000, 3),
+                'lag_max_ms': round(self._lag_max * 1000, 3),
+                'jobs': {
+                    job.name: {
+                        'interval': job.interval,
+                        'runs': job.runs,
+                        'skipped': job.skipped,
+                        'missed': job.missed,
+                        'lag_ms': round(job.last_lag * 1000, 3)
+                    }
+                    for job in self._jobs.values()
+                }
+            }
+
+    def shutdown(self, wait: bool = False):
+        """
+        Stop the loop and the worker pool
+
+        Args:
+            wait: Wait for running jobs to finish
+        """
+        self.stop()
+        with self._lock:
+            self._jobs.clear()
+        self._executor.shutdown(wait=wait)
@@ -0,0 +1,178 @@
+"""
+Startup pipeline for SmartSense Sensor Node
+Runs independent setup phases concurrently in dependency order
+"""
+
+import logging
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Sequence
+
+logger = logging.getLogger("smartsense.startup")
+
+
+class StartupStep:
+    """Setup phase tracked by the pipeline"""
+
+    PENDING = 'pending'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+    SKIPPED = 'skipped'
+
+    def __init__(self, name: str, func: Callable[[], bool], requires: Sequence[str]):
+        self.name = name
+        self.func = func
+        self.requires = tuple(requires)
+        self.status = self.PENDING
+        self.started: Optional[float] = None
+        self.finished: Optional[float] = None
+        self.error: Optional[str] = None
+        self.done = threading.Event()
+
+    @property
+    def duration(self) -> float:
+        """Time spent in the step in seconds"""
+        if self.started is None:
+            return 0.0
+        return (self.finished or time.monotonic()) - self.started
+
+
+class StartupPipeline:
+    """
+    Dependency-aware setup runner
+
+    Every step runs on its own thread as soon as all steps it requires have
+    completed successfully. A step that fails (returns False or raises)
+    causes every step that depends on it to be skipped. Steps can also wait
+    for another step from inside their body with wait(), e.g. when only one
+    branch of their logic needs it.
+    """
+
+    def __init__(self):
+        self._steps: Dict[str, StartupStep] = {}
+        self._lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)
+        self.started: Optional[float] = None
+        self.finished: Optional[float] = None
+
+    def add_step(self, name: str, func: Callable[[], bool], requires: Sequence[str] = ()):
+        """
+        Register a setup step
+
+        Args:
+            name: Unique step name
+            func: Callable returning True on success
+            requires: Names of steps that must succeed first
+        """
+        for dependency in requires:
+            if dependency not in self._steps:
+                raise ValueError(f"Unknown dependency for {name}: {dependency}")
+        self._steps[name] = StartupStep(name, func, requires)
+
+    def run(self) -> bool:
+        """
+        Run all steps and wait for them to finish
+
+        Returns:
+            True if every step succeeded
+        """
+        self.started = time.monotonic()
+
+        with self._changed:
+            while True:
+                self._start_ready_steps()
+                if all(step.done.is_set() for step in self._steps.values()):
+                    break
+                self._changed.wait()
+
+        self.finished = time.monotonic()
+        return all(step.status == StartupStep.DONE for step in self._steps.values())
+
+    def _start_ready_steps(self):
+        """Start or skip pending steps whose dependencies are resolved (lock held)"""
+        for step in self._steps.values():
+            if step.status != StartupStep.PENDING:
+                continue
+
+            dependencies = [self._steps[name] for name in step.requires]
+            if any(dep.status in (StartupStep.FAILED, StartupStep.SKIPPED) for dep in dependencies):
+                step.status = StartupStep.SKIPPED
+                step.done.set()
+                logger.warning(f"Skipping {step.name}: a required step failed")
+                continue
+
+            if all(dep.status == StartupStep.DONE for dep in dependencies):
+                step.status = StartupStep.RUNNING
+                step.started = time.monotonic()
+                threading.Thread(
+                    target=self._run_step,
+                    args=(step,),
+                    name=f"startup-{step.name}",
+                    daemon=True
+                ).start()
+
+    def _run_step(self, step: StartupStep):
+        """Execute a step on its own thread"""
+        try:
+            ok = bool(step.func())
+            if not ok:
+                step.error = "returned False"
+        except Exception as e:
+            ok = False
+            step.error = str(e)
+            logger.error(f"Startup step {step.name} failed: {e}")
+
+        with self._changed:
+            step.finished = time.monotonic()
+            step.status = StartupStep.DONE if ok else StartupStep.FAILED
+            step.done.set()
+            self._changed.notify_all()
+
+    def wait(self, name: str, timeout: Optional[float] = None) -> bool:
+        """
+        Wait for a step to finish (callable from inside another step)
+
+        Args:
+            name: Step name
+            timeout: Maximum wait in seconds
+
+        Returns:
+            True if the step completed successfully
+        """
+        step = self._steps[name]
+        step.done.wait(timeout)
+        return step.status == StartupStep.DONE
+
+    def get_steps(self) -> List[StartupStep]:
+        """Get registered steps in registration order"""
+        return list(self._steps.values())
+
+    def report(self, origin: Optional[float] = None) -> str:
+        """
+        Format a per-step timing breakdown
+
+        Args:
+            origin: Monotonic process start time; adds an "init" row for the
+                    time before the pipeline started
+
+        Returns:
+            Multi-line report with start offset, duration and status per step
+        """
+        base = origin if origin is not None else (self.started or time.monotonic())
+        lines = [f"{'step':<12} {'start':>8} {'duration':>9}  status"]
+
+        if origin is not None and self.started is not None:
+            lines.append(f"{'init':<12} {0.0:>7.3f}s {self.started - origin:>8.3f}s  done")
+
+        for step in self._steps.values():
+            start = (step.started - base) if step.started is not None else 0.0
+            line = f"{step.name:<12} {start:>7.3f}s {step.duration:>8.3f}s  {step.status}"
+            if step.error:
+                line += f" ({step.error})"
+            lines.append(line)
+
+        if self.finished is not None:
+            lines.append(f"{'total':<12} {'':>8} {self.finished - base:>8.3f}s")
+
+        return "\n".join(lines)
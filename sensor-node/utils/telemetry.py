@@ -0,0 +1,224 @@
+"""
+Node self-telemetry for SmartSense Sensor Node
+Process, system, SoC and WiFi health read from /proc and /sys
+"""
+
+import logging
+import os
+import time
+from typing import Any, Dict, List, Optional
+
+from .instrumentation import REGISTRY
+from .network_check import get_wifi_bitrate, read_wireless_quality
+
+logger = logging.getLogger("smartsense.telemetry")
+
+# Raspberry Pi firmware throttling bits (as reported by vcgencmd get_throttled)
+THROTTLE_FLAGS = (
+    (0, 'under_voltage'),
+    (1, 'freq_capped'),
+    (2, 'throttled'),
+    (3, 'soft_temp_limit'),
+    (16, 'under_voltage_occurred'),
+    (17, 'freq_capped_occurred'),
+    (18, 'throttled_occurred'),
+    (19, 'soft_temp_limit_occurred')
+)
+
+THERMAL_ZONE = "/sys/class/thermal/thermal_zone0/temp"
+CPU_FREQ = "/sys/devices/system/cpu/cpu0/cpufreq/scaling_cur_freq"
+THROTTLED = "/sys/devices/platform/soc/soc:firmware/get_throttled"
+
+
+def _read_file(path: str) -> Optional[str]:
+    try:
+        with open(path) as f:
+            return f.read()
+    except OSError:
+        return None
+
+
+class NodeTelemetry:
+    """
+    Collects the node's health snapshot
+
+    Everything is read from /proc and /sys (plus one wireless ioctl for the
+    bitrate), never by spawning processes, so a collection costs well under
+    a millisecond. Values that are not available on the platform (e.g. SoC
+    throttling off a Raspberry Pi) are left out of the snapshot.
+
+    Counters come from the instrumentation registry, MQTT state from the
+    client and loop health from the scheduler; set the ``mqtt_client`` and
+    ``scheduler`` attributes once they exist.
+    """
+
+    def __init__(self, wifi_interface: str = 'wlan0'):
+        """
+        Initialize telemetry collector
+
+        Args:
+            wifi_interface: Wireless interface for RSSI/bitrate
+        """
+        self.wifi_interface = wifi_interface
+        self.mqtt_client = None
+        self.scheduler = None
+
+        self._clock_ticks = os.sysconf('SC_CLK_TCK') if hasattr(os, 'sysconf') else 100
+        self._page_size = os.sysconf('SC_PAGE_SIZE') if hasattr(os, 'sysconf') else 4096
+        self._started = time.monotonic()
+        self._last_cpu: Optional[float] = None
+        self._last_wall: Optional[float] = None
+
+    def collect(self) -> Dict[str, Any]:
+        """
+        Collect one telemetry snapshot
+
+        Returns:
+            Dict with process, system, soc, wifi, mqtt, readings and loop
+            sections (sections without data are omitted)
+        """
+        snapshot = {
+            'uptime': round(time.monotonic() - self._started, 1),
+            'process': self._process(),
+            'system': self._system(),
+            'soc': self._soc(),
+            'wifi': self._wifi(),
+            'mqtt': self._mqtt(),
+            'readings': self._readings(),
+            'loop': self._loop()
+        }
+        return {key: value for key, value in snapshot.items() if value not in (None, {})}
+
+    def _process(self) -> Dict[str, Any]:
+        """RSS, CPU time/usage and thread count of this process"""
+        result = {}
+
+        statm = _read_file("/proc/self/statm")
+        if statm:
+            result['rss_kb'] = int(statm.split()[1]) * self._page_size // 1024
+
+        stat = _read_file("/proc/self/stat")
+        if stat:
+            # Fields after "(comm)"; comm may contain spaces
+            fields = stat.rsplit(')', 1)[1].split()
+            cpu = (int(fields[11]) + int(fields[12])) / self._clock_ticks
+            now = time.monotonic()
+            result['cpu_seconds'] = round(cpu, 2)
+            if self._last_cpu is not None and now > self._last_wall:
+                result['cpu_percent'] = round(
+                    100 * (cpu - self._last_cpu) / (now - self._last_wall), 1)
+            self._last_cpu, self._last_wall = cpu, now
+            result['threads'] = int(fields[17])
+
+        return result
+
+    def _system(self) -> Dict[str, Any]:
+        """Load average, available memory and system uptime"""
+        result = {}
+
+        loadavg = _read_file("/proc/loadavg")
+        if loadavg:
+            result['load'] = [float(value) for value in loadavg.split()[:3]]
+
+        meminfo = _read_file("/proc/meminfo")
+        if meminfo:
+            for line in meminfo.splitlines():
+                if line.startswith('MemAvailable:'):
+                    result['mem_available_kb'] = int(line.split()[1])
+                    break
+
+        uptime = _read_file("/proc/uptime")
+        if uptime:
+            result['uptime'] = int(float(uptime.split()[0]))
+
+        return result
+
+    def _soc(self) -> Dict[str, Any]:
+        """SoC temperature, CPU clock and firmware throttling flags"""
+        result = {}
+
+        temperature = _read_file(THERMAL_ZONE)
+        if temperature:
+            result['temperature'] = round(int(temperature) / 1000, 1)
+
+        frequency = _read_file(CPU_FREQ)
+        if frequency:
+            result['cpu_mhz'] = int(frequency) // 1000
+
+        throttled = _read_file(THROTTLED)
+        if throttled:
+            value = int(throttled.strip() or '0', 16)
+            result['throttled'] = value
+            result['throttle_flags'] = self.decode_throttled(value)
+
+        return result
+
+    @staticmethod
+    def decode_throttled(value: int) -> List[str]:
+        """
+        Decode the firmware throttling bitmask
+
+        Args:
+            value: get_throttled value
+
+        Returns:
+            Names of the set flags
+        """
+        return [name for bit, name in THROTTLE_FLAGS if value & (1 << bit)]
+
+    def _wifi(self) -> Dict[str, Any]:
+        """RSSI, link quality and bitrate of the wireless interface"""
+        result = {}
+
+        quality = read_wireless_quality(self.wifi_interface)
+        if quality:
+            result['rssi'] = quality['signal_dbm']
+            result['link_quality'] = quality['link_quality']
+
+            bitrate = get_wifi_bitrate(self.wifi_interface)
+            if bitrate:
+                result['bitrate_mbps'] = round(bitrate / 1e6, 1)
+
+        return result
+
+    def _mqtt(self) -> Dict[str, Any]:
+        """Connection state, reconnects and outbox traffic"""
+        client = self.mqtt_client
+        if client is None:
+            return {}
+
+        return {
+            'state': client.state,
+            'reconnects': client.reconnect_count,
+            'outbox_depth': client.outbox.depth if client.outbox else 0,
+            'stored': REGISTRY.value('mqtt_messages_stored_total'),
+            'dropped': REGISTRY.value('mqtt_messages_dropped_total')
+        }
+
+    def _readings(self) -> Dict[str, Any]:
+        """Failed sensor reads (total and per sensor)"""
+        failures = {
+            dict(counter.labels).get('sensor', ''): counter.value
+            for counter in REGISTRY.find('sensor_read_failures_total')
+            if counter.value
+        }
+        if not failures:
+            return {'failures': 0}
+        return {'failures': sum(failures.values()), 'by_sensor': failures}
+
+    def _loop(self) -> Dict[str, Any]:
+        """Scheduler lag and skipped/missed runs"""
+        scheduler = self.scheduler
+        if scheduler is None:
+            return {}
+
+        stats = scheduler.get_stats()
+        jobs = stats['jobs'].values()
+        lag = REGISTRY.histogram('scheduler_lag_seconds').quantile(0.99)
+        return {
+            'lag_avg_ms': stats['lag_avg_ms'],
+            'lag_max_ms': stats['lag_max_ms'],
+            'lag_p99_ms': round(lag * 1000, 3) if lag is not None else None,
+            'skipped': sum(job['skipped'] for job in jobs),
+            'missed': sum(job['missed'] for job in jobs)
+        }
@@ -5,30 +5,98 @@ import { PrismaService } from '../database/prisma.service';
 
 interface SensorData {
   node_id: string;
+  msg_id?: string;
+  catalog?: string;
   timestamp: number;
+  interval?: number;  // Effective read interval in seconds (adaptive sampling)
   sensors: {
     [key: string]: {
       value: number | string;
-      unit: string;
+      unit?: string;
       timestamp: number;
     };
   };
 }
 
+interface SensorBatch {
+  node_id: string;
+  msg_id?: string;
+  catalog?: string;
+  timestamp: number;
+  metrics: {
+    [key: string]: {
+      unit?: string;
+      t: number[];
+      v: (number | string)[];
+    };
+  };
+}
+
+interface CatalogEntry {
+  name: string;
+  alias: number;
+  unit: string;
+  type: 'int' | 'float' | 'string';
+  resolution: number | null;
+  // Report-by-exception metrics: samples are published only on changes
+  // beyond the deadband, so the series is a step function (hold the last
+  // value) and a gap longer than max_silence (seconds) means no data
+  deadband?: { absolute?: number; percent?: number };
+  max_silence?: number;
+}
+
+interface MetricCatalog {
+  version: number;
+  hash: string;
+  metrics: CatalogEntry[];
+}
+
+interface CommandResponse {
+  node_id: string;
+  id?: string;
+  command: string;
+  status: 'ok' | 'error';
+  timestamp: number;
+  result?: Record<string, unknown>;
+  error?: string;
+}
+
+export interface NodeTelemetry {
+  node_id: string;
+  timestamp: number;
+  uptime: number;
+  process?: { rss_kb?: number; cpu_seconds?: number; cpu_percent?: number; threads?: number };
+  system?: { load?: number[]; mem_available_kb?: number; uptime?: number };
+  soc?: { temperature?: number; cpu_mhz?: number; throttled?: number; throttle_flags?: string[] };
+  wifi?: { rssi?: number; link_quality?: number; bitrate_mbps?: number };
+  mqtt?: { state: string; reconnects: number; outbox_depth: number; stored: number; dropped: number };
+  readings?: { failures: number; by_sensor?: Record<string, number> };
+  loop?: { lag_avg_ms: number; lag_max_ms: number; lag_p99_ms?: number; skipped: number; missed: number };
+}
+
 interface StatusMessage {
   node_id: string;
   status: 'online' | 'offline';
   location?: string;
   description?: string;
   timestamp: number;
+  catalog?: MetricCatalog;
 }
 
+// Catalogs remembered per node; live messages that were encoded just
+// before a catalog change still carry the previous hash
+const MAX_CATALOGS_PER_NODE = 8;
+
 @Injectable()
 export class MqttService implements OnModuleInit, OnModuleDestroy {
   private readonly logger = new Logger(MqttService.name);
   private client: mqtt.MqttClient;
   private readonly brokerUrl: string;
   private readonly clientId: string;
+  // Recent birth catalogs per node (by hash, oldest first), used to resolve metric aliases
+  private readonly catalogs = new Map<string, Map<string, Map<string, CatalogEntry>>>();
+  // Latest health snapshot per node
+  private readonly telemetry = new Map<string, NodeTelemetry>();
 
   constructor(
     private configService: ConfigService,
@@ -83,6 +151,9 @@ export class MqttService implements OnModuleInit, OnModuleDestroy {
     const topics = [
       'smartsense/+/status',   // Node status (online/offline)
       'smartsense/+/sensors',  // Sensor data
+      'smartsense/+/sensors/batch',  // Batched sensor data (columnar)
+      'smartsense/+/command/response',  // Command acknowledgements
+      'smartsense/+/telemetry',  // Node health
     ];
 
     topics.forEach((topic) => {
@@ -100,13 +171,13 @@ export class MqttService implements OnModuleInit, OnModuleDestroy {
     try {
       const parts = topic.split('/');
 
-      if (parts.length !== 3 || parts[0] !== 'smartsense') {
+      if (parts.length < 3 || parts.length > 4 || parts[0] !== 'smartsense') {
         this.logger.warn(`Invalid topic format: ${topic}`);
         return;
       }
 
       const nodeId = parts[1];
-      const messageType = parts[2];
+      const messageType = parts.slice(2).join('/');
 
       const message = JSON.parse(payload.toString());
 
@@ -117,6 +188,15 @@ export class MqttService implements OnModuleInit, OnModuleDestroy {
         case 'sensors':
           await this.handleSensorData(nodeId, message as SensorData);
           break;
+        case 'sensors/batch':
+          await this.handleSensorBatch(nodeId, message as SensorBatch);
+          break;
+        case 'command/response':
+          this.handleCommandResponse(nodeId, message as CommandResponse);
+          break;
+        case 'telemetry':
+          this.handleTelemetry(nodeId, message as NodeTelemetry);
+          break;
         default:
           this.logger.warn(`Unknown message type: ${messageType}`);
       }
@@ -130,6 +210,11 @@ export class MqttService implements OnModuleInit, OnModuleDestroy {
     try {
       this.logger.log(`Node ${nodeId} status: ${message.status}`);
 
+      if (message.catalog) {
+        this.rememberCatalog(nodeId, message.catalog);
+        this.logger.log(`Node ${nodeId} catalog ${message.catalog.hash} (${message.catalog.metrics.length} metrics)`);
+      }
+
       // Find or create sensor node
       await this.prisma.sensorNode.upsert({
         where: { nodeId },
@@ -176,7 +261,13 @@ export class MqttService implements OnModuleInit, OnModuleDestroy {
 
       // Save sensor readings (filter out non-numeric values)
       const readings = Object.entries(data.sensors)
-        .map(([sensorName, sensorValue]) => {
+        .map(([key, sensorValue]) => {
+          const entry = this.resolveMetric(nodeId, data.catalog, key);
+          if (!entry) {
+            return null;
+          }
+          const sensorName = entry.name;
+
           const value = typeof sensorValue.value === 'number'
             ? sensorValue.value
             : parseFloat(String(sensorValue.value));
@@ -192,15 +283,17 @@ export class MqttService implements OnModuleInit, OnModuleDestroy {
             sensorType: this.extractSensorType(sensorName),
             metricName: sensorName,
             value,
-            unit: sensorValue.unit,
+            unit: sensorValue.unit ?? entry.unit,
             timestamp: new Date(sensorValue.timestamp),
           };
         })
         .filter((reading) => reading !== null);
 
       if (readings.length > 0) {
+        // Replayed messages (store-and-forward) may arrive more than once
         await this.prisma.sensorReading.createMany({
           data: readings,
+          skipDuplicates: true,
         });
         this.logger.log(`Saved ${readings.length} sensor readings from ${nodeId}`);
       }
@@ -210,6 +303,136 @@ export class MqttService implements OnModuleInit, OnModuleDestroy {
     }
   }
 
+  private async handleSensorBatch(nodeId: string, batch: SensorBatch): Promise<void> {
+    try {
+      this.logger.debug(`Received sensor batch from ${nodeId}`);
+
+      // One node upsert and one insert for the whole batch
+      const node = await this.prisma.sensorNode.upsert({
+        where: { nodeId },
+        update: {
+          lastSeenAt: new Date(batch.timestamp),
+        },
+        create: {
+          nodeId,
+          name: nodeId,
+          location: 'Unknown',
+          isActive: true,
+          lastSeenAt: new Date(batch.timestamp),
+        },
+      });
+
+      const readings = [];
+      for (const [key, column] of Object.entries(batch.metrics)) {
+        const entry = this.resolveMetric(nodeId, batch.catalog, key);
+        if (!entry) {
+          continue;
+        }
+        const metricName = entry.name;
+        const unit = column.unit ?? entry.unit;
+        const sensorType = this.extractSensorType(metricName);
+
+        column.v.forEach((rawValue, i) => {
+          const value = typeof rawValue === 'number' ? rawValue : parseFloat(String(rawValue));
+
+          // Skip text values like "good", "excellent"
+          if (isNaN(value)) {
+            return;
+          }
+
+          readings.push({
+            nodeId: node.id,
+            sensorType,
+            metricName,
+            value,
+            unit,
+            timestamp: new Date(column.t[i]),
+          });
+        });
+      }
+
+      if (readings.length > 0) {
+        await this.prisma.sensorReading.createMany({
+          data: readings,
+          skipDuplicates: true,
+        });
+        this.logger.log(`Saved ${readings.length} batched sensor readings from ${nodeId}`);
+      }
+    } catch (error) {
+      this.logger.error(`Error handling sensor batch: ${error.message}`);
+    }
+  }
+
+  private handleCommandResponse(nodeId: string, response: CommandResponse): void {
+    if (response.status === 'ok') {
+      this.logger.log(`Node ${nodeId} executed ${response.command} (id: ${response.id ?? '-'})`);
+    } else {
+      this.logger.warn(`Node ${nodeId} rejected ${response.command} (id: ${response.id ?? '-'}): ${response.error}`);
+    }
+  }
+
+  private handleTelemetry(nodeId: string, telemetry: NodeTelemetry): void {
+    this.telemetry.set(nodeId, telemetry);
+
+    // Active throttling (not the "occurred since boot" history) needs attention
+    const active = (telemetry.soc?.throttle_flags ?? []).filter((flag) => !flag.endsWith('_occurred'));
+    if (active.length > 0) {
+      this.logger.warn(`Node ${nodeId} SoC: ${active.join(', ')} (${telemetry.soc?.temperature ?? '?'} °C)`);
+    }
+    if (telemetry.wifi?.rssi !== undefined && telemetry.wifi.rssi < -80) {
+      this.logger.warn(`Node ${nodeId} weak WiFi signal: ${telemetry.wifi.rssi} dBm`);
+    }
+    this.logger.debug(`Node ${nodeId} telemetry: ${JSON.stringify(telemetry)}`);
+  }
+
+  /**
+   * Latest telemetry snapshot of a node (undefined if none received yet)
+   */
+  getTelemetry(nodeId: string): NodeTelemetry | undefined {
+    return this.telemetry.get(nodeId);
+  }
+
+  /**
+   * Keep a birth catalog by hash, dropping the least recently announced beyond MAX_CATALOGS_PER_NODE
+   */
+  private rememberCatalog(nodeId: string, catalog: MetricCatalog): void {
+    let known = this.catalogs.get(nodeId);
+    if (!known) {
+      known = new Map();
+      this.catalogs.set(nodeId, known);
+    }
+
+    // Re-insert so a re-announced catalog counts as the newest
+    known.delete(catalog.hash);
+    known.set(catalog.hash, new Map(catalog.metrics.map((entry) => [String(entry.alias), entry])));
+
+    while (known.size > MAX_CATALOGS_PER_NODE) {
+      known.delete(known.keys().next().value);
+    }
+  }
+
+  /**
+   * Resolve a data message key (metric name or catalog alias) to its catalog entry
+   */
+  private resolveMetric(
+    nodeId: string,
+    catalogHash: string | undefined,
+    key: string,
+  ): { name: string; unit: string } | null {
+    if (!catalogHash) {
+      return { name: key, unit: '' };
+    }
+
+    const byAlias = this.catalogs.get(nodeId)?.get(catalogHash);
+    if (!byAlias) {
+      this.logger.warn(`Unknown catalog ${catalogHash} from ${nodeId}, dropping ${key}`);
+      return null;
+    }
+
+    const entry = byAlias.get(key);
+    return entry ? { name: entry.name, unit: entry.unit } : { name: key, unit: '' };
+  }
+
   private extractSensorType(metricName: string): string {
     // Extract sensor type from metric name like "BME680/temperature"
     if (metricName.includes('/')) {